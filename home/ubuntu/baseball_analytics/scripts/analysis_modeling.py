@@ -7,29 +7,33 @@ import os
 import sys
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 import sqlalchemy as sa
 from sqlalchemy import create_engine, text
 import logging
-import glob
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression, Ridge, Lasso
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-import joblib
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("logs/analysis_modeling.log"),
-        logging.StreamHandler()
-    ]
-)
+from analytics_backend import get_database_url, get_backend
+from profiling import profiled
+from data_access import load_data, dataset_version, iter_data, use_out_of_core
+from result_cache import analysis_result_cache, memoize_result
+from streaming_stats import MomentSketch, dataset_sketch, season_sketches, streaming_describe
+from leaderboards import DISPLAY_COLUMNS, Leaderboard, compute_leaderboards
+from group_stats import GroupIndex, grouped_stats, merge_aggregates
+from chart_rendering import ChartSpec, render_charts
+from density import LAUNCH_BINS, LAUNCH_RANGES, OUTCOME_LABELS, bin_density, stream_density, density_frame
+from model_search import search_models
+from model_registry import get_registry
+from war_predictor import WARPredictor, load_predictor
+from similarity_index import get_similarity_index
+from projections import season_projections
+from expected_stats import STATCAST_COLUMNS as EXPECTED_STATS_COLUMNS, get_expected_stats_table, player_expected_stats
+from feature_store import BATTING_FEATURES, PITCHING_FEATURES, build_feature_set, feature_frame, get_feature_set
+
 logger = logging.getLogger(__name__)
 
 # Database connection settings
@@ -42,6 +46,35 @@ DB_NAME = "baseball_analytics"
 # Create the database URL
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+# Identifying columns kept with every player-season
+PLAYER_KEY_COLUMNS = ['IDfg', 'Name', 'Team', 'Season']
+
+# Columns read by each consumer (load_data only parses these)
+BATTING_ANALYSIS_COLUMNS = PLAYER_KEY_COLUMNS + ['PA', 'AVG', 'OBP', 'SLG', 'OPS', 'HR', 'HR%', 'BB', 'SO', 'BB%', 'K%', 'wRC+', 'WAR']
+PITCHING_ANALYSIS_COLUMNS = PLAYER_KEY_COLUMNS + ['IP', 'ERA', 'FIP', 'xFIP', 'WHIP', 'K/9', 'BB/9', 'HR/9', 'WAR']
+TEAM_ANALYSIS_COLUMNS = ['Team', 'Season', 'G', 'PA', 'HR', 'R', 'RBI', 'AVG', 'OBP', 'SLG', 'wOBA', 'wRC+', 'WAR']
+STATCAST_ANALYSIS_COLUMNS = ['pitch_type', 'launch_speed', 'launch_angle', 'release_speed', 'spin_rate', 'hard_hit']
+BATTING_MODEL_COLUMNS = PLAYER_KEY_COLUMNS + ['PA'] + BATTING_FEATURES + ['WAR']
+PITCHING_MODEL_COLUMNS = PLAYER_KEY_COLUMNS + PITCHING_FEATURES + ['WAR']
+
+# Leaderboards reported by the batting and pitching analyses
+BATTING_LEADERBOARDS = {
+    'top_war': Leaderboard('WAR'),
+    'top_power': Leaderboard('HR%'),
+    'top_discipline': Leaderboard('BB_K_ratio', columns=['Name', 'Team', 'Season', 'BB', 'SO', 'BB_K_ratio'])
+}
+PITCHING_LEADERBOARDS = {
+    'top_war': Leaderboard('WAR'),
+    'top_strikeout': Leaderboard('K/9'),
+    'top_control': Leaderboard('BB/9', ascending=True)
+}
+
+# Qualification thresholds for leaderboards
+LEADERBOARD_QUALIFIERS = {'batting': ('PA', 100), 'pitching': ('IP', 30)}
+
+# SQL for the BB/K ratio used by the plate discipline leaderboard (see _with_discipline_ratio)
+DISCIPLINE_RATIO_SQL = 'BB / CASE WHEN SO = 0 THEN 0.001 ELSE SO END'
+
 # Create directories if they don't exist
 os.makedirs('models', exist_ok=True)
 os.makedirs('reports', exist_ok=True)
@@ -49,83 +82,194 @@ os.makedirs('visualizations', exist_ok=True)
 os.makedirs('logs', exist_ok=True)
 
 def connect_to_db():
-    """Connect to the database"""
+    """Connect to the configured database backend"""
     try:
-        engine = create_engine(DATABASE_URL)
+        engine = create_engine(get_database_url(DATABASE_URL))
         return engine
     except Exception as e:
         logger.error(f"Error connecting to database: {e}")
         sys.exit(1)
 
-def load_data(data_type, year=None):
-    """
-    Load cleaned data for analysis
+class StatisticalAnalysis:
+    """Class for statistical analysis of baseball data"""
     
-    Args:
-        data_type (str): Type of data to load ('batting', 'pitching', 'team', 'statcast')
-        year (int, optional): Specific year to load. If None, loads all years.
+    # Columns loaded for each dataset
+    DATASET_COLUMNS = {
+        'batting': BATTING_ANALYSIS_COLUMNS,
+        'pitching': PITCHING_ANALYSIS_COLUMNS,
+        'team': TEAM_ANALYSIS_COLUMNS,
+        'statcast': STATCAST_ANALYSIS_COLUMNS
+    }
+    
+    def __init__(self, result_cache=analysis_result_cache):
+        """
+        Initialize the statistical analysis class
         
-    Returns:
-        pandas.DataFrame: Loaded data
-    """
-    try:
-        if year:
-            # Load specific year
-            file_pattern = f'data/processed/clean_{data_type}_stats_{year}.csv'
-            if data_type == 'statcast':
-                # Statcast files have different naming pattern
-                file_pattern = f'data/processed/clean_statcast_*_{year}*.csv'
-            
-            files = glob.glob(file_pattern)
-            if not files:
-                logger.warning(f"No {data_type} data files found for year {year}")
-                return pd.DataFrame()
-            
-            data = pd.read_csv(files[0])
-            logger.info(f"Loaded {data_type} data for {year}: {len(data)} records")
-            
+        Args:
+            result_cache (ResultCache, optional): Cache for analysis results (None disables caching)
+        """
+        self._data = {}
+        self._versions = {}
+        self.result_cache = result_cache
+        self.backend = get_backend()
+    
+    def _dataset(self, name):
+        """Return a dataset, loading it on first use or when its files have changed"""
+        if name in self._data:
+            loaded_version = self._versions[name]
+            if loaded_version is None or loaded_version == dataset_version(name):
+                return self._data[name]
+        
+        version = dataset_version(name)
+        self._data[name] = load_data(name, columns=self.DATASET_COLUMNS[name])
+        self._versions[name] = version
+        return self._data[name]
+    
+    def _set_dataset(self, name, data):
+        """Assign a dataset directly (None reverts to lazy loading from files)"""
+        if data is None:
+            self._data.pop(name, None)
+            self._versions.pop(name, None)
         else:
-            # Load all years
-            file_pattern = f'data/processed/clean_{data_type}_stats_*.csv'
-            if data_type == 'statcast':
-                file_pattern = 'data/processed/clean_statcast_*.csv'
+            self._data[name] = data
+            self._versions[name] = None
+    
+    def data_version(self, name):
+        """
+        Return the version of a dataset used to key cached results
+        
+        Args:
+            name (str): Dataset name
             
-            files = glob.glob(file_pattern)
-            if not files:
-                logger.warning(f"No {data_type} data files found")
-                return pd.DataFrame()
+        Returns:
+            str: Data version, or None if the data was assigned directly
+        """
+        if name in self._data and self._versions[name] is None:
+            return None
+        return dataset_version(name)
+    
+    batting_data = property(lambda self: self._dataset('batting'),
+                            lambda self, data: self._set_dataset('batting', data))
+    pitching_data = property(lambda self: self._dataset('pitching'),
+                             lambda self, data: self._set_dataset('pitching', data))
+    team_data = property(lambda self: self._dataset('team'),
+                         lambda self, data: self._set_dataset('team', data))
+    statcast_data = property(lambda self: self._dataset('statcast'),
+                             lambda self, data: self._set_dataset('statcast', data))
+    
+    def streams(self, name):
+        """
+        Return True if a dataset is analysed out of core (streamed in chunks, never loaded)
+        
+        Args:
+            name (str): Dataset name
             
-            data_frames = []
-            for file in files:
-                df = pd.read_csv(file)
-                data_frames.append(df)
+        Returns:
+            bool: True when the dataset is not in memory and BASEBALL_OUT_OF_CORE selects streaming
+        """
+        return name not in self._data and use_out_of_core(name)
+    
+    def uses_sql(self, name):
+        """
+        Return True if a dataset is analysed with SQL in the embedded backend
+        
+        Args:
+            name (str): Dataset name
             
-            data = pd.concat(data_frames, ignore_index=True)
-            logger.info(f"Loaded {data_type} data for all years: {len(data)} records")
+        Returns:
+            bool: True when the DuckDB backend is selected and the data was not assigned directly
+        """
+        return self.backend is not None and self.data_version(name) is not None
+    
+    def load_all_data(self):
+        """Load all data for analysis (datasets analysed out of core are left on disk)"""
+        for name in self.DATASET_COLUMNS:
+            if not self.streams(name):
+                self._dataset(name)
+    
+    def _correlations(self, name, metrics, filters, filtered_data):
+        """
+        Correlation matrix merged from the stored per-partition sketches
         
-        return data
+        Args:
+            name (str): Dataset name
+            metrics (list): Metrics to correlate
+            filters (list): Qualification filters applied to the dataset
+            filtered_data (pandas.DataFrame): The filtered rows, used for directly assigned data
+            
+        Returns:
+            pandas.DataFrame: Correlation matrix
+        """
+        if self.data_version(name) is None:
+            return MomentSketch.from_frame(filtered_data, metrics).corr()
+        return dataset_sketch(name, metrics, filters).corr()
     
-    except Exception as e:
-        logger.error(f"Error loading {data_type} data: {e}")
-        return pd.DataFrame()
-
-class StatisticalAnalysis:
-    """Class for statistical analysis of baseball data"""
+    @profiled()
+    def season_summaries(self, data_type, metrics=None, filters=None):
+        """
+        Per-season and all-seasons summaries merged from the stored partition sketches
+        
+        Only partitions without an up-to-date sketch are scanned.
+        
+        Args:
+            data_type (str): Dataset name ('batting', 'pitching', 'team', 'statcast')
+            metrics (list, optional): Metrics to summarize. Defaults to the dataset's numeric analysis columns.
+            filters (list, optional): List of (column, operator, value) tuples
+            
+        Returns:
+            dict: {'seasons': {season: summary}, 'career': summary, 'correlations': matrix}
+        """
+        if metrics is None:
+            metrics = [col for col in self.DATASET_COLUMNS[data_type]
+                       if col not in PLAYER_KEY_COLUMNS and col != 'pitch_type']
+        
+        by_season = season_sketches(data_type, metrics, filters)
+        combined = MomentSketch.merge_all(by_season.values(), metrics)
+        
+        return {
+            'seasons': {season: sketch.summary() for season, sketch in sorted(by_season.items(), key=lambda item: str(item[0]))},
+            'career': combined.summary(),
+            'correlations': combined.corr()
+        }
     
-    def __init__(self):
-        """Initialize the statistical analysis class"""
-        self.batting_data = None
-        self.pitching_data = None
-        self.team_data = None
-        self.statcast_data = None
+    @staticmethod
+    def _with_discipline_ratio(batting_data):
+        """Add the BB/K ratio used by the plate discipline leaderboard"""
+        if not all(col in batting_data.columns for col in ['BB', 'SO']):
+            return batting_data
+        return batting_data.assign(BB_K_ratio=batting_data['BB'] / batting_data['SO'].replace(0, 0.001))
     
-    def load_all_data(self):
-        """Load all data for analysis"""
-        self.batting_data = load_data('batting')
-        self.pitching_data = load_data('pitching')
-        self.team_data = load_data('team')
-        self.statcast_data = load_data('statcast')
+    @profiled()
+    def leaderboards(self, data_type='batting', by=None, k=10, filters=None):
+        """
+        Compute the analysis leaderboards, optionally within groups
+        
+        Args:
+            data_type (str): 'batting' or 'pitching'
+            by (list, optional): Columns to rank within, e.g. ['Season'] or ['Season', 'Team']
+            k (int): Players per leaderboard (per group when grouped)
+            filters (list, optional): Qualification filters. Defaults to the standard PA/IP minimum.
+            
+        Returns:
+            dict: Mapping of leaderboard name to DataFrame
+        """
+        if data_type == 'batting':
+            data = self._with_discipline_ratio(self.batting_data)
+            boards = BATTING_LEADERBOARDS
+        elif data_type == 'pitching':
+            data = self.pitching_data
+            boards = PITCHING_LEADERBOARDS
+        else:
+            raise ValueError(f"No leaderboards defined for {data_type} data")
+        
+        if filters is None:
+            column, minimum = LEADERBOARD_QUALIFIERS[data_type]
+            filters = [(column, '>=', minimum)]
+        
+        return compute_leaderboards(data, boards, k=k, by=by, filters=filters)
     
+    @profiled()
+    @memoize_result('batting')
     def batting_analysis(self, min_pa=100):
         """
         Perform statistical analysis on batting data
@@ -136,18 +280,24 @@ class StatisticalAnalysis:
         Returns:
             dict: Dictionary of analysis results
         """
-        if self.batting_data is None:
-            self.batting_data = load_data('batting')
+        if self.uses_sql('batting'):
+            key_metrics = ['AVG', 'OBP', 'SLG', 'OPS', 'HR', 'BB%', 'K%', 'wRC+', 'WAR']
+            derived = None
+            if all(col in self.backend.columns('batting') for col in ['BB', 'SO']):
+                derived = {'BB_K_ratio': DISCIPLINE_RATIO_SQL}
+            return self._player_analysis_sql('batting', ('PA', min_pa), key_metrics, BATTING_LEADERBOARDS, derived)
+        
+        batting_data = self.batting_data
         
-        if self.batting_data.empty:
+        if batting_data.empty:
             logger.warning("No batting data available for analysis")
             return {}
         
         # Filter for minimum plate appearances
-        if 'PA' in self.batting_data.columns:
-            filtered_data = self.batting_data[self.batting_data['PA'] >= min_pa]
+        if 'PA' in batting_data.columns:
+            filtered_data = batting_data[batting_data['PA'] >= min_pa]
         else:
-            filtered_data = self.batting_data
+            filtered_data = batting_data
         
         results = {}
         
@@ -160,23 +310,17 @@ class StatisticalAnalysis:
         key_metrics = [col for col in key_metrics if col in filtered_data.columns]
         
         if key_metrics:
-            results['correlations'] = filtered_data[key_metrics].corr()
+            filters = [('PA', '>=', min_pa)] if 'PA' in batting_data.columns else None
+            results['correlations'] = self._correlations('batting', key_metrics, filters, filtered_data)
         
-        # Top performers by WAR
-        if 'WAR' in filtered_data.columns and 'Name' in filtered_data.columns:
-            results['top_war'] = filtered_data.sort_values('WAR', ascending=False).head(10)[['Name', 'Team', 'Season', 'WAR']]
-        
-        # Top power hitters (HR rate)
-        if 'HR%' in filtered_data.columns and 'Name' in filtered_data.columns:
-            results['top_power'] = filtered_data.sort_values('HR%', ascending=False).head(10)[['Name', 'Team', 'Season', 'HR%']]
-        
-        # Top plate discipline (BB/K ratio)
-        if all(col in filtered_data.columns for col in ['BB', 'SO', 'Name']):
-            filtered_data['BB_K_ratio'] = filtered_data['BB'] / filtered_data['SO'].replace(0, 0.001)
-            results['top_discipline'] = filtered_data.sort_values('BB_K_ratio', ascending=False).head(10)[['Name', 'Team', 'Season', 'BB', 'SO', 'BB_K_ratio']]
+        # Top performers by WAR, power (HR rate) and plate discipline (BB/K ratio)
+        if 'Name' in filtered_data.columns:
+            results.update(compute_leaderboards(self._with_discipline_ratio(filtered_data), BATTING_LEADERBOARDS))
         
         return results
     
+    @profiled()
+    @memoize_result('pitching')
     def pitching_analysis(self, min_ip=30):
         """
         Perform statistical analysis on pitching data
@@ -187,18 +331,21 @@ class StatisticalAnalysis:
         Returns:
             dict: Dictionary of analysis results
         """
-        if self.pitching_data is None:
-            self.pitching_data = load_data('pitching')
+        if self.uses_sql('pitching'):
+            key_metrics = ['ERA', 'FIP', 'xFIP', 'WHIP', 'K/9', 'BB/9', 'HR/9', 'WAR']
+            return self._player_analysis_sql('pitching', ('IP', min_ip), key_metrics, PITCHING_LEADERBOARDS)
+        
+        pitching_data = self.pitching_data
         
-        if self.pitching_data.empty:
+        if pitching_data.empty:
             logger.warning("No pitching data available for analysis")
             return {}
         
         # Filter for minimum innings pitched
-        if 'IP' in self.pitching_data.columns:
-            filtered_data = self.pitching_data[self.pitching_data['IP'] >= min_ip]
+        if 'IP' in pitching_data.columns:
+            filtered_data = pitching_data[pitching_data['IP'] >= min_ip]
         else:
-            filtered_data = self.pitching_data
+            filtered_data = pitching_data
         
         results = {}
         
@@ -211,22 +358,17 @@ class StatisticalAnalysis:
         key_metrics = [col for col in key_metrics if col in filtered_data.columns]
         
         if key_metrics:
-            results['correlations'] = filtered_data[key_metrics].corr()
-        
-        # Top performers by WAR
-        if 'WAR' in filtered_data.columns and 'Name' in filtered_data.columns:
-            results['top_war'] = filtered_data.sort_values('WAR', ascending=False).head(10)[['Name', 'Team', 'Season', 'WAR']]
-        
-        # Top strikeout pitchers
-        if 'K/9' in filtered_data.columns and 'Name' in filtered_data.columns:
-            results['top_strikeout'] = filtered_data.sort_values('K/9', ascending=False).head(10)[['Name', 'Team', 'Season', 'K/9']]
+            filters = [('IP', '>=', min_ip)] if 'IP' in pitching_data.columns else None
+            results['correlations'] = self._correlations('pitching', key_metrics, filters, filtered_data)
         
-        # Best control pitchers (lowest BB/9)
-        if 'BB/9' in filtered_data.columns and 'Name' in filtered_data.columns:
-            results['top_control'] = filtered_data.sort_values('BB/9').head(10)[['Name', 'Team', 'Season', 'BB/9']]
+        # Top performers by WAR, strikeout rate and control (lowest BB/9)
+        if 'Name' in filtered_data.columns:
+            results.update(compute_leaderboards(filtered_data, PITCHING_LEADERBOARDS))
         
         return results
     
+    @profiled()
+    @memoize_result('statcast')
     def statcast_analysis(self):
         """
         Perform statistical analysis on Statcast data
@@ -234,10 +376,193 @@ class StatisticalAnalysis:
         Returns:
             dict: Dictionary of analysis results
         """
-        if self.statcast_data is None:
-            self.statcast_data = load_data('statcast')
+        if self.uses_sql('statcast'):
+            return self._statcast_analysis_sql()
+        
+        if self.streams('statcast'):
+            return self._statcast_analysis_streaming()
+        
+        statcast_data = self.statcast_data
+        
+        if statcast_data.empty:
+            logger.warning("No Statcast data available for analysis")
+            return {}
+        
+        results = {}
+        
+        # Basic statistics for key metrics
+        key_metrics = ['launch_speed', 'launch_angle', 'release_speed', 'spin_rate']
+        key_metrics = [col for col in key_metrics if col in statcast_data.columns]
+        
+        if key_metrics:
+            results['basic_stats'] = statcast_data[key_metrics].describe()
+        
+        if 'pitch_type' not in statcast_data.columns:
+            return results
+        
+        # Encode pitch types once and aggregate every per-pitch metric together
+        pitch_index = GroupIndex(statcast_data, ['pitch_type'])
+        pitch_metrics = [col for col in ['launch_speed', 'launch_angle', 'hard_hit'] if col in statcast_data.columns]
+        by_pitch = pitch_index.aggregate(statcast_data, pitch_metrics)
+        
+        # Pitch type distribution
+        results['pitch_distribution'] = pitch_index.size().sort_values(ascending=False, kind='stable').to_dict()
+        
+        # Average launch speed and angle by pitch type
+        if all(col in statcast_data.columns for col in ['launch_speed', 'launch_angle']):
+            results['launch_by_pitch'] = {
+                metric: by_pitch[(metric, 'mean')].to_dict() for metric in ['launch_speed', 'launch_angle']
+            }
+        
+        # Hard hit rate by pitch type
+        if 'hard_hit' in statcast_data.columns:
+            results['hard_hit_rate'] = by_pitch[('hard_hit', 'mean')].to_dict()
+        
+        return results
+    
+    def _statcast_analysis_streaming(self):
+        """
+        Perform the Statcast analysis out of core
+        
+        Chunks of the processed files are streamed through mergeable aggregators (moment
+        sketches, per-pitch-type sums and quantile histograms), so peak memory is bounded
+        by the chunk size (BASEBALL_STREAM_CHUNK_MB) rather than the dataset size.
+        
+        Returns:
+            dict: Dictionary of analysis results (same keys as statcast_analysis)
+        """
+        chunks = lambda: iter_data('statcast', columns=self.DATASET_COLUMNS['statcast'])
+        key_metrics = ['launch_speed', 'launch_angle', 'release_speed', 'spin_rate']
+        pitch_metrics = ['launch_speed', 'launch_angle', 'hard_hit']
+        
+        columns = set()
+        sketches = []
+        pitch_tables = []
+        for chunk in chunks():
+            columns.update(chunk.columns)
+            sketches.append(MomentSketch.from_frame(chunk, key_metrics))
+            if 'pitch_type' in chunk.columns:
+                pitch_tables.append(grouped_stats(chunk, ['pitch_type'], [col for col in pitch_metrics if col in chunk.columns]))
+        
+        if not columns:
+            logger.warning("No Statcast data available for analysis")
+            return {}
+        
+        results = {}
+        
+        # Basic statistics for key metrics
+        sketch = MomentSketch.merge_all(sketches, key_metrics)
+        present = [col for col in key_metrics if col in columns]
+        if present:
+            results['basic_stats'] = streaming_describe(chunks, key_metrics, sketch)[present]
+        
+        if 'pitch_type' not in columns:
+            return results
+        
+        by_pitch = merge_aggregates(pitch_tables)
+        
+        # Pitch type distribution
+        sizes = by_pitch[('rows', 'count')].astype(int).rename('count')
+        results['pitch_distribution'] = sizes.sort_values(ascending=False, kind='stable').to_dict()
+        
+        # Average launch speed and angle by pitch type
+        if all(col in columns for col in ['launch_speed', 'launch_angle']):
+            results['launch_by_pitch'] = {
+                metric: by_pitch[(metric, 'mean')].to_dict() for metric in ['launch_speed', 'launch_angle']
+            }
+        
+        # Hard hit rate by pitch type
+        if 'hard_hit' in columns:
+            results['hard_hit_rate'] = by_pitch[('hard_hit', 'mean')].to_dict()
+        
+        return results
+    
+    @profiled()
+    def pitch_breakdown(self, keys=('pitch_type', 'pitcher', 'balls', 'strikes', 'stand'), metrics=None,
+                        start_date=None, end_date=None):
+        """
+        Aggregate pitch-level metrics over any combination of Statcast keys
+        
+        Args:
+            keys (tuple): Group key columns, e.g. pitch type x pitcher x count x batter stance
+            metrics (list, optional): Metrics to aggregate. Defaults to the launch, velocity and hard-hit metrics.
+            start_date (str, optional): First date to include (YYYY-MM-DD)
+            end_date (str, optional): Last date to include (YYYY-MM-DD)
+            
+        Returns:
+            pandas.DataFrame: One row per key combination with count/sum/sumsq/mean per metric
+        """
+        keys = list(keys)
+        if metrics is None:
+            metrics = ['launch_speed', 'launch_angle', 'release_speed', 'hard_hit']
+        
+        statcast_data = load_data('statcast', columns=keys + list(metrics), start_date=start_date, end_date=end_date)
+        if statcast_data.empty:
+            logger.warning("No Statcast data available for pitch breakdown")
+            return pd.DataFrame()
+        
+        missing = [col for col in keys if col not in statcast_data.columns]
+        if missing:
+            raise ValueError(f"Statcast data has no {missing} columns to group by")
+        
+        metrics = [col for col in metrics if col in statcast_data.columns]
+        return grouped_stats(statcast_data, keys, metrics)
+    
+    def _player_analysis_sql(self, data_type, qualifier, key_metrics, boards, derived=None):
+        """
+        Perform the batting or pitching analysis as SQL aggregations in the embedded backend
+        
+        Args:
+            data_type (str): 'batting' or 'pitching'
+            qualifier (tuple): (column, minimum) a player-season must reach to be included
+            key_metrics (list): Metrics to correlate
+            boards (dict): Leaderboards to compute
+            derived (dict, optional): Leaderboard columns computed in SQL, as name -> expression
+            
+        Returns:
+            dict: Dictionary of analysis results (same keys as batting_analysis/pitching_analysis)
+        """
+        columns = self.backend.columns(data_type)
+        if not columns:
+            logger.warning(f"No {data_type} data available for analysis")
+            return {}
+        
+        column, minimum = qualifier
+        filters = [(column, '>=', minimum)] if column in columns else None
+        
+        results = {}
+        
+        # Basic statistics, in the order of the analysis columns
+        numeric_cols = self.backend.numeric_columns(data_type, self.DATASET_COLUMNS[data_type])
+        results['basic_stats'] = self.backend.describe(data_type, numeric_cols, filters)
+        
+        # Correlation analysis
+        key_metrics = [col for col in key_metrics if col in columns]
+        if key_metrics:
+            results['correlations'] = dataset_sketch(data_type, key_metrics, filters).corr()
+        
+        # Top performers, ordered and limited in SQL
+        if 'Name' in columns:
+            derived = derived or {}
+            available = set(columns) | set(derived)
+            for name, board in boards.items():
+                if board.metric not in available:
+                    continue
+                board_columns = board.columns or DISPLAY_COLUMNS + [board.metric]
+                results[name] = self.backend.top_k(data_type, board.metric, 10, board.ascending,
+                                                   board_columns, filters, derived)
+        
+        return results
+    
+    def _statcast_analysis_sql(self):
+        """
+        Perform the Statcast analysis as SQL aggregations in the embedded backend
         
-        if self.statcast_data.empty:
+        Returns:
+            dict: Dictionary of analysis results (same keys as statcast_analysis)
+        """
+        columns = self.backend.columns('statcast')
+        if not columns:
             logger.warning("No Statcast data available for analysis")
             return {}
         
@@ -245,117 +570,105 @@ class StatisticalAnalysis:
         
         # Basic statistics for key metrics
         key_metrics = ['launch_speed', 'launch_angle', 'release_speed', 'spin_rate']
-        key_metrics = [col for col in key_metrics if col in self.statcast_data.columns]
+        key_metrics = [col for col in key_metrics if col in columns]
         
         if key_metrics:
-            results['basic_stats'] = self.statcast_data[key_metrics].describe()
+            results['basic_stats'] = self.backend.describe('statcast', key_metrics)
         
         # Pitch type distribution
-        if 'pitch_type' in self.statcast_data.columns:
-            results['pitch_distribution'] = self.statcast_data['pitch_type'].value_counts().to_dict()
+        if 'pitch_type' in columns:
+            results['pitch_distribution'] = self.backend.value_counts('statcast', 'pitch_type')
         
         # Average launch speed and angle by pitch type
-        if all(col in self.statcast_data.columns for col in ['pitch_type', 'launch_speed', 'launch_angle']):
-            results['launch_by_pitch'] = self.statcast_data.groupby('pitch_type')[['launch_speed', 'launch_angle']].mean().to_dict()
+        if all(col in columns for col in ['pitch_type', 'launch_speed', 'launch_angle']):
+            results['launch_by_pitch'] = self.backend.grouped_mean('statcast', 'pitch_type', ['launch_speed', 'launch_angle']).to_dict()
         
         # Hard hit rate by pitch type
-        if all(col in self.statcast_data.columns for col in ['pitch_type', 'hard_hit']):
-            results['hard_hit_rate'] = self.statcast_data.groupby('pitch_type')['hard_hit'].mean().to_dict()
+        if all(col in columns for col in ['pitch_type', 'hard_hit']):
+            results['hard_hit_rate'] = self.backend.grouped_mean('statcast', 'pitch_type', ['hard_hit'])['hard_hit'].to_dict()
         
         return results
     
-    def generate_visualizations(self, output_dir='visualizations'):
+    @profiled()
+    def generate_visualizations(self, output_dir='visualizations', force=False):
         """
         Generate visualizations from the analysis
         
+        Charts are rendered in parallel, and charts whose data is unchanged since the
+        last run are skipped.
+        
         Args:
             output_dir (str): Directory to save visualizations
+            force (bool): Re-render every chart
         """
         try:
-            # Ensure output directory exists
-            os.makedirs(output_dir, exist_ok=True)
+            batting_data = self.batting_data
+            pitching_data = self.pitching_data
+            streaming = self.streams('statcast')
+            statcast_data = pd.DataFrame() if streaming else self.statcast_data
+            
+            charts = []
             
             # Batting visualizations
-            if self.batting_data is not None and not self.batting_data.empty:
+            if not batting_data.empty:
                 # Distribution of key batting metrics
                 key_metrics = ['AVG', 'OBP', 'SLG', 'OPS', 'wRC+', 'WAR']
-                key_metrics = [col for col in key_metrics if col in self.batting_data.columns]
+                key_metrics = [col for col in key_metrics if col in batting_data.columns]
                 
                 if key_metrics:
-                    plt.figure(figsize=(15, 10))
-                    for i, metric in enumerate(key_metrics):
-                        plt.subplot(2, 3, i+1)
-                        sns.histplot(self.batting_data[metric].dropna(), kde=True)
-                        plt.title(f'Distribution of {metric}')
-                    
-                    plt.tight_layout()
-                    plt.savefig(f'{output_dir}/batting_metrics_distribution.png')
-                    plt.close()
-                    logger.info(f"Saved batting metrics distribution visualization to {output_dir}/batting_metrics_distribution.png")
+                    charts.append(ChartSpec('batting_metrics_distribution.png', 'distribution', batting_data[key_metrics], {}))
                 
                 # Correlation heatmap
                 if len(key_metrics) > 1:
-                    plt.figure(figsize=(12, 10))
-                    sns.heatmap(self.batting_data[key_metrics].corr(), annot=True, cmap='coolwarm')
-                    plt.title('Correlation Between Batting Metrics')
-                    plt.tight_layout()
-                    plt.savefig(f'{output_dir}/batting_correlation_heatmap.png')
-                    plt.close()
-                    logger.info(f"Saved batting correlation heatmap to {output_dir}/batting_correlation_heatmap.png")
+                    charts.append(ChartSpec('batting_correlation_heatmap.png', 'heatmap', batting_data[key_metrics].corr(),
+                                            {'title': 'Correlation Between Batting Metrics'}))
             
             # Pitching visualizations
-            if self.pitching_data is not None and not self.pitching_data.empty:
+            if not pitching_data.empty:
                 # Distribution of key pitching metrics
                 key_metrics = ['ERA', 'FIP', 'WHIP', 'K/9', 'BB/9', 'WAR']
-                key_metrics = [col for col in key_metrics if col in self.pitching_data.columns]
+                key_metrics = [col for col in key_metrics if col in pitching_data.columns]
                 
                 if key_metrics:
-                    plt.figure(figsize=(15, 10))
-                    for i, metric in enumerate(key_metrics):
-                        plt.subplot(2, 3, i+1)
-                        sns.histplot(self.pitching_data[metric].dropna(), kde=True)
-                        plt.title(f'Distribution of {metric}')
-                    
-                    plt.tight_layout()
-                    plt.savefig(f'{output_dir}/pitching_metrics_distribution.png')
-                    plt.close()
-                    logger.info(f"Saved pitching metrics distribution visualization to {output_dir}/pitching_metrics_distribution.png")
+                    charts.append(ChartSpec('pitching_metrics_distribution.png', 'distribution', pitching_data[key_metrics], {}))
                 
                 # Correlation heatmap
                 if len(key_metrics) > 1:
-                    plt.figure(figsize=(12, 10))
-                    sns.heatmap(self.pitching_data[key_metrics].corr(), annot=True, cmap='coolwarm')
-                    plt.title('Correlation Between Pitching Metrics')
-                    plt.tight_layout()
-                    plt.savefig(f'{output_dir}/pitching_correlation_heatmap.png')
-                    plt.close()
-                    logger.info(f"Saved pitching correlation heatmap to {output_dir}/pitching_correlation_heatmap.png")
+                    charts.append(ChartSpec('pitching_correlation_heatmap.png', 'heatmap', pitching_data[key_metrics].corr(),
+                                            {'title': 'Correlation Between Pitching Metrics'}))
             
             # Statcast visualizations
-            if self.statcast_data is not None and not self.statcast_data.empty:
-                # Launch angle vs. launch speed
-                if all(col in self.statcast_data.columns for col in ['launch_angle', 'launch_speed']):
-                    plt.figure(figsize=(10, 8))
-                    sns.scatterplot(data=self.statcast_data.sample(min(5000, len(self.statcast_data))), 
-                                   x='launch_angle', y='launch_speed', alpha=0.5)
-                    plt.title('Launch Angle vs. Launch Speed')
-                    plt.xlabel('Launch Angle (degrees)')
-                    plt.ylabel('Launch Speed (mph)')
-                    plt.tight_layout()
-                    plt.savefig(f'{output_dir}/launch_angle_vs_speed.png')
-                    plt.close()
-                    logger.info(f"Saved launch angle vs. speed visualization to {output_dir}/launch_angle_vs_speed.png")
-                
-                # Pitch type distribution
-                if 'pitch_type' in self.statcast_data.columns:
-                    plt.figure(figsize=(12, 8))
-                    sns.countplot(data=self.statcast_data, x='pitch_type', order=self.statcast_data['pitch_type'].value_counts().index)
-                    plt.title('Pitch Type Distribution')
-                    plt.xticks(rotation=45)
-                    plt.tight_layout()
-                    plt.savefig(f'{output_dir}/pitch_type_distribution.png')
-                    plt.close()
-                    logger.info(f"Saved pitch type distribution visualization to {output_dir}/pitch_type_distribution.png")
+            grid = None
+            outcome = 'hard_hit'
+            pitch_counts = None
+            if streaming:
+                # Binned and counted chunk by chunk without loading the dataset
+                grid = stream_density(iter_data('statcast', columns=['launch_angle', 'launch_speed', 'hard_hit']),
+                                      'launch_angle', 'launch_speed', outcome=outcome)
+                pitch_counts = pd.Series(self.statcast_analysis().get('pitch_distribution', {}), dtype=int)
+            elif not statcast_data.empty:
+                if all(col in statcast_data.columns for col in ['launch_angle', 'launch_speed']):
+                    outcome = 'hard_hit' if 'hard_hit' in statcast_data.columns else None
+                    grid = bin_density(statcast_data, 'launch_angle', 'launch_speed', outcome=outcome)
+                if 'pitch_type' in statcast_data.columns:
+                    pitch_counts = statcast_data['pitch_type'].value_counts()
+            
+            # Launch angle vs. launch speed, binned over every batted ball
+            if grid is not None and grid.total > 0:
+                charts.append(ChartSpec('launch_angle_vs_speed.png', 'density', density_frame(grid), {
+                    'bins': LAUNCH_BINS, 'ranges': LAUNCH_RANGES, 'title': 'Launch Angle vs. Launch Speed',
+                    'xlabel': 'Launch Angle (degrees)', 'ylabel': 'Launch Speed (mph)', 'outcome_label': OUTCOME_LABELS.get(outcome, outcome)
+                }))
+            
+            # Pitch type distribution
+            if pitch_counts is not None and not pitch_counts.empty:
+                counts = pitch_counts.rename_axis('pitch_type').reset_index(name='count')
+                charts.append(ChartSpec('pitch_type_distribution.png', 'counts', counts,
+                                        {'x': 'pitch_type', 'title': 'Pitch Type Distribution'}))
+            
+            status = render_charts(charts, output_dir, force=force)
+            rendered = sum(1 for result in status.values() if result == 'rendered')
+            logger.info(f"Rendered {rendered} of {len(status)} visualizations in {output_dir}")
             
         except Exception as e:
             logger.error(f"Error generating visualizations: {e}")
@@ -367,12 +680,46 @@ class PlayerEvaluationModel:
         """Initialize the player evaluation model class"""
         self.batting_data = None
         self.pitching_data = None
+        self.feature_keys = {}
         self.models = {}
     
     def load_data(self):
-        """Load data for modeling"""
-        self.batting_data = load_data('batting')
-        self.pitching_data = load_data('pitching')
+        """
+        Load data for modeling
+
+        Loaded frames are used as-is by the prepare methods instead of the feature store.
+        """
+        self.batting_data = load_data('batting', columns=BATTING_MODEL_COLUMNS)
+        self.pitching_data = load_data('pitching', columns=PITCHING_MODEL_COLUMNS)
+    
+    @profiled()
+    def _prepare_features(self, data_type, min_value):
+        """
+        Return a feature set's model inputs, read from the feature store unless data was loaded
+        
+        Args:
+            data_type (str): 'batting' or 'pitching'
+            min_value (float): Minimum of the qualification column (PA or IP)
+            
+        Returns:
+            tuple: (X, y, feature_names) or (None, None, None) if data is unavailable
+        """
+        data = self.batting_data if data_type == 'batting' else self.pitching_data
+        if data is not None:
+            feature_set = build_feature_set(data, data_type, min_value)
+        else:
+            feature_set = get_feature_set(data_type, min_value)
+        
+        if feature_set is None:
+            logger.warning(f"No {data_type} data available for modeling")
+            return None, None, None
+        
+        self.feature_keys[data_type] = feature_set.keys
+        X = feature_frame(feature_set)
+        y = pd.Series(feature_set.y, index=X.index, name=feature_set.target)
+        
+        logger.info(f"Prepared {data_type} features: {len(X)} samples, {len(feature_set.features)} features")
+        return X, y, feature_set.features
     
     def prepare_batting_features(self, min_pa=100):
         """
@@ -381,5 +728,350 @@ class PlayerEvaluationModel:
         Args:
             min_pa (int): Minimum plate appearances to include
             
-      
-(Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
+        Returns:
+            tuple: (X, y, feature_names) or (None, None, None) if data is unavailable
+        """
+        return self._prepare_features('batting', min_pa)
+    
+    def prepare_pitching_features(self, min_ip=30):
+        """
+        Prepare features for pitching models
+        
+        Args:
+            min_ip (int): Minimum innings pitched to include
+            
+        Returns:
+            tuple: (X, y, feature_names) or (None, None, None) if data is unavailable
+        """
+        return self._prepare_features('pitching', min_ip)
+    
+    def _train_holdout(self, X, y, model_type):
+        """
+        Fit each candidate with default hyperparameters on an 80/20 train/test split
+        
+        Args:
+            X (pandas.DataFrame): Feature matrix
+            y (pandas.Series): Target values
+            model_type (str): 'batting' or 'pitching'
+            
+        Returns:
+            tuple: (metrics DataFrame sorted by R2, fitted scaler, dict of model name to model)
+        """
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
+        
+        candidates = {
+            'Linear Regression': LinearRegression(),
+            'Ridge Regression': Ridge(),
+            'Lasso Regression': Lasso(),
+            'Random Forest': RandomForestRegressor(n_estimators=100, random_state=42),
+            'Gradient Boosting': GradientBoostingRegressor(random_state=42)
+        }
+        
+        metrics = []
+        fitted = {}
+        for name, model in candidates.items():
+            model.fit(X_train_scaled, y_train)
+            y_pred = model.predict(X_test_scaled)
+            
+            metrics.append({
+                'Model': name,
+                'RMSE': np.sqrt(mean_squared_error(y_test, y_pred)),
+                'MAE': mean_absolute_error(y_test, y_pred),
+                'R2': r2_score(y_test, y_pred)
+            })
+            fitted[name] = model
+            logger.info(f"Trained {model_type} {name}: R2={metrics[-1]['R2']:.3f}")
+        
+        return pd.DataFrame(metrics).sort_values('R2', ascending=False), scaler, fitted
+    
+    @profiled()
+    def train_models(self, X, y, features, model_type, search=False, groups=None):
+        """
+        Train and evaluate candidate WAR models
+        
+        Args:
+            X (pandas.DataFrame): Feature matrix
+            y (pandas.Series): Target values
+            features (list): Feature names
+            model_type (str): 'batting' or 'pitching'
+            search (bool): Tune hyperparameters with cross-validated successive halving
+                instead of fitting defaults on one train/test split
+            groups (pandas.Series, optional): Season of each row, for season-grouped folds
+            
+        Returns:
+            pandas.DataFrame: Evaluation metrics for each model
+        """
+        if search:
+            metrics_df, pipelines = search_models(X, y, groups)
+            # Every pipeline's scaler was refitted on the same rows, so any of them serves
+            scaler = next(iter(pipelines.values())).named_steps['scaler']
+            fitted = {name: pipeline.named_steps['model'] for name, pipeline in pipelines.items()}
+        else:
+            metrics_df, scaler, fitted = self._train_holdout(X, y, model_type)
+        
+        best_name = metrics_df.iloc[0]['Model']
+        
+        # Save metrics and feature importance reports
+        metrics_df.to_csv(f'reports/{model_type}_model_metrics.csv', index=False)
+        
+        importance = pd.DataFrame({
+            'Feature': features,
+            'Importance': fitted['Random Forest'].feature_importances_
+        }).sort_values('Importance', ascending=False)
+        importance.to_csv(f'reports/{model_type}_feature_importance.csv', index=False)
+        
+        # Register the best model with its scaler, feature order and training data version
+        best_metrics = metrics_df.iloc[0].drop(labels=['Model']).to_dict()
+        version = get_registry().register(
+            f'{model_type}_war', fitted[best_name], scaler, features, best_name,
+            metrics={key: value.item() if hasattr(value, 'item') else value for key, value in best_metrics.items()},
+            data_version=dataset_version(model_type),
+            params=fitted[best_name].get_params()
+        )
+        logger.info(f"Saved {model_type} WAR model ({best_name}) as registry version {version}")
+        
+        self.models[model_type] = {
+            'model': fitted[best_name],
+            'model_name': best_name,
+            'scaler': scaler,
+            'features': features,
+            'version': version,
+            'all_models': fitted
+        }
+        
+        return metrics_df
+    
+    def predictor(self, model_type):
+        """
+        Return a prediction API for a WAR model
+        
+        Uses the model trained by this instance if there is one, otherwise the current
+        registered model.
+        
+        Args:
+            model_type (str): 'batting' or 'pitching'
+            
+        Returns:
+            WARPredictor: Predictor, or None if no model is available
+        """
+        if model_type in self.models:
+            trained = self.models[model_type]
+            return WARPredictor(trained['model'], trained['scaler'], trained['features'],
+                                trained['model_name'], trained['version'])
+        return load_predictor(model_type)
+    
+    @profiled()
+    def predict(self, model_type, X):
+        """
+        Predict WAR for a batch of players
+        
+        Args:
+            model_type (str): 'batting' or 'pitching'
+            X (pandas.DataFrame): Player features (extra columns are ignored)
+            
+        Returns:
+            numpy.ndarray: Predicted WAR, or None if no model is available
+        """
+        predictor = self.predictor(model_type)
+        if predictor is None:
+            logger.warning(f"No {model_type} WAR model available for prediction")
+            return None
+        
+        predictions, latency = predictor.predict_batch(X)
+        logger.info(f"Predicted {model_type} WAR for {len(predictions)} players in {latency / 1000:.2f} ms")
+        return predictions
+    
+    def train_batting_models(self, min_pa=100, search=False):
+        """
+        Train WAR prediction models for batters
+        
+        Args:
+            min_pa (int): Minimum plate appearances to include
+            search (bool): Tune hyperparameters with cross-validated successive halving
+            
+        Returns:
+            pandas.DataFrame: Evaluation metrics for each model
+        """
+        X, y, features = self.prepare_batting_features(min_pa)
+        if X is None or len(X) < 10:
+            logger.warning("Not enough batting data to train models")
+            return pd.DataFrame()
+        
+        keys = self.feature_keys['batting']
+        groups = keys['Season'] if 'Season' in keys.columns else None
+        return self.train_models(X, y, features, 'batting', search=search, groups=groups)
+    
+    def train_pitching_models(self, min_ip=30, search=False):
+        """
+        Train WAR prediction models for pitchers
+        
+        Args:
+            min_ip (int): Minimum innings pitched to include
+            search (bool): Tune hyperparameters with cross-validated successive halving
+            
+        Returns:
+            pandas.DataFrame: Evaluation metrics for each model
+        """
+        X, y, features = self.prepare_pitching_features(min_ip)
+        if X is None or len(X) < 10:
+            logger.warning("Not enough pitching data to train models")
+            return pd.DataFrame()
+        
+        keys = self.feature_keys['pitching']
+        groups = keys['Season'] if 'Season' in keys.columns else None
+        return self.train_models(X, y, features, 'pitching', search=search, groups=groups)
+
+class PlayerComparisonTool:
+    """Class for finding statistically similar players"""
+    
+    @profiled()
+    def find_similar(self, data_type, player_name, season=None, n=10, filters=None):
+        """
+        Find the player-seasons closest to a player in standardized feature space
+        
+        Args:
+            data_type (str): 'batting' or 'pitching'
+            player_name (str): Name of the reference player
+            season (int, optional): Season of the reference player. If None, uses the latest.
+            n (int): Number of similar players to return
+            filters (list, optional): (column, operator, value) tuples restricting the results,
+                e.g. [('Season', '==', 2023)]
+            
+        Returns:
+            pandas.DataFrame: Most similar player-seasons with their distance
+        """
+        return get_similarity_index(data_type).query(player_name, season, n, filters)
+    
+    def find_similar_batters(self, player_name, season=None, n=10, filters=None):
+        """
+        Find batters similar to a given batter
+        
+        Args:
+            player_name (str): Name of the reference batter
+            season (int, optional): Season of the reference batter
+            n (int): Number of similar batters to return
+            filters (list, optional): (column, operator, value) tuples restricting the results
+            
+        Returns:
+            pandas.DataFrame: Most similar batters
+        """
+        return self.find_similar('batting', player_name, season, n, filters)
+    
+    def find_similar_pitchers(self, player_name, season=None, n=10, filters=None):
+        """
+        Find pitchers similar to a given pitcher
+        
+        Args:
+            player_name (str): Name of the reference pitcher
+            season (int, optional): Season of the reference pitcher
+            n (int): Number of similar pitchers to return
+            filters (list, optional): (column, operator, value) tuples restricting the results
+            
+        Returns:
+            pandas.DataFrame: Most similar pitchers
+        """
+        return self.find_similar('pitching', player_name, season, n, filters)
+    
+    @profiled()
+    def all_similar(self, data_type, n=10):
+        """
+        Find the most similar player-seasons for every player-season
+        
+        Args:
+            data_type (str): 'batting' or 'pitching'
+            n (int): Neighbours per player-season
+            
+        Returns:
+            pandas.DataFrame: One row per (player-season, neighbour) pair
+        """
+        return get_similarity_index(data_type).all_pairs(n)
+
+def save_analysis_results(results, prefix, output_dir='reports'):
+    """
+    Save analysis results to CSV files
+    
+    Args:
+        results (dict): Dictionary of analysis results
+        prefix (str): Filename prefix (e.g. 'batting')
+        output_dir (str): Directory to save reports
+    """
+    for name, result in results.items():
+        try:
+            if isinstance(result, pd.DataFrame):
+                result.to_csv(f'{output_dir}/{prefix}_{name}.csv')
+            elif isinstance(result, dict):
+                pd.DataFrame(result).to_csv(f'{output_dir}/{prefix}_{name}.csv')
+        except Exception as e:
+            logger.error(f"Error saving {prefix} {name} results: {e}")
+    
+    logger.info(f"Saved {prefix} analysis results to {output_dir}")
+
+@profiled()
+def main():
+    """Main function to run analysis and modeling"""
+    try:
+        # Statistical analysis
+        logger.info("Starting statistical analysis")
+        analysis = StatisticalAnalysis()
+        analysis.load_all_data()
+        
+        batting_results = analysis.batting_analysis()
+        save_analysis_results(batting_results, 'batting')
+        
+        pitching_results = analysis.pitching_analysis()
+        save_analysis_results(pitching_results, 'pitching')
+        
+        statcast_results = analysis.statcast_analysis()
+        if 'basic_stats' in statcast_results:
+            statcast_results['basic_stats'].to_csv('reports/statcast_basic_stats.csv')
+        
+        # Player-season xBA/xwOBA from the batted-ball lookup table
+        expected = player_expected_stats(load_data('statcast', columns=EXPECTED_STATS_COLUMNS), get_expected_stats_table())
+        if not expected.empty:
+            expected.to_csv('reports/statcast_expected_stats.csv', index=False)
+        
+        analysis.generate_visualizations()
+        logger.info("Statistical analysis completed")
+        
+        # Next-season projections for every player
+        for data_type in ['batting', 'pitching']:
+            projected = season_projections(data_type)
+            if not projected.empty:
+                projected.to_csv(f'reports/{data_type}_projections.csv', index=False)
+        
+        # Player evaluation models
+        logger.info("Starting model training")
+        model = PlayerEvaluationModel()
+        model.train_batting_models(search=True)
+        model.train_pitching_models(search=True)
+        logger.info("Model training completed")
+        
+        # Build the similarity indexes and report comparisons for the top players by WAR
+        comparison_tool = PlayerComparisonTool()
+        
+        for data_type, results in [('batting', batting_results), ('pitching', pitching_results)]:
+            if 'top_war' in results and not results['top_war'].empty:
+                top_player = results['top_war'].iloc[0]['Name']
+                similar = comparison_tool.find_similar(data_type, top_player)
+                if not similar.empty:
+                    logger.info(f"Most similar to {top_player}: {', '.join(similar['Name'].head(3))}")
+        
+    except Exception as e:
+        logger.error(f"Error in analysis and modeling: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    # Set up logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("logs/analysis_modeling.log"),
+            logging.StreamHandler()
+        ]
+    )
+    main()
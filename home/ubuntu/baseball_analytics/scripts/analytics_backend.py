@@ -0,0 +1,507 @@
+"""
+Analytics backend selection for Baseball Analytics System
+This module lets the pipeline run either against the Postgres server or against an
+embedded DuckDB database that queries the processed CSV/Parquet files directly.
+"""
+
+import os
+import glob
+import logging
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:  # DuckDB is only required for the embedded backend
+    duckdb = None
+
+logger = logging.getLogger(__name__)
+
+# Backend selection ('postgres' or 'duckdb')
+ANALYTICS_BACKEND = os.environ.get('BASEBALL_ANALYTICS_BACKEND', 'postgres').lower()
+
+# Embedded database file holding the pipeline's tables (model_predictions and the tables
+# written through the SQLAlchemy URL). Analytical queries over the processed files run in
+# a transient in-memory DuckDB instead, so readers never hold the file's write lock.
+DUCKDB_PATH = os.environ.get('BASEBALL_DUCKDB_PATH', 'data/baseball_analytics.duckdb')
+DUCKDB_URL = f"duckdb:///{DUCKDB_PATH}"
+
+PROCESSED_DATA_DIR = 'data/processed'
+
+# File name prefixes written by clean_data.py for each dataset
+DATASET_PREFIXES = {
+    'batting': 'clean_batting_stats_',
+    'pitching': 'clean_pitching_stats_',
+    'team': 'clean_team_data_',
+    'statcast': 'clean_statcast_',
+}
+
+# Comparison operators accepted in load filters
+FILTER_OPERATORS = ('==', '!=', '>', '>=', '<', '<=', 'in')
+
+# DuckDB column types summarized as numeric (pandas select_dtypes(include=[np.number]))
+NUMERIC_TYPES = ('TINYINT', 'SMALLINT', 'INTEGER', 'BIGINT', 'HUGEINT', 'UTINYINT', 'USMALLINT',
+                 'UINTEGER', 'UBIGINT', 'FLOAT', 'DOUBLE', 'DECIMAL')
+
+def use_duckdb():
+    """Return True when the embedded DuckDB backend is selected"""
+    return ANALYTICS_BACKEND == 'duckdb'
+
+def get_database_url(default_url):
+    """
+    Resolve the SQLAlchemy URL for the configured backend
+
+    Args:
+        default_url (str): Postgres URL used when the server backend is selected
+
+    Returns:
+        str: Database URL
+    """
+    if use_duckdb():
+        os.makedirs(os.path.dirname(DUCKDB_PATH) or '.', exist_ok=True)
+        return DUCKDB_URL
+    return default_url
+
+def dataset_files(data_type, year=None, data_dir=PROCESSED_DATA_DIR):
+    """
+    List the processed files for a dataset
+
+    Args:
+        data_type (str): Type of data ('batting', 'pitching', 'team', 'statcast')
+        year (int, optional): Restrict to files for this year
+        data_dir (str): Directory holding the processed files
+
+    Returns:
+        list: Sorted file paths (Parquet and CSV)
+    """
+    prefix = DATASET_PREFIXES.get(data_type, f'clean_{data_type}_stats_')
+    if year is None:
+        stem = f'{prefix}*'
+    elif data_type == 'statcast':
+        # Statcast files are named by date range (clean_statcast_<start>_to_<end>.csv)
+        stem = f'{prefix}*{year}*'
+    else:
+        stem = f'{prefix}{year}'
+
+    files = []
+    for extension in ('parquet', 'csv'):
+        files.extend(glob.glob(os.path.join(data_dir, f'{stem}.{extension}')))
+    return sorted(files)
+
+def read_dataset_file(path, columns=None):
+    """
+    Read a processed Parquet or CSV file into a DataFrame
+
+    Args:
+        path (str): File path
+        columns (list, optional): Columns to read; columns missing from the file are ignored
+
+    Returns:
+        pandas.DataFrame: File contents
+    """
+    if path.endswith('.parquet'):
+        if columns is not None:
+            import pyarrow.parquet as pq
+            available = set(pq.read_schema(path).names)
+            columns = [col for col in columns if col in available]
+        return pd.read_parquet(path, columns=columns)
+
+    if columns is None:
+        return pd.read_csv(path)
+
+    # Only the requested columns are parsed, returned in the requested order like Parquet
+    wanted = set(columns)
+    data = pd.read_csv(path, usecols=lambda col: col in wanted)
+    return data[[col for col in columns if col in data.columns]]
+
+def iter_dataset_file(path, columns=None, chunk_rows=100000):
+    """
+    Read a processed Parquet or CSV file in chunks of rows
+
+    Args:
+        path (str): File path
+        columns (list, optional): Columns to read; columns missing from the file are ignored
+        chunk_rows (int): Rows per chunk
+
+    Yields:
+        pandas.DataFrame: Consecutive chunks of the file
+    """
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        if columns is not None:
+            available = set(parquet_file.schema_arrow.names)
+            columns = [col for col in columns if col in available]
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    usecols = None
+    if columns is not None:
+        wanted = set(columns)
+        usecols = lambda col: col in wanted
+    with pd.read_csv(path, usecols=usecols, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield chunk if columns is None else chunk[[col for col in columns if col in chunk.columns]]
+
+def quote_identifier(name):
+    """Quote a column name for SQL (handles names such as 'BB%' or 'K/9')"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+def apply_filters(data, filters):
+    """
+    Apply load filters to a DataFrame
+
+    Args:
+        data (pandas.DataFrame): Data to filter
+        filters (list): List of (column, operator, value) tuples
+
+    Returns:
+        pandas.DataFrame: Filtered data
+    """
+    if not filters or data.empty:
+        return data
+
+    mask = pd.Series(True, index=data.index)
+    for column, operator, value in filters:
+        if column not in data.columns:
+            logger.warning(f"Filter column {column} not found, skipping filter")
+            continue
+        if operator not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {operator}")
+
+        series = data[column]
+        if operator == '==':
+            mask &= series == value
+        elif operator == '!=':
+            mask &= series != value
+        elif operator == '>':
+            mask &= series > value
+        elif operator == '>=':
+            mask &= series >= value
+        elif operator == '<':
+            mask &= series < value
+        elif operator == '<=':
+            mask &= series <= value
+        else:
+            mask &= series.isin(list(value))
+
+    return data[mask]
+
+class DuckDBBackend:
+    """Embedded analytical backend running vectorized SQL over the processed files"""
+
+    def __init__(self, database=':memory:', data_dir=PROCESSED_DATA_DIR):
+        """
+        Initialize the DuckDB backend
+
+        Args:
+            database (str): DuckDB database path. Defaults to a transient in-memory
+                database; the processed files are queried directly, so nothing needs to
+                persist, and DUCKDB_PATH stays free for the processes writing tables.
+            data_dir (str): Directory holding the processed files
+        """
+        if duckdb is None:
+            raise ImportError("The duckdb package is required for the embedded analytics backend")
+
+        self.data_dir = data_dir
+        self.connection = duckdb.connect(database)
+
+    def source(self, data_type, year=None, files=None, ordered=False):
+        """
+        Build the SQL table expression reading a dataset's files
+
+        Args:
+            data_type (str): Type of data
+            year (int, optional): Restrict to files for this year
+            files (list, optional): Explicit files to read instead of discovering them
+            ordered (bool): Add filename and ordinality columns giving each row's file
+                and position, so results can be ordered like the files are read
+
+        Returns:
+            str: Table expression, or None if no files exist
+        """
+        if files is None:
+            files = dataset_files(data_type, year, self.data_dir)
+        if not files:
+            return None
+
+        def file_list(paths):
+            return '[' + ', '.join("'" + path.replace("'", "''") + "'" for path in paths) + ']'
+
+        parquet_files = [f for f in files if f.endswith('.parquet')]
+        csv_files = [f for f in files if f.endswith('.csv')]
+
+        options = ', filename=true) WITH ORDINALITY' if ordered else ')'
+        sources = []
+        if parquet_files:
+            sources.append(f"SELECT * FROM read_parquet({file_list(parquet_files)}, union_by_name=true{options}")
+        if csv_files:
+            sources.append(f"SELECT * FROM read_csv_auto({file_list(csv_files)}, union_by_name=true{options}")
+
+        return '(' + ' UNION ALL BY NAME '.join(sources) + ')'
+
+    def where_clause(self, filters):
+        """
+        Translate load filters into a parameterized WHERE clause
+
+        Args:
+            filters (list): List of (column, operator, value) tuples
+
+        Returns:
+            tuple: (sql, params)
+        """
+        if not filters:
+            return '', []
+
+        clauses = []
+        params = []
+        for column, operator, value in filters:
+            if operator not in FILTER_OPERATORS:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+            if operator == 'in':
+                values = list(value)
+                if not values:
+                    clauses.append('FALSE')
+                    continue
+                clauses.append(f"{quote_identifier(column)} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+            else:
+                sql_operator = '=' if operator == '==' else operator
+                clauses.append(f"{quote_identifier(column)} {sql_operator} ?")
+                params.append(value)
+
+        return ' WHERE ' + ' AND '.join(clauses), params
+
+    def query(self, sql, params=None):
+        """
+        Run a query and return the result as a DataFrame
+
+        Args:
+            sql (str): SQL query
+            params (list, optional): Query parameters
+
+        Returns:
+            pandas.DataFrame: Query result
+        """
+        return self.connection.execute(sql, params or []).df()
+
+    def columns(self, data_type, files=None):
+        """Return the column names of a dataset"""
+        source = self.source(data_type, files=files)
+        if source is None:
+            return []
+        return self.query(f"SELECT * FROM {source} LIMIT 0").columns.tolist()
+
+    def numeric_columns(self, data_type, columns=None):
+        """
+        Return the numeric columns of a dataset
+
+        Args:
+            data_type (str): Type of data
+            columns (list, optional): Candidate columns; the result keeps their order.
+                Defaults to every column in file order.
+
+        Returns:
+            list: Numeric column names
+        """
+        source = self.source(data_type)
+        if source is None:
+            return []
+
+        schema = self.query(f"DESCRIBE SELECT * FROM {source}")
+        numeric = {
+            name for name, column_type in zip(schema['column_name'], schema['column_type'])
+            if column_type.split('(')[0] in NUMERIC_TYPES
+        }
+        candidates = schema['column_name'].tolist() if columns is None else columns
+        return [col for col in candidates if col in numeric]
+
+    def select_list(self, data_type, columns, files=None):
+        """
+        Build the SQL select list for a column projection
+
+        Args:
+            data_type (str): Type of data
+            columns (list): Requested columns (None for all); missing columns are ignored
+            files (list, optional): Explicit files the dataset is read from
+
+        Returns:
+            str: Select list
+        """
+        if columns is None:
+            return '*'
+
+        available = set(self.columns(data_type, files))
+        selected = [quote_identifier(col) for col in columns if col in available]
+        return ', '.join(selected) if selected else '*'
+
+    def load(self, data_type, year=None, filters=None, files=None, columns=None):
+        """
+        Load a dataset with the filters and column projection evaluated in SQL
+
+        Args:
+            data_type (str): Type of data
+            year (int, optional): Restrict to files for this year
+            filters (list, optional): List of (column, operator, value) tuples
+            files (list, optional): Explicit files to read instead of discovering them
+            columns (list, optional): Columns to return
+
+        Returns:
+            pandas.DataFrame: Loaded data
+        """
+        if files is None:
+            files = dataset_files(data_type, year, self.data_dir)
+        source = self.source(data_type, year, files)
+        if source is None:
+            return pd.DataFrame()
+
+        where, params = self.where_clause(filters)
+        select = self.select_list(data_type, columns, files)
+        return self.query(f"SELECT {select} FROM {source}{where}", params)
+
+    def describe(self, data_type, metrics, filters=None):
+        """
+        Compute describe()-style summary statistics in SQL
+
+        Args:
+            data_type (str): Type of data
+            metrics (list): Numeric columns to summarize
+            filters (list, optional): List of (column, operator, value) tuples
+
+        Returns:
+            pandas.DataFrame: Summary indexed like pandas.DataFrame.describe()
+        """
+        source = self.source(data_type)
+        if source is None or not metrics:
+            return pd.DataFrame()
+
+        statistics = [
+            ('count', 'count({})'),
+            ('mean', 'avg({})'),
+            ('std', 'stddev_samp({})'),
+            ('min', 'min({})'),
+            ('25%', 'quantile_cont({}, 0.25)'),
+            ('50%', 'quantile_cont({}, 0.5)'),
+            ('75%', 'quantile_cont({}, 0.75)'),
+            ('max', 'max({})'),
+        ]
+        select = []
+        for i, metric in enumerate(metrics):
+            for j, (_, template) in enumerate(statistics):
+                select.append(f"{template.format(quote_identifier(metric))} AS s_{i}_{j}")
+
+        where, params = self.where_clause(filters)
+        row = self.query(f"SELECT {', '.join(select)} FROM {source}{where}", params).iloc[0]
+
+        summary = {
+            metric: [row[f's_{i}_{j}'] for j in range(len(statistics))]
+            for i, metric in enumerate(metrics)
+        }
+        return pd.DataFrame(summary, index=[name for name, _ in statistics], dtype=float)
+
+    def top_k(self, data_type, metric, k, ascending=False, columns=None, filters=None, derived=None):
+        """
+        Return the k best rows by a metric, ordered and limited in SQL
+
+        Ties are broken by file and row order, matching the stable sort of
+        leaderboards.top_k_positions over the same files.
+
+        Args:
+            data_type (str): Type of data
+            metric (str): Column to rank by (rows where it is missing are never ranked)
+            k (int): Number of rows to return
+            ascending (bool): Rank the lowest values first
+            columns (list, optional): Columns to return, in order; missing columns are ignored
+            filters (list, optional): List of (column, operator, value) tuples
+            derived (dict, optional): Extra columns as a mapping of name to SQL expression
+
+        Returns:
+            pandas.DataFrame: Up to k rows, best first
+        """
+        source = self.source(data_type, ordered=True)
+        if source is None:
+            return pd.DataFrame()
+
+        derived = derived or {}
+        if derived:
+            extra = ', '.join(f"{expression} AS {quote_identifier(name)}" for name, expression in derived.items())
+            source = f"(SELECT *, {extra} FROM {source})"
+
+        available = set(self.columns(data_type)) | set(derived)
+        selected = [quote_identifier(col) for col in (columns or [metric]) if col in available]
+
+        where, params = self.where_clause(filters)
+        quoted = quote_identifier(metric)
+        condition = f"{quoted} IS NOT NULL AND NOT isnan({quoted})"
+        where = f"{where} AND {condition}" if where else f" WHERE {condition}"
+        direction = 'ASC' if ascending else 'DESC'
+        return self.query(
+            f"SELECT {', '.join(selected)} FROM {source}{where} "
+            f"ORDER BY {quoted} {direction}, filename, ordinality LIMIT {int(k)}",
+            params
+        )
+
+    def value_counts(self, data_type, column):
+        """
+        Count rows per value of a column, most frequent first
+
+        Args:
+            data_type (str): Type of data
+            column (str): Column to count
+
+        Returns:
+            dict: Mapping of value to count
+        """
+        source = self.source(data_type)
+        if source is None:
+            return {}
+
+        quoted = quote_identifier(column)
+        result = self.query(
+            f"SELECT {quoted} AS value, count(*) AS n FROM {source} "
+            f"WHERE {quoted} IS NOT NULL GROUP BY {quoted} ORDER BY n DESC"
+        )
+        return dict(zip(result['value'], result['n'].astype(int)))
+
+    def grouped_mean(self, data_type, by, metrics):
+        """
+        Compute per-group means in SQL
+
+        Args:
+            data_type (str): Type of data
+            by (str): Grouping column
+            metrics (list): Columns to average
+
+        Returns:
+            pandas.DataFrame: Means indexed by group value
+        """
+        source = self.source(data_type)
+        if source is None:
+            return pd.DataFrame()
+
+        quoted = quote_identifier(by)
+        select = ', '.join(f"avg({quote_identifier(m)}) AS {quote_identifier(m)}" for m in metrics)
+        result = self.query(
+            f"SELECT {quoted}, {select} FROM {source} "
+            f"WHERE {quoted} IS NOT NULL GROUP BY {quoted} ORDER BY {quoted}"
+        )
+        return result.set_index(by)
+
+_backend = None
+
+def get_backend():
+    """
+    Return the shared embedded backend, or None when the Postgres backend is selected
+
+    Returns:
+        DuckDBBackend: Shared backend instance, or None
+    """
+    global _backend
+
+    if not use_duckdb():
+        return None
+
+    if _backend is None:
+        _backend = DuckDBBackend()
+        logger.info(f"Using embedded DuckDB analytics backend over {PROCESSED_DATA_DIR}")
+    return _backend
@@ -0,0 +1,411 @@
+"""
+Pipeline benchmarks for Baseball Analytics System
+This module runs the cleaning, loading, analysis, modeling and dashboard stages against
+seeded synthetic data in a scratch workspace, fully offline, and records each stage's
+wall time, CPU time and peak memory so runs can be compared across commits.
+
+Usage:
+    python scripts/benchmark.py [scale] [seed]         run the suite (scale in seasons, default 1/26 = one week)
+    python scripts/benchmark.py search [scale] [seed]  time the model search alone (default 10 seasons)
+    python scripts/benchmark.py compare [run]          compare the latest run with an earlier one
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import shutil
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+import logging
+from datetime import datetime
+from fractions import Fraction
+import numpy as np
+import pandas as pd
+
+from synthetic_data import PITCHES_PER_WEEK, WEEKS_PER_SEASON, generate_raw_data
+
+logger = logging.getLogger(__name__)
+
+# Results of every run are appended here (JSON lines)
+RESULTS_PATH = os.path.abspath(os.environ.get('BASEBALL_BENCHMARK_RESULTS', os.path.join('benchmarks', 'results.jsonl')))
+
+# Timed repetitions per stage; one further run measures peak memory
+REPEAT = int(os.environ.get('BASEBALL_BENCHMARK_REPEAT', '3'))
+
+# Slowdown over the baseline reported as a regression
+REGRESSION_THRESHOLD = float(os.environ.get('BASEBALL_BENCHMARK_THRESHOLD', '0.10'))
+
+# Workspace directories the pipeline scripts expect relative to the working directory
+WORKSPACE_DIRS = ['data/raw', 'data/processed', 'logs', 'models', 'reports', 'visualizations']
+
+# Stages of a search-only run; the search cost grows with seasons of batting data, which
+# the full suite's default one-week scale holds only one of
+SEARCH_STAGES = ['clean.batting', 'model.search_batting']
+SEARCH_SCALE = 10
+
+# Dashboard callbacks memoized on their inputs and the data version
+MEMOIZED_CALLBACKS = ['dashboard.player_graph', 'dashboard.team_graph', 'dashboard.statcast_graph.velocity']
+
+def _git_commit():
+    """Return the commit the benchmarked code is at, or None outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def measure(func, repeat=REPEAT, setup=None):
+    """
+    Time a stage and measure its peak memory
+
+    Args:
+        func (callable): Stage to run
+        repeat (int): Timed runs
+        setup (callable, optional): Run untimed before every run, e.g. to clear caches
+
+    Returns:
+        dict: Minimum and median wall ms, median CPU ms, peak traced memory in MB and
+        rows of the result
+    """
+    wall, cpu = [], []
+    result = None
+    for _ in range(max(1, repeat)):
+        if setup is not None:
+            setup()
+        gc.collect()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        result = func()
+        wall.append((time.perf_counter() - wall_start) * 1000)
+        cpu.append((time.process_time() - cpu_start) * 1000)
+
+    # Memory is traced in a separate run since tracing slows allocation-heavy code
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    rows = len(result) if isinstance(result, (pd.DataFrame, pd.Series)) else None
+    return {
+        'wall_ms': round(min(wall), 3),
+        'median_wall_ms': round(float(np.median(wall)), 3),
+        'cpu_ms': round(float(np.median(cpu)), 3),
+        'peak_mb': round(peak / 1e6, 3),
+        'rows': rows
+    }
+
+def _stages(raw_files):
+    """
+    Build the benchmarked stages in pipeline order
+
+    The pipeline modules resolve their data, model and report paths against the working
+    directory, so they are imported only once the workspace is current.
+
+    Args:
+        raw_files (dict): Raw files per dataset from generate_raw_data
+
+    Returns:
+        list: (stage name, callable, setup callable or None) tuples
+    """
+    import clean_data
+    from data_access import frame_cache, load_data
+    import analysis_modeling as am
+    from feature_store import build_feature_set, feature_frame, get_feature_set
+    from projections import project, projection_columns
+    from expected_stats import STATCAST_COLUMNS as EXPECTED_STATS_COLUMNS, ExpectedStatsTable, player_expected_stats
+    from similarity_index import SimilarityIndex
+
+    cleaners = {
+        'statcast': (clean_data.clean_statcast_data, 'statcast_', 'clean_statcast_'),
+        'batting': (clean_data.clean_batting_stats, 'batting_stats_', 'clean_batting_stats_'),
+        'pitching': (clean_data.clean_pitching_stats, 'pitching_stats_', 'clean_pitching_stats_'),
+        'team': (clean_data.clean_team_data, 'team_data_', 'clean_team_data_')
+    }
+
+    def clean(data_type):
+        cleaner, prefix, clean_prefix = cleaners[data_type]
+        frames = []
+        for path in raw_files[data_type]:
+            data = cleaner(path)
+            clean_data.save_to_csv(data, os.path.basename(path).replace(prefix, clean_prefix))
+            frames.append(data)
+        return pd.concat(frames, ignore_index=True)
+
+    def analysis():
+        # Results are not cached so every run does the work
+        return am.StatisticalAnalysis(result_cache=None)
+
+    stages = [(f'clean.{data_type}', lambda data_type=data_type: clean(data_type), None) for data_type in cleaners]
+
+    for data_type in ['batting', 'pitching', 'team', 'statcast']:
+        stages.append((f'load_data.{data_type}.cold', lambda data_type=data_type: load_data(data_type), frame_cache.clear))
+        stages.append((f'load_data.{data_type}.warm', lambda data_type=data_type: load_data(data_type), None))
+    stages.append(('load_data.statcast.columns', lambda: load_data('statcast', columns=am.STATCAST_ANALYSIS_COLUMNS), frame_cache.clear))
+
+    stages += [
+        ('analysis.season_summaries', lambda: analysis().season_summaries('batting'), None),
+        ('analysis.leaderboards', lambda: analysis().leaderboards('batting', by='Season'), None),
+        ('analysis.batting_analysis', lambda: analysis().batting_analysis(), None),
+        ('analysis.pitching_analysis', lambda: analysis().pitching_analysis(), None),
+        ('analysis.statcast_analysis', lambda: analysis().statcast_analysis(), None),
+        ('analysis.pitch_breakdown', lambda: analysis().pitch_breakdown(), None),
+        ('analysis.generate_visualizations', lambda: analysis().generate_visualizations(force=True), None),
+        ('features.batting', lambda: build_feature_set(load_data('batting'), 'batting', 100).X, None),
+        ('features.pitching', lambda: build_feature_set(load_data('pitching'), 'pitching', 30).X, None),
+        ('model.train_batting', lambda: am.PlayerEvaluationModel().train_batting_models(), None),
+        ('model.train_pitching', lambda: am.PlayerEvaluationModel().train_pitching_models(), None),
+        ('model.search_batting', lambda: am.PlayerEvaluationModel().train_batting_models(search=True), None),
+        ('projections.batting', lambda: project(load_data('batting', columns=projection_columns('batting')), 'batting'), None),
+        ('projections.pitching', lambda: project(load_data('pitching', columns=projection_columns('pitching')), 'pitching'), None),
+    ]
+
+    def expected_stats():
+        data = load_data('statcast', columns=EXPECTED_STATS_COLUMNS)
+        return player_expected_stats(data, ExpectedStatsTable.fit(data))
+
+    def similarity(data_type):
+        feature_set = get_feature_set(data_type)
+        index = SimilarityIndex(feature_frame(feature_set, include_target=True), feature_set.features + [feature_set.target])
+        return index.all_pairs(k=10)
+
+    stages += [
+        ('expected_stats', expected_stats, None),
+        ('similarity.batting', lambda: similarity('batting'), None),
+        ('similarity.pitching', lambda: similarity('pitching'), None),
+    ]
+    return stages
+
+def _dashboard_stages(results):
+    """
+    Build the dashboard stages
+
+    The dashboard is imported after the models are trained; its import (server start)
+    and background data load are timed into results, and its callbacks are called
+    directly, without a server.
+
+    Args:
+        results (dict): Stage results to record the start-up timings in
+
+    Returns:
+        list: (stage name, callable, setup callable or None) tuples
+    """
+    from data_access import frame_cache
+    from dashboard_data import build_snapshot, clear_snapshots
+    from callback_cache import callback_cache
+
+    import_start = time.perf_counter()
+    import dashboard as db
+    results['dashboard.import'] = {'wall_ms': round((time.perf_counter() - import_start) * 1000, 3)}
+    db.dashboard_data.wait()
+    results['dashboard.data_ready'] = {'wall_ms': round((time.perf_counter() - import_start) * 1000, 3)}
+
+    snapshot = db.dashboard_data.current()
+    year = snapshot.available_years[-1] if snapshot.available_years else None
+    batting = snapshot.batting
+    player = None
+    if year is not None and not batting.empty:
+        player = batting.loc[batting['Season'] == year].sort_values('WAR', ascending=False)['Name'].iloc[0]
+
+    inputs = db.update_prediction_inputs('batting')
+    features = [child.children[1].id for child in inputs] if isinstance(inputs, list) else []
+    values = [child.children[1].value for child in inputs] if isinstance(inputs, list) else []
+
+    def clear():
+        clear_snapshots()
+        frame_cache.clear()
+
+    callbacks = [
+        ('dashboard.player_dropdown', lambda: db.update_player_dropdown(year, 'batting')),
+        ('dashboard.player_graph', lambda: db.update_player_graph(player, year, 'batting')),
+        ('dashboard.player_stats_table', lambda: db.update_player_stats_table(player, year, 'batting')),
+        ('dashboard.similar_players', lambda: db.update_similar_players(player, year, 'batting')),
+        ('dashboard.team_graph', lambda: db.update_team_graph(year, 'WAR')),
+        ('dashboard.team_rankings', lambda: db.update_team_rankings(year, 'WAR')),
+        ('dashboard.feature_importance', lambda: db.update_feature_importance('batting')),
+        ('dashboard.model_metrics', lambda: db.update_model_metrics('batting')),
+        ('dashboard.prediction_inputs', lambda: db.update_prediction_inputs('batting')),
+        ('dashboard.predict_war', lambda: db.predict_war(1, 'batting', values, features)),
+    ]
+    for viz_type in ['launch', 'pitch_type', 'velocity', 'spin_rate']:
+        callbacks.append((f'dashboard.statcast_graph.{viz_type}', lambda viz_type=viz_type: db.update_statcast_graph(viz_type)))
+        callbacks.append((f'dashboard.statcast_insights.{viz_type}', lambda viz_type=viz_type: db.update_statcast_insights(viz_type)))
+
+    # Snapshot builds from the processed CSVs (cold) and from the stored snapshot (warm)
+    stages = [
+        ('dashboard.snapshot.cold', build_snapshot, clear),
+        ('dashboard.snapshot.warm', build_snapshot, frame_cache.clear)
+    ]
+    # Callbacks are timed uncached, then served from the callback cache
+    stages += [(name, func, callback_cache.clear) for name, func in callbacks]
+    stages += [(f'{name}.cached', func, func) for name, func in callbacks if name in MEMOIZED_CALLBACKS]
+    return stages
+
+def _run_stages(stages, results, repeat):
+    """Measure stages into results; a failing stage is recorded and the rest still run"""
+    for name, func, setup in stages:
+        try:
+            results[name] = measure(func, repeat, setup)
+            logger.info(f"{name}: {results[name]['wall_ms']:.1f} ms, peak {results[name]['peak_mb']:.1f} MB")
+        except Exception as e:
+            logger.error(f"Benchmark stage {name} failed: {e}")
+            results[name] = {'error': f"{type(e).__name__}: {e}"}
+
+def run_benchmarks(scale=1 / WEEKS_PER_SEASON, seed=42, repeat=REPEAT, workspace=None, keep=False,
+                   stage_names=None, pitches_per_week=PITCHES_PER_WEEK):
+    """
+    Generate synthetic data and benchmark every pipeline stage
+
+    Args:
+        scale (float): Seasons of synthetic data (1/26 is one week, 10 is ten seasons)
+        seed (int): Random seed of the synthetic data
+        repeat (int): Timed runs per stage
+        workspace (str, optional): Scratch directory. Defaults to a new temporary directory.
+        keep (bool): Keep the workspace afterwards
+        stage_names (list, optional): Run only these pipeline stages, without the dashboard
+        pitches_per_week (int): Statcast rows per synthetic weekly file
+
+    Returns:
+        dict: The run record appended to RESULTS_PATH
+    """
+    workspace = workspace or tempfile.mkdtemp(prefix='baseball_benchmark_')
+    original_dir = os.getcwd()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    results = {}
+    try:
+        os.chdir(workspace)
+        for directory in WORKSPACE_DIRS:
+            os.makedirs(directory, exist_ok=True)
+
+        generate_start = time.perf_counter()
+        raw_files = generate_raw_data(os.path.join('data', 'raw'), scale=scale, seed=seed,
+                                      pitches_per_week=pitches_per_week)
+        logger.info(f"Generated synthetic data in {time.perf_counter() - generate_start:.1f}s")
+
+        stages = _stages(raw_files)
+        if stage_names is not None:
+            stages = [stage for stage in stages if stage[0] in stage_names]
+        _run_stages(stages, results, repeat)
+
+        if stage_names is None:
+            _run_stages(_dashboard_stages(results), results, repeat)
+
+    finally:
+        os.chdir(original_dir)
+        if not keep:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    record = {
+        'run': datetime.now().strftime('%Y%m%dT%H%M%S'),
+        'commit': _git_commit(),
+        'scale': scale,
+        'seed': seed,
+        'repeat': repeat,
+        'stages': stage_names,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': f"{platform.machine()} x{os.cpu_count()}",
+        'environment': {key: value for key, value in os.environ.items() if key.startswith('BASEBALL_')},
+        'results': results
+    }
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+    logger.info(f"Saved benchmark run {record['run']} to {RESULTS_PATH}")
+    return record
+
+def load_results(path=RESULTS_PATH):
+    """
+    Read the stored benchmark runs
+
+    Args:
+        path (str): Results file
+
+    Returns:
+        list: Run records, oldest first
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def compare_results(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare two benchmark runs stage by stage
+
+    Args:
+        current (dict): Run record to check
+        baseline (dict): Run record to compare against
+        threshold (float): Relative slowdown reported as a regression
+
+    Returns:
+        pandas.DataFrame: Baseline and current wall ms and peak MB, the relative change
+        and a regression flag per stage present in both runs
+    """
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None or 'wall_ms' not in result or 'wall_ms' not in base:
+            continue
+        change = result['wall_ms'] / base['wall_ms'] - 1 if base['wall_ms'] else 0.0
+        rows.append({
+            'stage': name,
+            'baseline_ms': base['wall_ms'],
+            'current_ms': result['wall_ms'],
+            'change': round(change, 3),
+            'baseline_peak_mb': base.get('peak_mb'),
+            'current_peak_mb': result.get('peak_mb'),
+            'regression': change > threshold
+        })
+    return pd.DataFrame(rows)
+
+def main():
+    """Run the benchmark suite, or compare the latest run with an earlier one"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    args = sys.argv[1:]
+
+    if args and args[0] == 'compare':
+        runs = load_results()
+        if len(runs) < 2:
+            print(f"Need at least two runs in {RESULTS_PATH} to compare")
+            return
+        current = runs[-1]
+        # The baseline is a run id or commit, else the latest earlier run of the same stages and scale
+        candidates = [run for run in runs[:-1] if (args[1:] and args[1] in (run['run'], run['commit']))
+                      or (not args[1:] and run['scale'] == current['scale']
+                          and run.get('stages') == current.get('stages'))]
+        if not candidates:
+            print("No matching baseline run")
+            return
+        baseline = candidates[-1]
+        print(f"{baseline['run']} ({baseline['commit']}) -> {current['run']} ({current['commit']}), scale {current['scale']:g}")
+        comparison = compare_results(current, baseline)
+        pd.set_option('display.width', 200)
+        print(comparison.to_string(index=False))
+        return
+
+    if args and args[0] == 'search':
+        # Statcast is not used by the search, so its weekly files are kept minimal
+        scale = float(Fraction(args[1])) if len(args) > 1 else SEARCH_SCALE
+        seed = int(args[2]) if len(args) > 2 else 42
+        record = run_benchmarks(scale, seed, repeat=1, stage_names=SEARCH_STAGES, pitches_per_week=1)
+    else:
+        scale = float(Fraction(args[0])) if args else 1 / WEEKS_PER_SEASON
+        seed = int(args[1]) if len(args) > 1 else 42
+        record = run_benchmarks(scale, seed)
+    summary = pd.DataFrame(record['results']).T
+    pd.set_option('display.width', 200)
+    print(summary.to_string())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Dashboard callback cache for Baseball Analytics System
+This module memoizes dashboard callback outputs under (callback, inputs, data version)
+keys, in memory and optionally in a directory shared by the server's workers, and serves
+repeated callback requests from their encoded responses, so repeated interactions skip
+both rebuilding and re-serializing figures and tables.
+"""
+
+import os
+import json
+import hashlib
+import functools
+import logging
+import flask
+
+from result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+# Directory shared by the dashboard workers (unset keeps outputs in memory only)
+CALLBACK_CACHE_DIR = os.environ.get('BASEBALL_CALLBACK_CACHE_DIR')
+
+# Maximum number of callback outputs kept in memory
+CALLBACK_CACHE_SIZE = int(os.environ.get('BASEBALL_CALLBACK_CACHE_SIZE', '512'))
+
+# Maximum number of callback output files kept in the shared directory; outputs of old
+# data versions are never requested again and are pruned first
+CALLBACK_CACHE_FILES = int(os.environ.get('BASEBALL_CALLBACK_CACHE_FILES', '4096'))
+
+callback_cache = ResultCache(CALLBACK_CACHE_SIZE, CALLBACK_CACHE_DIR, CALLBACK_CACHE_FILES)
+
+def memoize_callback(data_version, cache=callback_cache):
+    """
+    Memoize a Dash callback on its inputs and the version of the data it reads
+
+    The figure or component the callback returns is cached as is, so a hit skips building
+    it; serve_cached_responses also answers repeated requests without Dash serializing it
+    again. A data version of None (data
+    still loading) bypasses the cache, and outputs computed while the data was swapped
+    are not stored. The cache is not warmed after a reload: the first request for each
+    view under a new data version rebuilds it, and the old version's entries age out.
+
+    Args:
+        data_version (callable): Returns the current version of the callback's data
+        cache (ResultCache): Cache to store outputs in
+
+    Returns:
+        function: Decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            version = data_version()
+            if version is None:
+                return func(*args)
+
+            key = (func.__name__, json.dumps(args, sort_keys=True, default=str), version)
+            output = cache.get(key)
+            if output is None:
+                output = func(*args)
+                if data_version() == version:
+                    cache.put(key, output)
+            return output
+
+        # Marks the callback for serve_cached_responses
+        wrapper.memoized = True
+        return wrapper
+
+    return decorator
+
+def _response_key(app, version):
+    """Return the cache key of a callback request for a memoized callback, else None"""
+    request = flask.request
+    if request.method != 'POST' or not request.path.endswith('_dash-update-component'):
+        return None
+
+    payload = request.get_json(silent=True) or {}
+    output = payload.get('output')
+    callback = app.callback_map.get(output, {}).get('callback')
+    if not getattr(callback, 'memoized', False):
+        return None
+
+    # The response depends only on the property values, not on which one triggered it
+    values = [[(item.get('id'), item.get('property'), item.get('value')) for item in payload.get(part) or []
+               if isinstance(item, dict)] for part in ('inputs', 'state')]
+    digest = hashlib.sha1(json.dumps([output, values], sort_keys=True, default=str).encode()).hexdigest()
+    return ('response', digest, version)
+
+def serve_cached_responses(app, data_version, cache=callback_cache):
+    """
+    Serve repeated requests for memoized callbacks from their encoded responses
+
+    The JSON body Dash sends for a memoized callback is cached under the callback's
+    property values and the data version, and a repeated request returns it before Dash
+    runs or serializes anything. Like memoize_callback, requests made while the data is
+    loading bypass the cache, responses computed across a data swap are not stored, and
+    the cache is not warmed after a reload.
+
+    Args:
+        app (dash.Dash): Dashboard application
+        data_version (callable): Returns the current version of the dashboard data
+        cache (ResultCache): Cache to store responses in
+    """
+    @app.server.before_request
+    def cached_response():
+        version = data_version()
+        if version is None:
+            return None
+
+        key = _response_key(app, version)
+        if key is None:
+            return None
+
+        body = cache.get(key)
+        if body is not None:
+            return flask.Response(body, mimetype='application/json')
+        flask.g.callback_response_key = key
+        return None
+
+    @app.server.after_request
+    def store_response(response):
+        key = flask.g.pop('callback_response_key', None)
+        if key is not None and response.status_code == 200 and data_version() == key[2]:
+            cache.put(key, response.get_data())
+        return response
@@ -0,0 +1,197 @@
+"""
+Chart rendering for Baseball Analytics System
+This module renders the static report charts in a process pool with the non-interactive
+Agg backend and skips charts whose input data and plot spec are unchanged since the
+PNG was last written.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
+import seaborn as sns
+
+from density import grid_from_frame
+from profiling import profiled
+
+logger = logging.getLogger(__name__)
+
+# Worker processes used to render charts
+RENDER_WORKERS = int(os.environ.get('BASEBALL_RENDER_WORKERS', str(os.cpu_count() or 1)))
+
+# Bump when a renderer changes so existing PNGs are redrawn
+RENDER_VERSION = 1
+
+MANIFEST_FILE = '.render_manifest.json'
+
+# A chart to render: the PNG file name, the renderer, its input frame and its options
+ChartSpec = namedtuple('ChartSpec', ['filename', 'kind', 'data', 'options'])
+
+def render_distribution(data, options):
+    """Histogram with KDE for each metric, on a 2 x 3 grid"""
+    plt.figure(figsize=(15, 10))
+    for i, metric in enumerate(data.columns):
+        plt.subplot(2, 3, i+1)
+        sns.histplot(data[metric].dropna(), kde=True)
+        plt.title(f'Distribution of {metric}')
+
+def render_heatmap(data, options):
+    """Annotated heatmap of a correlation matrix"""
+    plt.figure(figsize=(12, 10))
+    sns.heatmap(data, annot=True, cmap='coolwarm')
+    plt.title(options['title'])
+
+def render_scatter(data, options):
+    """Scatter plot of two columns"""
+    plt.figure(figsize=(10, 8))
+    sns.scatterplot(data=data, x=options['x'], y=options['y'], alpha=0.5)
+    plt.title(options['title'])
+    plt.xlabel(options['xlabel'])
+    plt.ylabel(options['ylabel'])
+
+def render_counts(data, options):
+    """Bar chart of precomputed category counts, most frequent first"""
+    plt.figure(figsize=(12, 8))
+    sns.barplot(data=data, x=options['x'], y='count', order=list(data[options['x']]))
+    plt.title(options['title'])
+    plt.xticks(rotation=45)
+
+def render_density(data, options):
+    """2-D histogram of binned points, coloured by outcome rate when one was binned"""
+    grid = grid_from_frame(data, options['bins'], options['ranges'])
+    plt.figure(figsize=(10, 8))
+    if grid.outcome is not None:
+        mesh = plt.pcolormesh(grid.x_edges, grid.y_edges, grid.outcome, cmap='viridis', vmin=0, vmax=1)
+        plt.colorbar(mesh, label=options['outcome_label'])
+    else:
+        counts = grid.counts.copy()
+        counts[counts == 0] = np.nan
+        mesh = plt.pcolormesh(grid.x_edges, grid.y_edges, counts, cmap='viridis', norm=LogNorm())
+        plt.colorbar(mesh, label='Batted balls')
+    plt.title(f"{options['title']} ({grid.total:,} batted balls)")
+    plt.xlabel(options['xlabel'])
+    plt.ylabel(options['ylabel'])
+
+RENDERERS = {
+    'distribution': render_distribution,
+    'heatmap': render_heatmap,
+    'scatter': render_scatter,
+    'counts': render_counts,
+    'density': render_density
+}
+
+def chart_digest(spec):
+    """
+    Hash a chart's input data and plot spec
+
+    Args:
+        spec (ChartSpec): Chart to hash
+
+    Returns:
+        str: Hex digest that changes whenever the rendered PNG would
+    """
+    digest = hashlib.sha1(repr((RENDER_VERSION, spec.kind, sorted(spec.options.items()))).encode())
+    digest.update(repr(list(spec.data.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(spec.data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def render_chart(spec, path):
+    """
+    Render one chart to a PNG file
+
+    Args:
+        spec (ChartSpec): Chart to render
+        path (str): Output file
+    """
+    plt.switch_backend('Agg')
+    try:
+        RENDERERS[spec.kind](spec.data, spec.options)
+        plt.tight_layout()
+        plt.savefig(path)
+    finally:
+        plt.close('all')
+
+def _load_manifest(output_dir):
+    """Load the digests of the charts rendered into a directory"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_manifest(output_dir, manifest):
+    """Persist the digests of the rendered charts"""
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    try:
+        with open(path + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(path + '.tmp', path)
+    except OSError as e:
+        logger.warning(f"Could not save render manifest: {e}")
+
+@profiled()
+def render_charts(specs, output_dir, workers=RENDER_WORKERS, force=False):
+    """
+    Render charts, skipping those whose inputs are unchanged
+
+    Charts that need rendering are spread over a process pool; a single chart is
+    rendered in the calling process.
+
+    Args:
+        specs (list): ChartSpec list
+        output_dir (str): Directory to write the PNGs to
+        workers (int): Maximum worker processes
+        force (bool): Re-render every chart
+
+    Returns:
+        dict: Mapping of file name to 'rendered', 'unchanged' or 'failed'
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = _load_manifest(output_dir)
+
+    status = {}
+    pending = []
+    for spec in specs:
+        digest = chart_digest(spec)
+        path = os.path.join(output_dir, spec.filename)
+        if not force and manifest.get(spec.filename) == digest and os.path.exists(path):
+            status[spec.filename] = 'unchanged'
+            logger.info(f"Skipped unchanged chart {path}")
+        else:
+            pending.append((spec, path, digest))
+
+    def finish(spec, path, digest, error):
+        if error is None:
+            manifest[spec.filename] = digest
+            status[spec.filename] = 'rendered'
+            logger.info(f"Saved chart to {path}")
+        else:
+            manifest.pop(spec.filename, None)
+            status[spec.filename] = 'failed'
+            logger.error(f"Error rendering chart {path}: {error}")
+
+    workers = max(1, min(workers, len(pending)))
+    if workers == 1:
+        for spec, path, digest in pending:
+            try:
+                render_chart(spec, path)
+                finish(spec, path, digest, None)
+            except Exception as e:
+                finish(spec, path, digest, e)
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [(executor.submit(render_chart, spec, path), spec, path, digest)
+                       for spec, path, digest in pending]
+            for future, spec, path, digest in futures:
+                finish(spec, path, digest, future.exception())
+
+    if pending:
+        _save_manifest(output_dir, manifest)
+
+    return status
@@ -13,15 +13,10 @@ from sqlalchemy import create_engine, text
 import logging
 import glob
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("logs/data_cleaning.log"),
-        logging.StreamHandler()
-    ]
-)
+from analytics_backend import get_database_url
+from partition_catalog import get_catalog
+from profiling import profiled
+
 logger = logging.getLogger(__name__)
 
 # Database connection settings
@@ -39,14 +34,15 @@ os.makedirs('data/processed', exist_ok=True)
 os.makedirs('logs', exist_ok=True)
 
 def connect_to_db():
-    """Connect to the database"""
+    """Connect to the configured database backend"""
     try:
-        engine = create_engine(DATABASE_URL)
+        engine = create_engine(get_database_url(DATABASE_URL))
         return engine
     except Exception as e:
         logger.error(f"Error connecting to database: {e}")
         sys.exit(1)
 
+@profiled()
 def clean_statcast_data(file_path):
     """
     Clean and transform Statcast data
@@ -104,6 +100,7 @@ def clean_statcast_data(file_path):
         logger.error(f"Error cleaning Statcast data: {e}")
         return pd.DataFrame()
 
+@profiled()
 def clean_batting_stats(file_path):
     """
     Clean and transform batting statistics
@@ -169,6 +166,7 @@ def clean_batting_stats(file_path):
         logger.error(f"Error cleaning batting stats: {e}")
         return pd.DataFrame()
 
+@profiled()
 def clean_pitching_stats(file_path):
     """
     Clean and transform pitching statistics
@@ -236,6 +234,7 @@ def clean_pitching_stats(file_path):
         logger.error(f"Error cleaning pitching stats: {e}")
         return pd.DataFrame()
 
+@profiled()
 def clean_team_data(file_path):
     """
     Clean and transform team data
@@ -291,6 +290,9 @@ def save_to_csv(data, filename, directory='processed'):
     try:
         filepath = os.path.join(f'data/{directory}', filename)
         data.to_csv(filepath, index=False)
+        if directory == 'processed':
+            # Record the exact row count so loads never have to count it
+            get_catalog().record(filepath, len(data))
         logger.info(f"Saved data to {filepath}")
     except Exception as e:
         logger.error(f"Error saving data to {filename}: {e}")
@@ -361,6 +363,7 @@ def validate_data(data, validation_rules):
     
     return valid_data, invalid_data, validation_report
 
+@profiled()
 def process_all_data():
     """Process all collected data files"""
     # Connect to database
@@ -418,4 +421,13 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Set up logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("logs/data_cleaning.log"),
+            logging.StreamHandler()
+        ]
+    )
     main()
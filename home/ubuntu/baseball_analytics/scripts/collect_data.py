@@ -13,15 +13,8 @@ import sqlalchemy as sa
 from sqlalchemy import create_engine, text
 import logging
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("logs/data_collection.log"),
-        logging.StreamHandler()
-    ]
-)
+from analytics_backend import get_database_url
+
 logger = logging.getLogger(__name__)
 
 # Database connection settings
@@ -40,9 +33,9 @@ os.makedirs('data/processed', exist_ok=True)
 os.makedirs('logs', exist_ok=True)
 
 def connect_to_db():
-    """Connect to the database"""
+    """Connect to the configured database backend"""
     try:
-        engine = create_engine(DATABASE_URL)
+        engine = create_engine(get_database_url(DATABASE_URL))
         return engine
     except Exception as e:
         logger.error(f"Error connecting to database: {e}")
@@ -263,4 +256,13 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Set up logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("logs/data_collection.log"),
+            logging.StreamHandler()
+        ]
+    )
     main()
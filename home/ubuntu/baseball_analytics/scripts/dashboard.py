@@ -4,20 +4,26 @@ This script creates an interactive dashboard for visualizing baseball data and i
 """
 
 import os
-import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 import logging
-import glob
-import joblib
 import dash
-from dash import dcc, html, Input, Output, State, dash_table
+import flask
+from dash import dcc, html, Input, Output, State, ALL, dash_table
+from dash.exceptions import PreventUpdate
 import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+
+from dashboard_data import get_dashboard_data
+from callback_cache import memoize_callback, serve_cached_responses
+from density import OUTCOME_LABELS, bin_density, bin_centers
+from model_registry import get_registry
+from war_predictor import load_predictor
+from similarity_index import get_similarity_index
+from feature_store import get_feature_set
 
 # Set up logging
 logging.basicConfig(
@@ -33,147 +39,50 @@ logger = logging.getLogger(__name__)
 # Create directories if they don't exist
 os.makedirs('logs', exist_ok=True)
 
-def load_data(data_type, year=None):
-    """
-    Load cleaned data for visualization
-    
-    Args:
-        data_type (str): Type of data to load ('batting', 'pitching', 'team', 'statcast')
-        year (int, optional): Specific year to load. If None, loads all years.
-        
-    Returns:
-        pandas.DataFrame: Loaded data
-    """
-    try:
-        if year:
-            # Load specific year
-            file_pattern = f'data/processed/clean_{data_type}_stats_{year}.csv'
-            if data_type == 'statcast':
-                # Statcast files have different naming pattern
-                file_pattern = f'data/processed/clean_statcast_*_{year}*.csv'
-            
-            files = glob.glob(file_pattern)
-            if not files:
-                logger.warning(f"No {data_type} data files found for year {year}")
-                return pd.DataFrame()
-            
-            data = pd.read_csv(files[0])
-            logger.info(f"Loaded {data_type} data for {year}: {len(data)} records")
-            
-        else:
-            # Load all years
-            file_pattern = f'data/processed/clean_{data_type}_stats_*.csv'
-            if data_type == 'statcast':
-                file_pattern = 'data/processed/clean_statcast_*.csv'
-            
-            files = glob.glob(file_pattern)
-            if not files:
-                logger.warning(f"No {data_type} data files found")
-                return pd.DataFrame()
-            
-            data_frames = []
-            for file in files:
-                df = pd.read_csv(file)
-                data_frames.append(df)
-            
-            data = pd.concat(data_frames, ignore_index=True)
-            logger.info(f"Loaded {data_type} data for all years: {len(data)} records")
-        
-        return data
-    
-    except Exception as e:
-        logger.error(f"Error loading {data_type} data: {e}")
-        return pd.DataFrame()
+# Data loads in the background so the server starts at once, and is reloaded when the
+# processed data or models change; callbacks serve the current snapshot (empty until loaded)
+dashboard_data = get_dashboard_data()
+dashboard_data.start()
 
-def load_model_results():
-    """
-    Load model results for visualization
-    
-    Returns:
-        dict: Dictionary of model results
-    """
-    results = {}
-    
-    try:
-        # Load batting model metrics
-        batting_metrics_file = 'reports/batting_model_metrics.csv'
-        if os.path.exists(batting_metrics_file):
-            results['batting_metrics'] = pd.read_csv(batting_metrics_file)
-        
-        # Load batting feature importance
-        batting_importance_file = 'reports/batting_feature_importance.csv'
-        if os.path.exists(batting_importance_file):
-            results['batting_importance'] = pd.read_csv(batting_importance_file)
-        
-        # Load pitching model metrics
-        pitching_metrics_file = 'reports/pitching_model_metrics.csv'
-        if os.path.exists(pitching_metrics_file):
-            results['pitching_metrics'] = pd.read_csv(pitching_metrics_file)
-        
-        # Load pitching feature importance
-        pitching_importance_file = 'reports/pitching_feature_importance.csv'
-        if os.path.exists(pitching_importance_file):
-            results['pitching_importance'] = pd.read_csv(pitching_importance_file)
-        
-        logger.info("Loaded model results successfully")
-        return results
-    
-    except Exception as e:
-        logger.error(f"Error loading model results: {e}")
-        return results
+# Callbacks that only read the snapshot are memoized on their inputs and its version
+def snapshot_version():
+    return dashboard_data.current().version
 
-def load_player_comparisons():
-    """
-    Load player comparison results
-    
-    Returns:
-        dict: Dictionary of player comparison results
-    """
-    comparisons = {}
-    
-    try:
-        # Find all player comparison files
-        batter_files = glob.glob('reports/similar_batters_*.csv')
-        pitcher_files = glob.glob('reports/similar_pitchers_*.csv')
-        
-        # Load batter comparisons
-        for file in batter_files:
-            player_name = os.path.basename(file).replace('similar_batters_to_', '').replace('.csv', '').replace('_', ' ')
-            comparisons[f'batter_{player_name}'] = pd.read_csv(file)
-        
-        # Load pitcher comparisons
-        for file in pitcher_files:
-            player_name = os.path.basename(file).replace('similar_pitchers_to_', '').replace('.csv', '').replace('_', ' ')
-            comparisons[f'pitcher_{player_name}'] = pd.read_csv(file)
-        
-        logger.info("Loaded player comparisons successfully")
-        return comparisons
-    
-    except Exception as e:
-        logger.error(f"Error loading player comparisons: {e}")
-        return comparisons
-
-# Load all data
-batting_data = load_data('batting')
-pitching_data = load_data('pitching')
-team_data = load_data('team')
-statcast_data = load_data('statcast')
-model_results = load_model_results()
-player_comparisons = load_player_comparisons()
-
-# Get available years
-available_years = []
-if not batting_data.empty and 'Season' in batting_data.columns:
-    available_years = sorted(batting_data['Season'].unique().tolist())
+memoized = memoize_callback(snapshot_version)
 
 # Initialize the Dash app
 app = dash.Dash(__name__, suppress_callback_exceptions=True)
 server = app.server
 
+# Repeated requests for memoized callbacks are answered with their encoded responses
+serve_cached_responses(app, snapshot_version)
+
+# Readiness endpoint for load balancers and process managers: 503 until the data is loaded
+@server.route('/ready')
+def ready():
+    status = dashboard_data.status()
+    return flask.jsonify(status), 200 if status['ready'] else 503
+
+# Asks the data watcher to check for new data now, e.g. after the nightly load
+@server.route('/reload', methods=['POST'])
+def reload_data():
+    dashboard_data.reload()
+    return flask.jsonify(dashboard_data.status()), 202
+
+# Milliseconds between the page's data status checks while loading and once loaded
+LOADING_POLL_MS = 1000
+LOADED_POLL_MS = 30000
+
 # Define the app layout
 app.layout = html.Div([
     html.H1("Baseball Analytics Dashboard", style={'textAlign': 'center'}),
     
+    # Polls the data status; the stored version changes when new data is swapped in,
+    # which refreshes the year dropdowns and the data-backed views
+    html.Div(id='data-status', style={'textAlign': 'center'}),
+    dcc.Interval(id='data-status-interval', interval=LOADING_POLL_MS),
+    dcc.Store(id='data-version'),
+    
     dcc.Tabs([
         # Player Performance Tab
         dcc.Tab(label='Player Performance', children=[
@@ -184,8 +93,8 @@ app.layout = html.Div([
                     html.Label("Select Year:"),
                     dcc.Dropdown(
                         id='player-year-dropdown',
-                        options=[{'label': str(year), 'value': year} for year in available_years],
-                        value=available_years[-1] if available_years else None,
+                        options=[],
+                        value=None,
                         style={'width': '200px'}
                     ),
                     
@@ -234,8 +143,8 @@ app.layout = html.Div([
                     html.Label("Select Year:"),
                     dcc.Dropdown(
                         id='team-year-dropdown',
-                        options=[{'label': str(year), 'value': year} for year in available_years],
-                        value=available_years[-1] if available_years else None,
+                        options=[],
+                        value=None,
                         style={'width': '200px'}
                     ),
                     
@@ -343,36 +252,68 @@ app.layout = html.Div([
     ])
 ])
 
+# Callback to show the loading status and refresh the year dropdowns when new data is loaded
+@app.callback(
+    [Output('data-status', 'children'),
+     Output('data-status-interval', 'interval'),
+     Output('data-version', 'data'),
+     Output('player-year-dropdown', 'options'),
+     Output('player-year-dropdown', 'value'),
+     Output('team-year-dropdown', 'options'),
+     Output('team-year-dropdown', 'value')],
+    [Input('data-status-interval', 'n_intervals')],
+    [State('data-version', 'data'),
+     State('player-year-dropdown', 'value'),
+     State('team-year-dropdown', 'value')]
+)
+def update_data_status(n_intervals, shown_version=None, player_year=None, team_year=None):
+    snapshot = dashboard_data.current()
+    
+    if not snapshot.ready:
+        message = f"Data failed to load: {dashboard_data.error}" if dashboard_data.error else "Loading data..."
+        return html.Div(message), LOADING_POLL_MS, None, [], None, [], None
+    
+    if snapshot.version == shown_version:
+        raise PreventUpdate
+    
+    # Selected years are kept when the new data still has them
+    years = snapshot.available_years
+    options = [{'label': str(year), 'value': year} for year in years]
+    latest = years[-1] if years else None
+    player_year = player_year if player_year in years else latest
+    team_year = team_year if team_year in years else latest
+    return None, LOADED_POLL_MS, snapshot.version, options, player_year, options, team_year
+
 # Callback to update player dropdown based on year and player type
 @app.callback(
     Output('player-dropdown', 'options'),
     [Input('player-year-dropdown', 'value'),
-     Input('player-type-radio', 'value')]
+     Input('player-type-radio', 'value'),
+     Input('data-version', 'data')]
 )
-def update_player_dropdown(year, player_type):
+@memoized
+def update_player_dropdown(year, player_type, data_version=None):
     if year is None:
         return []
     
-    if player_type == 'batting':
-        data = batting_data
-    else:
-        data = pitching_data
-    
-    if data.empty or 'Season' not in data.columns or 'Name' not in data.columns:
+    # Sorted per-season name lists are built once per data snapshot
+    players = dashboard_data.current().players.get(player_type)
+    if players is None:
         return []
     
-    filtered_data = data[data['Season'] == year]
-    players = sorted(filtered_data['Name'].unique())
-    
-    return [{'label': player, 'value': player} for player in players]
+    return players.player_options(year)
 
 # Callback to update player dropdown value when options change
 @app.callback(
     Output('player-dropdown', 'value'),
-    [Input('player-dropdown', 'options')]
+    [Input('player-dropdown', 'options')],
+    [State('player-dropdown', 'value')]
 )
-def set_player_value(available_options):
+def set_player_value(available_options, current_player=None):
     if available_options and len(available_options) > 0:
+        # Keep the selected player when the options are refreshed with new data
+        if any(option['value'] == current_player for option in available_options):
+            return current_player
         return available_options[0]['value']
     return None
 
@@ -381,42 +322,28 @@ def set_player_value(available_options):
     Output('player-performance-graph', 'figure'),
     [Input('player-dropdown', 'value'),
      Input('player-year-dropdown', 'value'),
-     Input('player-type-radio', 'value')]
+     Input('player-type-radio', 'value'),
+     Input('data-version', 'data')]
 )
-def update_player_graph(player, year, player_type):
+@memoized
+def update_player_graph(player, year, player_type, data_version=None):
     if player is None or year is None:
         return go.Figure()
     
-    if player_type == 'batting':
-        data = batting_data
-        # Define metrics to show for batters
-        metrics = ['AVG', 'OBP', 'SLG', 'OPS', 'HR', 'RBI', 'BB%', 'K%']
-    else:
-        data = pitching_data
-        # Define metrics to show for pitchers
-        metrics = ['ERA', 'WHIP', 'K/9', 'BB/9', 'HR/9', 'FIP', 'xFIP']
-    
-    if data.empty or 'Season' not in data.columns or 'Name' not in data.columns:
+    players = dashboard_data.current().players.get(player_type)
+    if players is None or not players.metrics:
         return go.Figure()
     
-    # Filter data for the selected player
-    player_data = data[(data['Name'] == player) & (data['Season'] == year)]
+    # The player's row and the season's league averages are precomputed lookups
+    player_row = players.player_row(player, year)
+    league_average = players.league_average(year)
     
-    if player_data.empty:
+    if player_row is None or league_average is None:
         return go.Figure()
     
-    # Create a radar chart for the player's performance
-    available_metrics = [m for m in metrics if m in player_data.columns]
-    
-    if not available_metrics:
-        return go.Figure()
-    
-    # Get player values
-    values = player_data[available_metrics].iloc[0].tolist()
-    
-    # Get league averages for comparison
-    league_data = data[data['Season'] == year]
-    league_avgs = league_data[available_metrics].mean().tolist()
+    available_metrics = players.metrics
+    values = player_row[available_metrics].tolist()
+    league_avgs = league_average[available_metrics].tolist()
     
     # Create radar chart
     fig = go.Figure()
@@ -434,5 +361,320 @@ def update_player_graph(player, year, player_type):
         fill='toself',
         name='League Average'
     ))
+    
+    fig.update_layout(
+        polar=dict(radialaxis=dict(visible=True)),
+        showlegend=True,
+        title=f"{player} - {year} Performance vs. League Average"
+    )
+    
+    return fig
+
+# Callback to update player stats table
+@app.callback(
+    Output('player-stats-table', 'children'),
+    [Input('player-dropdown', 'value'),
+     Input('player-year-dropdown', 'value'),
+     Input('player-type-radio', 'value'),
+     Input('data-version', 'data')]
+)
+@memoized
+def update_player_stats_table(player, year, player_type, data_version=None):
+    if player is None or year is None:
+        return html.Div("Select a player to view stats")
+    
+    players = dashboard_data.current().players.get(player_type)
+    player_row = players.player_row(player, year) if players is not None else None
+    
+    if player_row is None:
+        return html.Div("No data available for this player")
+    
+    if player_type == 'batting':
+        stats = ['Team', 'G', 'PA', 'AVG', 'OBP', 'SLG', 'OPS', 'HR', 'RBI', 'SB', 'wRC+', 'WAR']
+    else:
+        stats = ['Team', 'G', 'GS', 'IP', 'W', 'L', 'ERA', 'WHIP', 'K/9', 'BB/9', 'FIP', 'WAR']
+    
+    stats = [s for s in stats if s in player_row.index]
+    row = player_row[stats]
+    
+    return dash_table.DataTable(
+        columns=[{'name': 'Stat', 'id': 'stat'}, {'name': 'Value', 'id': 'value'}],
+        data=[{'stat': stat, 'value': round(value, 3) if isinstance(value, float) else value} for stat, value in row.items()],
+        style_cell={'textAlign': 'left'}
+    )
+
+# Callback to update similar players table
+@app.callback(
+    Output('similar-players-table', 'children'),
+    [Input('player-dropdown', 'value'),
+     Input('player-year-dropdown', 'value'),
+     Input('player-type-radio', 'value'),
+     Input('data-version', 'data')]
+)
+def update_similar_players(player, year, player_type, data_version=None):
+    if player is None:
+        return html.Div()
+    
+    similar = get_similarity_index(player_type).query(player, season=year, k=10)
+    
+    if similar.empty:
+        return html.Div("No similar player analysis available for this player")
+    
+    return dash_table.DataTable(
+        columns=[{'name': col, 'id': col} for col in similar.columns],
+        data=similar.round(3).to_dict('records'),
+        style_cell={'textAlign': 'left'},
+        page_size=10
+    )
+
+# Callback to update team performance graph
+@app.callback(
+    Output('team-performance-graph', 'figure'),
+    [Input('team-year-dropdown', 'value'),
+     Input('team-metric-dropdown', 'value'),
+     Input('data-version', 'data')]
+)
+@memoized
+def update_team_graph(year, metric, data_version=None):
+    team_data = dashboard_data.current().team
+    
+    if year is None or metric is None or team_data.empty:
+        return go.Figure()
+    
+    if 'Season' not in team_data.columns or metric not in team_data.columns:
+        return go.Figure()
+    
+    year_data = team_data[team_data['Season'] == year].sort_values(metric, ascending=False)
+    
+    if year_data.empty:
+        return go.Figure()
+    
+    fig = px.bar(year_data, x='Team', y=metric, title=f'Team {metric} - {year}')
+    fig.update_layout(xaxis_tickangle=-45)
+    
+    return fig
+
+# Callback to update team rankings table
+@app.callback(
+    Output('team-rankings-table', 'children'),
+    [Input('team-year-dropdown', 'value'),
+     Input('team-metric-dropdown', 'value'),
+     Input('data-version', 'data')]
+)
+@memoized
+def update_team_rankings(year, metric, data_version=None):
+    team_data = dashboard_data.current().team
+    
+    if year is None or metric is None or team_data.empty:
+        return html.Div("No team data available")
+    
+    if 'Season' not in team_data.columns or metric not in team_data.columns:
+        return html.Div("No team data available")
+    
+    year_data = team_data[team_data['Season'] == year].sort_values(metric, ascending=False)
+    columns = [col for col in ['Team', 'AVG', 'OBP', 'SLG', 'OPS', 'HR', 'RBI', 'WAR'] if col in year_data.columns]
+    
+    rankings = year_data[columns].reset_index(drop=True)
+    rankings.insert(0, 'Rank', rankings.index + 1)
+    
+    return dash_table.DataTable(
+        columns=[{'name': col, 'id': col} for col in rankings.columns],
+        data=rankings.round(3).to_dict('records'),
+        style_cell={'textAlign': 'left'},
+        page_size=30
+    )
+
+# Callback to update Statcast graph
+@app.callback(
+    Output('statcast-graph', 'figure'),
+    [Input('statcast-viz-dropdown', 'value'),
+     Input('data-version', 'data')]
+)
+@memoized
+def update_statcast_graph(viz_type, data_version=None):
+    statcast_data = dashboard_data.current().statcast
+    
+    if statcast_data.empty:
+        return go.Figure()
+    
+    if viz_type == 'launch' and all(col in statcast_data.columns for col in ['launch_angle', 'launch_speed']):
+        # Every batted ball is binned, so the figure size depends on the bins, not the rows
+        outcome = 'hit' if 'events' in statcast_data.columns else None
+        grid = bin_density(statcast_data, 'launch_angle', 'launch_speed', outcome=outcome)
+        counts = np.where(grid.counts > 0, grid.counts, np.nan)
+        if grid.outcome is not None:
+            z, colorbar, zmin, zmax = grid.outcome, OUTCOME_LABELS.get(outcome, outcome), 0, 1
+        else:
+            z, colorbar, zmin, zmax = np.log10(counts), 'log10 batted balls', None, None
+        fig = go.Figure(go.Heatmap(
+            x=bin_centers(grid.x_edges), y=bin_centers(grid.y_edges), z=z, zmin=zmin, zmax=zmax,
+            customdata=counts, colorscale='Viridis', colorbar={'title': colorbar},
+            hovertemplate='Launch angle %{x:.0f}°<br>Launch speed %{y:.0f} mph<br>Batted balls %{customdata:.0f}<br>%{z:.3f}<extra></extra>'
+        ))
+        fig.update_layout(title=f'Launch Angle vs. Launch Speed ({grid.total:,} batted balls)',
+                          xaxis_title='Launch Angle (degrees)', yaxis_title='Launch Speed (mph)')
+        return fig
+    
+    if viz_type == 'pitch_type' and 'pitch_type' in statcast_data.columns:
+        counts = statcast_data['pitch_type'].value_counts().reset_index()
+        counts.columns = ['pitch_type', 'count']
+        return px.bar(counts, x='pitch_type', y='count', title='Pitch Type Distribution')
+    
+    if viz_type == 'velocity' and 'release_speed' in statcast_data.columns:
+        return px.histogram(statcast_data, x='release_speed',
+                            color='pitch_type' if 'pitch_type' in statcast_data.columns else None,
+                            nbins=50, title='Pitch Velocity Distribution',
+                            labels={'release_speed': 'Release Speed (mph)'})
+    
+    if viz_type == 'spin_rate' and all(col in statcast_data.columns for col in ['release_spin_rate', 'release_speed']):
+        sample = statcast_data.dropna(subset=['release_spin_rate', 'release_speed'])
+        sample = sample.sample(min(5000, len(sample)))
+        return px.scatter(sample, x='release_speed', y='release_spin_rate', opacity=0.5,
+                          color='pitch_type' if 'pitch_type' in sample.columns else None,
+                          title='Spin Rate vs. Release Speed',
+                          labels={'release_speed': 'Release Speed (mph)', 'release_spin_rate': 'Spin Rate (rpm)'})
+    
+    return go.Figure()
+
+# Callback to update Statcast insights
+@app.callback(
+    Output('statcast-insights', 'children'),
+    [Input('statcast-viz-dropdown', 'value'),
+     Input('data-version', 'data')]
+)
+@memoized
+def update_statcast_insights(viz_type, data_version=None):
+    statcast_data = dashboard_data.current().statcast
+    
+    if statcast_data.empty:
+        return html.Div("No Statcast data available")
+    
+    insights = []
+    
+    if viz_type == 'launch' and 'launch_speed' in statcast_data.columns:
+        insights.append(f"Average launch speed: {statcast_data['launch_speed'].mean():.1f} mph")
+        if 'hard_hit' in statcast_data.columns:
+            insights.append(f"Hard-hit rate: {statcast_data['hard_hit'].mean():.1%}")
+        if 'barrel' in statcast_data.columns:
+            insights.append(f"Barrel rate: {statcast_data['barrel'].mean():.1%}")
+    
+    elif viz_type == 'pitch_type' and 'pitch_type' in statcast_data.columns:
+        counts = statcast_data['pitch_type'].value_counts(normalize=True)
+        insights.append(f"Most common pitch: {counts.index[0]} ({counts.iloc[0]:.1%})")
+        insights.append(f"Distinct pitch types: {len(counts)}")
+    
+    elif viz_type == 'velocity' and 'release_speed' in statcast_data.columns:
+        insights.append(f"Average velocity: {statcast_data['release_speed'].mean():.1f} mph")
+        insights.append(f"Maximum velocity: {statcast_data['release_speed'].max():.1f} mph")
+    
+    elif viz_type == 'spin_rate' and 'release_spin_rate' in statcast_data.columns:
+        insights.append(f"Average spin rate: {statcast_data['release_spin_rate'].mean():.0f} rpm")
+    
+    if not insights:
+        return html.Div("No insights available for this visualization")
+    
+    return html.Ul([html.Li(insight) for insight in insights])
+
+# Callback to update feature importance graph
+@app.callback(
+    Output('feature-importance-graph', 'figure'),
+    [Input('model-type-radio', 'value'),
+     Input('data-version', 'data')]
+)
+@memoized
+def update_feature_importance(model_type, data_version=None):
+    model_results = dashboard_data.current().model_results
+    
+    importance = model_results.get(f'{model_type}_importance')
+    
+    if importance is None or importance.empty:
+        return go.Figure()
+    
+    importance = importance.sort_values('Importance')
+    fig = px.bar(importance, x='Importance', y='Feature', orientation='h',
+                 title=f'{model_type.capitalize()} WAR Model Feature Importance')
+    
+    return fig
+
+# Callback to update model metrics table
+@app.callback(
+    Output('model-metrics-table', 'children'),
+    [Input('model-type-radio', 'value'),
+     Input('data-version', 'data')]
+)
+@memoized
+def update_model_metrics(model_type, data_version=None):
+    model_results = dashboard_data.current().model_results
+    
+    metrics = model_results.get(f'{model_type}_metrics')
+    
+    if metrics is None or metrics.empty:
+        return html.Div("No model metrics available")
+    
+    return dash_table.DataTable(
+        columns=[{'name': col, 'id': col} for col in metrics.columns],
+        data=metrics.round(3).to_dict('records'),
+        style_cell={'textAlign': 'left'}
+    )
+
+# Callback to build the prediction inputs for the selected model
+@app.callback(
+    Output('prediction-inputs', 'children'),
+    [Input('model-type-radio', 'value')]
+)
+def update_prediction_inputs(model_type):
+    metadata = get_registry().metadata(f'{model_type}_war')
+    
+    if metadata is None:
+        return html.Div("No trained model available")
+    
+    features = metadata['features']
+    
+    # Default each input to its mean over the stored feature matrix
+    feature_set = get_feature_set(model_type)
+    means = {}
+    if feature_set is not None and len(feature_set.y):
+        means = dict(zip(feature_set.features, np.asarray(feature_set.X).mean(axis=0)))
+    
+    inputs = []
+    for feature in features:
+        default = round(float(means[feature]), 3) if feature in means else 0
+        inputs.append(html.Div([
+            html.Label(feature, style={'width': '80px', 'display': 'inline-block'}),
+            dcc.Input(id={'type': 'prediction-input', 'feature': feature}, type='number', value=default)
+        ], style={'margin': '5px 0'}))
+    
+    return inputs
+
+# Callback to predict WAR from the entered stats
+@app.callback(
+    Output('prediction-result', 'children'),
+    [Input('predict-button', 'n_clicks')],
+    [State('model-type-radio', 'value'),
+     State({'type': 'prediction-input', 'feature': ALL}, 'value'),
+     State({'type': 'prediction-input', 'feature': ALL}, 'id')]
+)
+def predict_war(n_clicks, model_type, values, ids):
+    if not n_clicks:
+        return html.Div("Enter stats and click Predict WAR")
+    
+    # The current version is loaded once per process
+    predictor = load_predictor(model_type)
+    
+    if predictor is None:
+        return html.Div("No trained model available")
+    
+    try:
+        prediction, latency = predictor.predict_one({id_['feature']: value for id_, value in zip(ids, values)})
+        
+        return html.Div([
+            html.H3(f"Predicted WAR: {prediction:.2f}"),
+            html.P(f"{predictor.model_name} model, predicted in {latency:.0f} µs")
+        ])
+    
+    except Exception as e:
+        logger.error(f"Error predicting WAR: {e}")
+        return html.Div("Prediction failed, check the entered values")
 
-(Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
+if __name__ == '__main__':
+    app.run(debug=True, host='0.0.0.0', port=8050)
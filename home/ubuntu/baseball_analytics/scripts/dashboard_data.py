@@ -0,0 +1,437 @@
+"""
+Dashboard data snapshots for Baseball Analytics System
+This module loads the data the dashboard serves, with the per-season lookups its
+callbacks use, into an immutable snapshot in a background thread so the server starts
+at once, and swaps in a rebuilt snapshot whenever the processed data or models change.
+Each dataset is kept as a typed Parquet snapshot keyed by its data version, which loads
+in a fraction of the CSV parse time; snapshots are rebuilt from the processed data only
+when it changes.
+"""
+
+import os
+import json
+import time
+import hashlib
+import shutil
+import threading
+import logging
+import pandas as pd
+
+from data_access import load_data, dataset_version
+from model_registry import get_registry
+from feature_store import get_feature_set
+from similarity_index import get_similarity_index
+from war_predictor import load_predictor
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.environ.get('BASEBALL_DASHBOARD_SNAPSHOT', os.path.join('data', 'snapshots', 'dashboard'))
+
+# Seconds between checks for new processed data or models (0 disables hot reload)
+RELOAD_SECONDS = float(os.environ.get('BASEBALL_DASHBOARD_RELOAD_SECONDS', '60'))
+
+# Statcast columns used by the Statcast tab (the raw export has 90+ columns)
+DASHBOARD_STATCAST_COLUMNS = ['pitch_type', 'events', 'launch_speed', 'launch_angle', 'release_speed',
+                              'release_spin_rate', 'hard_hit', 'barrel']
+
+# Datasets served by the dashboard and the columns read for each (None reads all)
+DASHBOARD_DATASETS = {
+    'batting': None,
+    'pitching': None,
+    'team': None,
+    'statcast': DASHBOARD_STATCAST_COLUMNS
+}
+
+# Statcast string columns stored as categoricals (a handful of distinct values each)
+CATEGORICAL_COLUMNS = {'statcast': ['pitch_type', 'events']}
+
+# Metrics on the player radar chart, compared with the season's league average
+PLAYER_GRAPH_METRICS = {
+    'batting': ['AVG', 'OBP', 'SLG', 'OPS', 'HR', 'RBI', 'BB%', 'K%'],
+    'pitching': ['ERA', 'WHIP', 'K/9', 'BB/9', 'HR/9', 'FIP', 'xFIP']
+}
+
+# Model reports shown on the Predictive Models tab, by result name
+MODEL_RESULT_FILES = {
+    f'{model_type}_{name}': f'{model_type}_{suffix}.csv'
+    for model_type in ['batting', 'pitching']
+    for name, suffix in [('metrics', 'model_metrics'), ('importance', 'feature_importance')]
+}
+
+# Bump when the snapshot layout changes so stored snapshots are rebuilt
+SNAPSHOT_FORMAT_VERSION = 1
+
+def load_model_results(report_dir='reports'):
+    """
+    Load model results for visualization
+
+    Args:
+        report_dir (str): Directory holding the model reports
+
+    Returns:
+        dict: Dictionary of model results
+    """
+    results = {}
+
+    try:
+        for name, filename in MODEL_RESULT_FILES.items():
+            path = os.path.join(report_dir, filename)
+            if os.path.exists(path):
+                results[name] = pd.read_csv(path)
+
+        logger.info("Loaded model results successfully")
+        return results
+
+    except Exception as e:
+        logger.error(f"Error loading model results: {e}")
+        return results
+
+def model_results_version(report_dir='reports'):
+    """
+    Return a version string identifying the current model reports and registered models
+
+    Args:
+        report_dir (str): Directory holding the model reports
+
+    Returns:
+        str: Hex digest of the report files' sizes and modification times and the
+        current registry version of each WAR model
+    """
+    digest = hashlib.sha1()
+    for filename in MODEL_RESULT_FILES.values():
+        try:
+            stat = os.stat(os.path.join(report_dir, filename))
+        except OSError:
+            continue
+        digest.update(f"{filename}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+    for model_type in PLAYER_GRAPH_METRICS:
+        digest.update(f"{model_type}_war|{get_registry().current_version(f'{model_type}_war')}\n".encode())
+    return digest.hexdigest()
+
+def current_versions():
+    """
+    Return the current version of everything a snapshot is built from
+
+    Returns:
+        dict: Data version per dataset name, and 'models' for the model artifacts
+    """
+    versions = {data_type: dataset_version(data_type) for data_type in DASHBOARD_DATASETS}
+    versions['models'] = model_results_version()
+    return versions
+
+class PlayerSeasonIndex:
+    """Per-season lookups over a player-season frame, built once per data version"""
+
+    def __init__(self, data, metrics):
+        """
+        Build the season name lists, (player, season) row index and league averages
+
+        Args:
+            data (pandas.DataFrame): Batting or pitching data
+            metrics (list): Metrics to average per season
+        """
+        self.data = data
+        self.metrics = [col for col in metrics if col in data.columns]
+        self.options = {}
+        self.rows = {}
+        self.league_averages = {}
+
+        if data.empty or 'Season' not in data.columns or 'Name' not in data.columns:
+            return
+
+        seasons = data['Season'].tolist()
+        names = data['Name'].tolist()
+        for season, season_names in data.groupby('Season')['Name'].unique().items():
+            self.options[season] = [{'label': name, 'value': name} for name in sorted(season_names)]
+
+        # Positions are inserted last to first so the first row of a duplicate wins
+        for position in range(len(data) - 1, -1, -1):
+            self.rows[(names[position], seasons[position])] = position
+
+        if self.metrics:
+            averages = data.groupby('Season')[self.metrics].mean()
+            self.league_averages = {season: row for season, row in averages.iterrows()}
+
+    def player_options(self, season):
+        """Return the dropdown options of a season's players, sorted by name"""
+        return self.options.get(season, [])
+
+    def player_row(self, name, season):
+        """
+        Return a player's row for a season
+
+        Args:
+            name (str): Player name
+            season (int): Season
+
+        Returns:
+            pandas.Series: The player-season, or None if it is not in the data
+        """
+        position = self.rows.get((name, season))
+        return self.data.iloc[position] if position is not None else None
+
+    def league_average(self, season):
+        """Return the season's league-average metrics (None if the season is missing)"""
+        return self.league_averages.get(season)
+
+class DashboardSnapshot:
+    """Immutable set of the frames, lookups and model results the dashboard serves"""
+
+    def __init__(self, frames, model_results, versions, ready=True):
+        """
+        Initialize the snapshot
+
+        Args:
+            frames (dict): DataFrame per dataset name
+            model_results (dict): Model metrics and feature importances
+            versions (dict): Data version per dataset name (and 'models' for the model reports)
+            ready (bool): False for the placeholder served while data loads
+        """
+        self.batting = frames.get('batting', pd.DataFrame())
+        self.pitching = frames.get('pitching', pd.DataFrame())
+        self.team = frames.get('team', pd.DataFrame())
+        self.statcast = frames.get('statcast', pd.DataFrame())
+        self.model_results = model_results
+        self.versions = versions
+        self.ready = ready
+        self.created_at = time.time()
+
+        # Identifies everything the snapshot serves; None while the data is loading
+        self.version = None
+        if ready:
+            self.version = hashlib.sha1(repr(sorted(versions.items())).encode()).hexdigest()
+
+        self.available_years = []
+        if not self.batting.empty and 'Season' in self.batting.columns:
+            self.available_years = sorted(self.batting['Season'].dropna().unique().tolist())
+
+        self.players = {
+            player_type: PlayerSeasonIndex(getattr(self, player_type), metrics)
+            for player_type, metrics in PLAYER_GRAPH_METRICS.items()
+        }
+
+    @classmethod
+    def empty(cls):
+        """Return the placeholder snapshot served until data is loaded"""
+        return cls({}, {}, {}, ready=False)
+
+    def rows(self):
+        """Return the row count of each dataset"""
+        return {name: len(getattr(self, name)) for name in DASHBOARD_DATASETS}
+
+def _compact(frame, data_type):
+    """Convert a dataset's low-cardinality string columns to categoricals"""
+    for column in CATEGORICAL_COLUMNS.get(data_type, []):
+        if column in frame.columns and not isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype('category')
+    return frame
+
+def _snapshot_key(version, columns):
+    """Return the key of a dataset snapshot: its data version, columns and format"""
+    return f"{version}-{SNAPSHOT_FORMAT_VERSION}-{','.join(columns or [])}"
+
+def load_dataset(data_type, columns=None, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Load a dataset from its snapshot, rebuilding the snapshot when the data changed
+
+    Args:
+        data_type (str): Type of data
+        columns (list, optional): Columns to load. If None, loads every column.
+        snapshot_dir (str): Directory holding the snapshots
+
+    Returns:
+        tuple: (DataFrame, data version)
+    """
+    version = dataset_version(data_type)
+    key = _snapshot_key(version, columns)
+    path = os.path.join(snapshot_dir, f'{data_type}.parquet')
+    meta_path = os.path.join(snapshot_dir, f'{data_type}.json')
+
+    try:
+        with open(meta_path) as f:
+            stored = json.load(f).get('version')
+        if stored == key and os.path.exists(path):
+            return pd.read_parquet(path), version
+    except (OSError, ValueError):
+        pass
+    except Exception as e:
+        logger.warning(f"Rebuilding unreadable {data_type} snapshot: {e}")
+
+    # Read past the frame cache: the snapshot is the dashboard's only copy of the data,
+    # and it can be compacted in place
+    data = _compact(load_data(data_type, columns=columns, cache=False), data_type)
+    if data.empty:
+        return data, version
+
+    try:
+        os.makedirs(snapshot_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        data.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        with open(f"{meta_path}.{os.getpid()}.tmp", 'w') as f:
+            json.dump({'version': key, 'rows': len(data), 'columns': list(data.columns)}, f)
+        os.replace(f"{meta_path}.{os.getpid()}.tmp", meta_path)
+        logger.info(f"Stored {data_type} dashboard snapshot: {len(data)} records")
+    except Exception as e:
+        logger.warning(f"Could not store {data_type} dashboard snapshot: {e}")
+    return data, version
+
+def build_snapshot(snapshot_dir=SNAPSHOT_DIR):
+    """
+    Build a snapshot of everything the dashboard serves
+
+    Args:
+        snapshot_dir (str): Directory holding the stored dataset snapshots
+
+    Returns:
+        DashboardSnapshot: Loaded snapshot
+    """
+    frames, versions = {}, {}
+    for data_type, columns in DASHBOARD_DATASETS.items():
+        frames[data_type], versions[data_type] = load_dataset(data_type, columns, snapshot_dir)
+    versions['models'] = model_results_version()
+    return DashboardSnapshot(frames, load_model_results(), versions)
+
+def warm_dependencies():
+    """Bring the feature sets, similarity indexes and predictors the callbacks use up to date"""
+    for model_type in PLAYER_GRAPH_METRICS:
+        get_feature_set(model_type)
+        get_similarity_index(model_type)
+        load_predictor(model_type)
+
+def clear_snapshots(snapshot_dir=SNAPSHOT_DIR):
+    """Remove the stored dataset snapshots"""
+    shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+class DashboardData:
+    """Holds the current dashboard snapshot, loads it in the background and hot-reloads it"""
+
+    def __init__(self, snapshot_dir=SNAPSHOT_DIR, reload_seconds=RELOAD_SECONDS):
+        """
+        Initialize the holder with the empty placeholder snapshot
+
+        Args:
+            snapshot_dir (str): Directory holding the stored dataset snapshots
+            reload_seconds (float): Seconds between checks for changed data (0 disables)
+        """
+        self.snapshot_dir = snapshot_dir
+        self.reload_seconds = reload_seconds
+        self.snapshot = DashboardSnapshot.empty()
+        self.ready = threading.Event()
+        self.wake = threading.Event()
+        self.error = None
+        self.load_seconds = None
+        self.reloads = 0
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def current(self):
+        """
+        Return the current snapshot
+
+        Callbacks take the snapshot once and use it throughout, so a request always sees
+        one consistent set of data, even if a reload swaps in a new snapshot meanwhile.
+
+        Returns:
+            DashboardSnapshot: Current snapshot (the empty placeholder until loaded)
+        """
+        return self.snapshot
+
+    def start(self):
+        """Start loading the snapshot, and watching for changes, in a background thread (once)"""
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self._run, name='dashboard-data', daemon=True)
+            self.thread.start()
+
+    def reload(self):
+        """Check for changed data now instead of at the next interval"""
+        self.wake.set()
+
+    def stale(self):
+        """
+        Check whether the processed data or models changed since the snapshot was built
+
+        Returns:
+            bool: True if a new snapshot should be built
+        """
+        snapshot = self.snapshot
+        return not snapshot.ready or current_versions() != snapshot.versions
+
+    def _run(self):
+        """Load the snapshot, then rebuild it whenever its inputs change"""
+        self._load()
+        while True:
+            # Without periodic checks, only reload() wakes the watcher
+            self.wake.wait(self.reload_seconds if self.reload_seconds > 0 else None)
+            self.wake.clear()
+            try:
+                if self.stale():
+                    self._load()
+            except Exception as e:
+                logger.error(f"Error checking dashboard data for changes: {e}")
+
+    def _load(self):
+        """Build and warm a snapshot off the request path, then swap it in"""
+        start = time.perf_counter()
+        try:
+            snapshot = build_snapshot(self.snapshot_dir)
+            warm_dependencies()
+        except Exception as e:
+            # A failed reload keeps serving the previous snapshot
+            self.error = f"{type(e).__name__}: {e}"
+            logger.error(f"Error loading dashboard data: {e}")
+            return
+
+        reloaded = self.snapshot.ready
+        # A single reference assignment, so requests see either the old or the new snapshot
+        self.snapshot = snapshot
+        self.error = None
+        self.load_seconds = time.perf_counter() - start
+        if reloaded:
+            self.reloads += 1
+        self.ready.set()
+        logger.info(f"Dashboard data {'reloaded' if reloaded else 'ready'} in {self.load_seconds:.2f}s: {snapshot.rows()}")
+
+    def wait(self, timeout=None):
+        """
+        Wait for the snapshot to load
+
+        Args:
+            timeout (float, optional): Seconds to wait
+
+        Returns:
+            bool: True if the data is ready
+        """
+        return self.ready.wait(timeout)
+
+    def status(self):
+        """
+        Return the loading status for the readiness endpoint
+
+        Returns:
+            dict: Readiness, last load error, load time, reload count, snapshot version and
+            rows per dataset
+        """
+        snapshot = self.snapshot
+        return {
+            'ready': self.ready.is_set(),
+            'error': self.error,
+            'load_seconds': round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            'reloads': self.reloads,
+            'version': snapshot.version,
+            'rows': snapshot.rows() if snapshot.ready else {},
+            'versions': snapshot.versions
+        }
+
+_dashboard_data = None
+_dashboard_data_lock = threading.Lock()
+
+def get_dashboard_data():
+    """Return the process-wide dashboard data holder"""
+    global _dashboard_data
+    with _dashboard_data_lock:
+        if _dashboard_data is None:
+            _dashboard_data = DashboardData()
+        return _dashboard_data
@@ -0,0 +1,331 @@
+"""
+Shared data access layer for Baseball Analytics System
+This module loads the processed datasets for the analysis scripts and the dashboard
+and keeps recently loaded frames in a memory-bounded, fingerprint-validated cache, or
+streams datasets too large to load in memory-bounded chunks.
+"""
+
+import os
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+from analytics_backend import get_backend, read_dataset_file, iter_dataset_file, apply_filters
+from partition_catalog import get_catalog
+from profiling import profiled
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on the memory held by cached frames
+CACHE_MAX_MB = int(os.environ.get('BASEBALL_DATA_CACHE_MB', '1024'))
+
+# Threads used to read a dataset's partitions in parallel
+LOAD_WORKERS = int(os.environ.get('BASEBALL_LOAD_WORKERS', str(min(8, os.cpu_count() or 1))))
+
+# Streaming analyses out of core: '1' always, '0' never, 'auto' when a dataset's files
+# exceed the cache budget
+OUT_OF_CORE = os.environ.get('BASEBALL_OUT_OF_CORE', 'auto').lower()
+
+# Upper bound on the memory of one streamed chunk
+STREAM_CHUNK_MB = int(os.environ.get('BASEBALL_STREAM_CHUNK_MB', '64'))
+
+def frame_nbytes(frame):
+    """Return the in-memory size of a DataFrame in bytes"""
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+class FrameCache:
+    """Thread-safe LRU cache of DataFrames bounded by their memory footprint"""
+
+    def __init__(self, max_bytes):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes (int): Maximum total size of the cached frames
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, fingerprint):
+        """
+        Return a cached frame if it was built from the same files
+
+        Args:
+            key (tuple): Cache key
+            fingerprint (tuple): Current fingerprint of the source files
+
+        Returns:
+            pandas.DataFrame: Cached frame, or None on a miss or stale entry
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != fingerprint:
+                if entry is not None:
+                    self._evict(key)
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, fingerprint, frame):
+        """
+        Store a frame, evicting least recently used entries to stay within budget
+
+        Args:
+            key (tuple): Cache key
+            fingerprint (tuple): Fingerprint of the source files
+            frame (pandas.DataFrame): Frame to cache
+        """
+        nbytes = frame_nbytes(frame)
+        if nbytes > self.max_bytes:
+            logger.info(f"Not caching {key[0]} frame of {nbytes / 1e6:.1f} MB (budget {self.max_bytes / 1e6:.1f} MB)")
+            return
+
+        with self.lock:
+            if key in self.entries:
+                self._evict(key)
+
+            while self.entries and self.total_bytes + nbytes > self.max_bytes:
+                self._evict(next(iter(self.entries)))
+
+            self.entries[key] = (fingerprint, frame, nbytes)
+            self.total_bytes += nbytes
+
+    def _evict(self, key):
+        """Remove an entry (caller holds the lock)"""
+        _, _, nbytes = self.entries.pop(key)
+        self.total_bytes -= nbytes
+
+    def clear(self):
+        """Remove all cached frames"""
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """Return cache statistics"""
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+frame_cache = FrameCache(CACHE_MAX_MB * 1024 * 1024)
+
+def _freeze(filters):
+    """Convert load filters into a hashable cache key component"""
+    if not filters:
+        return ()
+    return tuple(
+        (column, operator, tuple(value) if isinstance(value, (list, set, tuple)) else value)
+        for column, operator, value in filters
+    )
+
+def dataset_version(data_type, year=None):
+    """
+    Return a version string identifying the current contents of a dataset
+
+    The version changes whenever a partition is added, removed or rewritten.
+
+    Args:
+        data_type (str): Type of data
+        year (int, optional): Restrict to one season
+
+    Returns:
+        str: Hex digest of the dataset's partition fingerprints
+    """
+    digest = hashlib.sha1(data_type.encode())
+    for p in get_catalog().partitions(data_type, year):
+        digest.update(f"{p.path}|{p.size}|{p.mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+def _read_partitions(data_type, partitions, filters, columns):
+    """Read, filter and project a dataset's partitions, in parallel when there are several"""
+    files = [partition.path for partition in partitions]
+
+    backend = get_backend()
+    if backend is not None:
+        # Filters and projection are evaluated in SQL by the embedded backend
+        return backend.load(data_type, filters=filters, files=files, columns=columns)
+
+    # Columns only needed to evaluate the filters are read, then dropped
+    read_columns = columns
+    filter_only = []
+    if columns is not None:
+        filter_only = [col for col, _, _ in filters if col not in columns]
+        read_columns = list(columns) + filter_only
+
+    # Filter each partition as it is read so only matching rows reach the final concat
+    def read_partition(path):
+        data = apply_filters(read_dataset_file(path, read_columns), filters)
+        if filter_only:
+            data = data.drop(columns=filter_only, errors='ignore')
+        return data
+
+    if len(files) == 1:
+        return read_partition(files[0])
+
+    # Submit the largest partitions first so the pool finishes evenly
+    order = sorted(range(len(partitions)), key=lambda i: -partitions[i].rows)
+    with ThreadPoolExecutor(max_workers=max(1, min(LOAD_WORKERS, len(files)))) as executor:
+        futures = {i: executor.submit(read_partition, files[i]) for i in order}
+        data_frames = [futures[i].result() for i in range(len(files))]
+
+    return pd.concat(data_frames, ignore_index=True)
+
+def use_out_of_core(data_type):
+    """
+    Decide whether analyses should stream a dataset in chunks instead of loading it
+
+    Args:
+        data_type (str): Type of data
+
+    Returns:
+        bool: True if BASEBALL_OUT_OF_CORE is '1', or 'auto' and the dataset's files
+        are larger than the data cache budget
+    """
+    if OUT_OF_CORE in ('0', 'false', 'no'):
+        return False
+    if OUT_OF_CORE in ('1', 'true', 'yes'):
+        return True
+    return sum(p.size for p in get_catalog().partitions(data_type)) > frame_cache.max_bytes
+
+def _bytes_per_row(path, columns):
+    """Measure the in-memory size of a row from a sample of a file"""
+    sample = next(iter_dataset_file(path, columns, chunk_rows=1000), None)
+    if sample is None or sample.empty:
+        return 1
+    return max(1, frame_nbytes(sample) // len(sample))
+
+def iter_data(data_type, year=None, filters=None, start_date=None, end_date=None, columns=None,
+              chunk_mb=None):
+    """
+    Stream cleaned data in memory-bounded chunks without materializing the dataset
+
+    Partitions are read one at a time in chunks sized to the memory budget (measured
+    from a sample of the first partition); filters are applied to each chunk. Chunks
+    are not cached.
+
+    Args:
+        data_type (str): Type of data to stream ('batting', 'pitching', 'team', 'statcast')
+        year (int, optional): Specific year to stream. If None, streams all years.
+        filters (list, optional): List of (column, operator, value) tuples to apply
+        start_date (str, optional): First date to stream (YYYY-MM-DD)
+        end_date (str, optional): Last date to stream (YYYY-MM-DD)
+        columns (list, optional): Columns to read. If None, reads every column.
+        chunk_mb (int, optional): Memory budget per chunk. Defaults to BASEBALL_STREAM_CHUNK_MB.
+
+    Yields:
+        pandas.DataFrame: Chunks of the dataset
+    """
+    partitions = get_catalog().partitions(data_type, year, start_date, end_date)
+    if not partitions:
+        logger.warning(f"No {data_type} data files found")
+        return
+
+    filters = list(filters or [])
+    if data_type == 'statcast':
+        if start_date is not None:
+            filters.append(('game_date', '>=', str(start_date)))
+        if end_date is not None:
+            filters.append(('game_date', '<=', str(end_date)))
+
+    read_columns = columns
+    filter_only = []
+    if columns is not None:
+        columns = list(dict.fromkeys(columns))
+        filter_only = [col for col, _, _ in filters if col not in columns]
+        read_columns = columns + filter_only
+
+    chunk_bytes = (chunk_mb if chunk_mb is not None else STREAM_CHUNK_MB) * 1024 * 1024
+    chunk_rows = max(1000, chunk_bytes // _bytes_per_row(partitions[0].path, read_columns))
+
+    rows = 0
+    for partition in partitions:
+        for chunk in iter_dataset_file(partition.path, read_columns, chunk_rows):
+            chunk = apply_filters(chunk, filters)
+            if filter_only:
+                chunk = chunk.drop(columns=filter_only, errors='ignore')
+            rows += len(chunk)
+            yield chunk
+
+    logger.info(f"Streamed {data_type} data: {rows} records from {len(partitions)} files in chunks of {chunk_rows} rows")
+
+@profiled()
+def load_data(data_type, year=None, filters=None, start_date=None, end_date=None, columns=None, cache=True):
+    """
+    Load cleaned data for analysis and visualization
+
+    Only the partitions covering the requested season or date range, and only the
+    requested columns, are read.
+    Repeated loads with the same arguments are served from an in-process cache for as
+    long as the underlying files are unchanged.
+
+    Args:
+        data_type (str): Type of data to load ('batting', 'pitching', 'team', 'statcast')
+        year (int, optional): Specific year to load. If None, loads all years.
+        filters (list, optional): List of (column, operator, value) tuples to apply
+        start_date (str, optional): First date to load (YYYY-MM-DD)
+        end_date (str, optional): Last date to load (YYYY-MM-DD)
+        columns (list, optional): Columns to load. If None, loads every column.
+        cache (bool): Serve and store the result in the in-process cache. Callers that
+            keep their own long-lived copy pass False so the data is not held twice.
+
+    Returns:
+        pandas.DataFrame: Loaded data (shares memory with the cache; do not modify in place
+        unless cache is False)
+    """
+    try:
+        partitions = get_catalog().partitions(data_type, year, start_date, end_date)
+        if not partitions:
+            if year:
+                logger.warning(f"No {data_type} data files found for year {year}")
+            else:
+                logger.warning(f"No {data_type} data files found")
+            return pd.DataFrame()
+
+        filters = list(filters or [])
+        if data_type == 'statcast':
+            # Partitions can straddle the requested range, so trim to the exact dates
+            if start_date is not None:
+                filters.append(('game_date', '>=', str(start_date)))
+            if end_date is not None:
+                filters.append(('game_date', '<=', str(end_date)))
+
+        if columns is not None:
+            columns = list(dict.fromkeys(columns))
+
+        key = (data_type, year, str(start_date), str(end_date), _freeze(filters),
+               tuple(columns) if columns is not None else None)
+        fingerprint = tuple((p.path, p.size, p.mtime_ns) for p in partitions)
+
+        data = frame_cache.get(key, fingerprint) if cache else None
+        if data is not None:
+            logger.debug(f"Loaded {data_type} data from cache: {len(data)} records")
+            return data.copy(deep=False)
+
+        data = _read_partitions(data_type, partitions, filters, columns)
+        if cache:
+            frame_cache.put(key, fingerprint, data)
+
+        if year:
+            logger.info(f"Loaded {data_type} data for {year}: {len(data)} records from {len(partitions)} files")
+        else:
+            logger.info(f"Loaded {data_type} data: {len(data)} records from {len(partitions)} files")
+
+        return data.copy(deep=False)
+
+    except Exception as e:
+        logger.error(f"Error loading {data_type} data: {e}")
+        return pd.DataFrame()
@@ -0,0 +1,182 @@
+"""
+Binned density rendering support for Baseball Analytics System
+This module aggregates every batted ball into a 2-D histogram (optionally with the mean
+of an outcome per bin) so launch charts draw a fixed number of bins instead of a sample
+of individual points.
+"""
+
+import logging
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Default bins and axis ranges for launch angle (degrees) vs. launch speed (mph)
+LAUNCH_BINS = (90, 80)
+LAUNCH_RANGES = ((-90.0, 90.0), (0.0, 125.0))
+
+# Statcast events that count as hits
+HIT_EVENTS = ['single', 'double', 'triple', 'home_run']
+
+# Bins with fewer batted balls than this get no outcome colour
+MIN_OUTCOME_COUNT = 3
+
+# Colour bar labels of the outcomes a grid can be coloured by
+OUTCOME_LABELS = {'hit': 'Hit rate', 'hard_hit': 'Hard-hit rate'}
+
+# counts and outcome are (y bins, x bins) arrays, ready to draw as an image
+DensityGrid = namedtuple('DensityGrid', ['counts', 'outcome', 'x_edges', 'y_edges', 'total'])
+
+def outcome_values(data, outcome):
+    """
+    Return the per-row outcome used to colour the bins
+
+    Args:
+        data (pandas.DataFrame): Statcast data
+        outcome (str): 'hit' (derived from events) or a numeric column such as 'hard_hit'
+
+    Returns:
+        numpy.ndarray: Outcome values, NaN where unknown
+    """
+    if outcome == 'hit':
+        events = data['events']
+        return np.where(events.notna(), events.isin(HIT_EVENTS), np.nan).astype(float)
+    return pd.to_numeric(data[outcome], errors='coerce').to_numpy(dtype=float)
+
+def _bin_sums(data, x, y, x_edges, y_edges, outcome):
+    """Histogram rows into fixed bins: counts, and known-outcome counts and sums"""
+    xs = pd.to_numeric(data[x], errors='coerce').to_numpy(dtype=float)
+    ys = pd.to_numeric(data[y], errors='coerce').to_numpy(dtype=float)
+    valid = ~(np.isnan(xs) | np.isnan(ys))
+    xs, ys = xs[valid], ys[valid]
+
+    counts, _, _ = np.histogram2d(xs, ys, bins=[x_edges, y_edges])
+
+    known_counts = sums = None
+    outcome_column = 'events' if outcome == 'hit' else outcome
+    if outcome is not None and outcome_column in data.columns:
+        values = outcome_values(data, outcome)[valid]
+        known = ~np.isnan(values)
+        known_counts, _, _ = np.histogram2d(xs[known], ys[known], bins=[x_edges, y_edges])
+        sums, _, _ = np.histogram2d(xs[known], ys[known], bins=[x_edges, y_edges], weights=values[known])
+    return counts, known_counts, sums
+
+def _edges(bins, ranges):
+    """Return the (x, y) bin edges of a grid"""
+    return (np.linspace(ranges[0][0], ranges[0][1], bins[0] + 1),
+            np.linspace(ranges[1][0], ranges[1][1], bins[1] + 1))
+
+def _grid(counts, known_counts, sums, x_edges, y_edges, outcome=None):
+    """Assemble a DensityGrid from histogram sums (no outcome when no bin has enough rows)"""
+    rate = None
+    if known_counts is not None:
+        if (known_counts >= MIN_OUTCOME_COUNT).any():
+            with np.errstate(invalid='ignore', divide='ignore'):
+                rate = np.where(known_counts >= MIN_OUTCOME_COUNT, sums / known_counts, np.nan).T
+        else:
+            logger.warning(f"No bin has {MIN_OUTCOME_COUNT} batted balls with a known {outcome} outcome, drawing counts only")
+    return DensityGrid(counts.T, rate, x_edges, y_edges, int(counts.sum()))
+
+def bin_density(data, x='launch_angle', y='launch_speed', bins=LAUNCH_BINS, ranges=LAUNCH_RANGES, outcome=None):
+    """
+    Aggregate all rows into a 2-D histogram
+
+    Args:
+        data (pandas.DataFrame): Data to bin
+        x (str): Column on the horizontal axis
+        y (str): Column on the vertical axis
+        bins (tuple): Number of (x, y) bins
+        ranges (tuple): ((x min, x max), (y min, y max)); values outside are dropped
+        outcome (str, optional): Outcome to average per bin (see outcome_values)
+
+    Returns:
+        DensityGrid: Counts and outcome means per bin
+    """
+    x_edges, y_edges = _edges(bins, ranges)
+    counts, known_counts, sums = _bin_sums(data, x, y, x_edges, y_edges, outcome)
+    if outcome is not None and known_counts is None:
+        logger.warning(f"Outcome {outcome} not available, drawing counts only")
+    return _grid(counts, known_counts, sums, x_edges, y_edges, outcome)
+
+def stream_density(chunks, x='launch_angle', y='launch_speed', bins=LAUNCH_BINS, ranges=LAUNCH_RANGES, outcome=None):
+    """
+    Aggregate rows streamed in chunks into a 2-D histogram
+
+    The result is the same as bin_density over the concatenated chunks.
+
+    Args:
+        chunks (iterable): DataFrame chunks
+        x (str): Column on the horizontal axis
+        y (str): Column on the vertical axis
+        bins (tuple): Number of (x, y) bins
+        ranges (tuple): ((x min, x max), (y min, y max)); values outside are dropped
+        outcome (str, optional): Outcome to average per bin (see outcome_values)
+
+    Returns:
+        DensityGrid: Counts and outcome means per bin
+    """
+    x_edges, y_edges = _edges(bins, ranges)
+    counts = np.zeros((bins[0], bins[1]))
+    known_counts = sums = None
+    for chunk in chunks:
+        if chunk.empty or x not in chunk.columns or y not in chunk.columns:
+            continue
+        chunk_counts, chunk_known, chunk_sums = _bin_sums(chunk, x, y, x_edges, y_edges, outcome)
+        counts += chunk_counts
+        if chunk_known is not None:
+            known_counts = chunk_known if known_counts is None else known_counts + chunk_known
+            sums = chunk_sums if sums is None else sums + chunk_sums
+
+    if outcome is not None and known_counts is None:
+        logger.warning(f"Outcome {outcome} not available, drawing counts only")
+    return _grid(counts, known_counts, sums, x_edges, y_edges, outcome)
+
+def bin_centers(edges):
+    """Return the midpoints of histogram bin edges"""
+    return (edges[:-1] + edges[1:]) / 2
+
+def density_frame(grid):
+    """
+    Flatten the occupied bins of a grid into a long DataFrame
+
+    Args:
+        grid (DensityGrid): Binned data
+
+    Returns:
+        pandas.DataFrame: x, y (bin centres), count and outcome of every non-empty bin
+    """
+    y_index, x_index = np.nonzero(grid.counts)
+    return pd.DataFrame({
+        'x': bin_centers(grid.x_edges)[x_index],
+        'y': bin_centers(grid.y_edges)[y_index],
+        'count': grid.counts[y_index, x_index],
+        'outcome': grid.outcome[y_index, x_index] if grid.outcome is not None else np.nan
+    })
+
+def grid_from_frame(frame, bins, ranges):
+    """
+    Rebuild a DensityGrid from density_frame output
+
+    Args:
+        frame (pandas.DataFrame): Occupied bins
+        bins (tuple): Number of (x, y) bins
+        ranges (tuple): ((x min, x max), (y min, y max))
+
+    Returns:
+        DensityGrid: Binned data
+    """
+    x_edges = np.linspace(ranges[0][0], ranges[0][1], bins[0] + 1)
+    y_edges = np.linspace(ranges[1][0], ranges[1][1], bins[1] + 1)
+    x_index = np.clip(np.searchsorted(x_edges, frame['x'].to_numpy()) - 1, 0, bins[0] - 1)
+    y_index = np.clip(np.searchsorted(y_edges, frame['y'].to_numpy()) - 1, 0, bins[1] - 1)
+
+    counts = np.zeros((bins[1], bins[0]))
+    counts[y_index, x_index] = frame['count'].to_numpy()
+
+    outcome = None
+    if frame['outcome'].notna().any():
+        outcome = np.full((bins[1], bins[0]), np.nan)
+        outcome[y_index, x_index] = frame['outcome'].to_numpy()
+
+    return DensityGrid(counts, outcome, x_edges, y_edges, int(counts.sum()))
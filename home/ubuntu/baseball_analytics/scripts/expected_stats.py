@@ -0,0 +1,296 @@
+"""
+Expected stats for Baseball Analytics System
+This module learns hit and wOBA rates on a fine launch speed x launch angle grid from
+historical batted-ball outcomes, stores the smoothed grid compactly, and scores any
+number of batted balls (and player-season xBA/xwOBA) with a vectorized table lookup.
+"""
+
+import os
+import threading
+import logging
+import numpy as np
+import pandas as pd
+
+from data_access import load_data, dataset_version
+from density import HIT_EVENTS
+from group_stats import grouped_stats
+
+logger = logging.getLogger(__name__)
+
+EXPECTED_STATS_PATH = os.path.join('models', 'expected_stats.npz')
+
+# Grid: 1 mph launch speed bins by 2 degree launch angle bins
+SPEED_RANGE = (0.0, 125.0)
+ANGLE_RANGE = (-90.0, 90.0)
+GRID_BINS = (125, 90)
+
+# Smoothing: Gaussian kernel width in bins, and batted balls of league-average
+# outcome added to every cell so sparse cells shrink toward the league rate
+SMOOTHING_BINS = 1.5
+PRIOR_COUNT = 5.0
+
+# wOBA weights of batted-ball events (outs are 0)
+WOBA_WEIGHTS = {'single': 0.883, 'double': 1.244, 'triple': 1.569, 'home_run': 2.004}
+
+# Events that are not batted balls and so are not scored
+NON_BATTED_EVENTS = ['walk', 'intent_walk', 'hit_by_pitch', 'strikeout', 'strikeout_double_play',
+                     'catcher_interf', 'truncated_pa']
+
+STATCAST_COLUMNS = ['game_date', 'batter', 'player_name', 'launch_speed', 'launch_angle', 'events']
+
+def batted_balls(data):
+    """
+    Select the batted balls with an outcome and launch data
+
+    Args:
+        data (pandas.DataFrame): Statcast data
+
+    Returns:
+        pandas.DataFrame: Batted-ball rows
+    """
+    if data.empty or not all(col in data.columns for col in ['launch_speed', 'launch_angle', 'events']):
+        return data.iloc[0:0]
+    mask = (data['events'].notna() & ~data['events'].isin(NON_BATTED_EVENTS)
+            & data['launch_speed'].notna() & data['launch_angle'].notna())
+    return data[mask]
+
+def outcome_columns(events):
+    """
+    Return the observed hit and wOBA value of batted-ball events
+
+    Args:
+        events (pandas.Series): Statcast events
+
+    Returns:
+        tuple: (hit, woba_value) numpy arrays
+    """
+    hit = events.isin(HIT_EVENTS).to_numpy(dtype=float)
+    woba = events.map(WOBA_WEIGHTS).fillna(0.0).to_numpy(dtype=float)
+    return hit, woba
+
+def _smooth(grid, width):
+    """Blur a 2-D grid with a separable Gaussian kernel (zero outside the grid)"""
+    if width <= 0:
+        return grid
+    radius = int(np.ceil(3 * width))
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (offsets / width) ** 2)
+    kernel /= kernel.sum()
+    grid = np.apply_along_axis(np.convolve, 0, grid, kernel, mode='same')
+    return np.apply_along_axis(np.convolve, 1, grid, kernel, mode='same')
+
+class ExpectedStatsTable:
+    """Smoothed expected hit and wOBA rates per launch speed x launch angle cell"""
+
+    def __init__(self, xba, xwoba, counts, league, version=None):
+        """
+        Initialize the table
+
+        Args:
+            xba (numpy.ndarray): Expected hit rate per (speed bin, angle bin)
+            xwoba (numpy.ndarray): Expected wOBA value per (speed bin, angle bin)
+            counts (numpy.ndarray): Batted balls observed per cell
+            league (dict): League 'xBA' and 'xwOBA' on contact, used outside the grid
+            version (str, optional): Version of the data the table was fitted on
+        """
+        self.xba = np.asarray(xba, dtype=np.float32)
+        self.xwoba = np.asarray(xwoba, dtype=np.float32)
+        self.counts = np.asarray(counts, dtype=np.int32)
+        self.league = league
+        self.version = version
+
+    @classmethod
+    def fit(cls, data, version=None):
+        """
+        Learn the table from historical batted balls
+
+        Args:
+            data (pandas.DataFrame): Statcast data with launch_speed, launch_angle and events
+            version (str, optional): Version of the data
+
+        Returns:
+            ExpectedStatsTable: Fitted table
+        """
+        balls = batted_balls(data)
+        hit, woba = outcome_columns(balls['events'])
+        cells, inside = cell_index(balls['launch_speed'].to_numpy(dtype=float),
+                                   balls['launch_angle'].to_numpy(dtype=float))
+
+        n_cells = GRID_BINS[0] * GRID_BINS[1]
+        counts = np.bincount(cells[inside], minlength=n_cells).reshape(GRID_BINS).astype(float)
+        hit_sums = np.bincount(cells[inside], weights=hit[inside], minlength=n_cells).reshape(GRID_BINS)
+        woba_sums = np.bincount(cells[inside], weights=woba[inside], minlength=n_cells).reshape(GRID_BINS)
+
+        league = {
+            'xBA': float(hit.mean()) if len(hit) else 0.0,
+            'xwOBA': float(woba.mean()) if len(woba) else 0.0
+        }
+
+        smoothed_counts = _smooth(counts, SMOOTHING_BINS) + PRIOR_COUNT
+        xba = (_smooth(hit_sums, SMOOTHING_BINS) + PRIOR_COUNT * league['xBA']) / smoothed_counts
+        xwoba = (_smooth(woba_sums, SMOOTHING_BINS) + PRIOR_COUNT * league['xwOBA']) / smoothed_counts
+
+        logger.info(f"Fitted expected stats on {int(counts.sum())} batted balls "
+                    f"({int((counts > 0).sum())} of {n_cells} cells observed)")
+        return cls(xba, xwoba, counts, league, version)
+
+    def lookup(self, launch_speed, launch_angle):
+        """
+        Look up expected stats for batted balls
+
+        Args:
+            launch_speed (array-like): Launch speeds (mph)
+            launch_angle (array-like): Launch angles (degrees)
+
+        Returns:
+            tuple: (xBA, xwOBA) numpy arrays; NaN where launch data is missing, the league
+            rate where it falls outside the grid
+        """
+        speed = np.asarray(launch_speed, dtype=float)
+        angle = np.asarray(launch_angle, dtype=float)
+        cells, inside = cell_index(speed, angle)
+
+        xba = np.full(len(cells), self.league['xBA'])
+        xwoba = np.full(len(cells), self.league['xwOBA'])
+        xba[inside] = self.xba.ravel()[cells[inside]]
+        xwoba[inside] = self.xwoba.ravel()[cells[inside]]
+
+        missing = np.isnan(speed) | np.isnan(angle)
+        xba[missing] = np.nan
+        xwoba[missing] = np.nan
+        return xba, xwoba
+
+    def score(self, data):
+        """
+        Add expected stats to every batted ball
+
+        Args:
+            data (pandas.DataFrame): Statcast data
+
+        Returns:
+            pandas.DataFrame: Batted balls with xBA and xwOBA columns added
+        """
+        balls = batted_balls(data)
+        xba, xwoba = self.lookup(balls['launch_speed'], balls['launch_angle'])
+        return balls.assign(xBA=xba, xwOBA=xwoba)
+
+    def save(self, path=EXPECTED_STATS_PATH):
+        """Persist the table"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(
+            tmp_path, xba=self.xba, xwoba=self.xwoba, counts=self.counts,
+            league=np.array([self.league['xBA'], self.league['xwOBA']]),
+            bins=np.array(GRID_BINS), ranges=np.array([SPEED_RANGE, ANGLE_RANGE]),
+            version=np.array(self.version or '')
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=EXPECTED_STATS_PATH):
+        """
+        Load a stored table
+
+        Returns:
+            ExpectedStatsTable: Table, or None if it is missing or was stored with a different grid
+        """
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as stored:
+            if (tuple(stored['bins']) != GRID_BINS
+                    or not np.array_equal(stored['ranges'], np.array([SPEED_RANGE, ANGLE_RANGE]))):
+                return None
+            league = {'xBA': float(stored['league'][0]), 'xwOBA': float(stored['league'][1])}
+            return cls(stored['xba'], stored['xwoba'], stored['counts'], league, str(stored['version']) or None)
+
+def cell_index(launch_speed, launch_angle):
+    """
+    Return the flat grid cell of each batted ball
+
+    Args:
+        launch_speed (numpy.ndarray): Launch speeds
+        launch_angle (numpy.ndarray): Launch angles
+
+    Returns:
+        tuple: (cell index, inside mask); cells outside the grid are 0 and masked out
+    """
+    speed_bin = np.floor((launch_speed - SPEED_RANGE[0]) * GRID_BINS[0] / (SPEED_RANGE[1] - SPEED_RANGE[0]))
+    angle_bin = np.floor((launch_angle - ANGLE_RANGE[0]) * GRID_BINS[1] / (ANGLE_RANGE[1] - ANGLE_RANGE[0]))
+    # The top edge belongs to the last bin
+    speed_bin[launch_speed == SPEED_RANGE[1]] = GRID_BINS[0] - 1
+    angle_bin[launch_angle == ANGLE_RANGE[1]] = GRID_BINS[1] - 1
+
+    inside = (speed_bin >= 0) & (speed_bin < GRID_BINS[0]) & (angle_bin >= 0) & (angle_bin < GRID_BINS[1])
+    cells = np.where(inside, speed_bin * GRID_BINS[1] + angle_bin, 0).astype(np.int64)
+    return cells, inside
+
+def player_expected_stats(data, table):
+    """
+    Roll batted-ball expected stats up to player-seasons
+
+    Rates are on contact: per batted ball, without strikeouts or walks.
+
+    Args:
+        data (pandas.DataFrame): Statcast data with batter and game_date
+        table (ExpectedStatsTable): Fitted table
+
+    Returns:
+        pandas.DataFrame: batter, Season, Name, BBE (batted balls), BA, xBA, wOBA and
+        xwOBA on contact per player-season
+    """
+    scored = table.score(data)
+    if scored.empty or 'batter' not in scored.columns:
+        return pd.DataFrame()
+
+    hit, woba = outcome_columns(scored['events'])
+    scored = scored.assign(Season=pd.to_datetime(scored['game_date']).dt.year, BA=hit, wOBA=woba)
+
+    stats = grouped_stats(scored, ['batter', 'Season'], ['BA', 'xBA', 'wOBA', 'xwOBA'])
+    result = pd.DataFrame({
+        'BBE': stats[('rows', 'count')],
+        **{metric: stats[(metric, 'mean')] for metric in ['BA', 'xBA', 'wOBA', 'xwOBA']}
+    }).reset_index()
+
+    if 'player_name' in scored.columns:
+        names = scored.drop_duplicates(['batter', 'Season'])[['batter', 'Season', 'player_name']]
+        result = result.merge(names.rename(columns={'player_name': 'Name'}), on=['batter', 'Season'], how='left')
+        result = result[['batter', 'Season', 'Name', 'BBE', 'BA', 'xBA', 'wOBA', 'xwOBA']]
+    return result
+
+_table = None
+_table_lock = threading.Lock()
+
+def get_expected_stats_table(path=EXPECTED_STATS_PATH):
+    """
+    Return the expected stats table, refitting it when the Statcast data changed
+
+    Args:
+        path (str): Where the table is stored
+
+    Returns:
+        ExpectedStatsTable: Table fitted on all processed Statcast data
+    """
+    global _table
+    version = dataset_version('statcast')
+
+    with _table_lock:
+        table = _table
+    if table is not None and table.version == version:
+        return table
+
+    table = None
+    try:
+        table = ExpectedStatsTable.load(path)
+    except Exception as e:
+        logger.warning(f"Refitting unreadable expected stats table {path}: {e}")
+
+    if table is None or table.version != version:
+        table = ExpectedStatsTable.fit(load_data('statcast', columns=STATCAST_COLUMNS), version)
+        try:
+            table.save(path)
+        except OSError as e:
+            logger.warning(f"Could not store expected stats table {path}: {e}")
+
+    with _table_lock:
+        _table = table
+    return table
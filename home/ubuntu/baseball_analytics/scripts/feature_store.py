@@ -0,0 +1,224 @@
+"""
+Feature store for Baseball Analytics System
+This module materializes the batting and pitching model feature matrices, targets and
+row keys as memory-mappable arrays keyed by data version, feature definition version
+and qualification threshold, so training, scoring, similarity search and the dashboard
+all read the same features instead of rebuilding them.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+import logging
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+from data_access import load_data, dataset_version
+
+logger = logging.getLogger(__name__)
+
+FEATURE_STORE_DIR = os.environ.get('BASEBALL_FEATURE_STORE', os.path.join('data', 'features'))
+
+# Bump when a feature definition changes so stored matrices are rebuilt
+FEATURE_DEFINITION_VERSION = 1
+
+# Model features
+BATTING_FEATURES = ['AVG', 'OBP', 'SLG', 'OPS', 'HR', 'RBI', 'SB', 'BB%', 'K%', 'wOBA', 'wRC+']
+PITCHING_FEATURES = ['ERA', 'FIP', 'xFIP', 'WHIP', 'K/9', 'BB/9', 'HR/9', 'IP', 'BABIP']
+
+# Identifying columns kept with each row (position columns when the data has them)
+FEATURE_KEY_COLUMNS = ['IDfg', 'Name', 'Team', 'Season', 'Pos', 'Position']
+
+# Features, target and qualification column of each feature set
+FEATURE_SETS = {
+    'batting': {'features': BATTING_FEATURES, 'target': 'WAR', 'qualifier': 'PA'},
+    'pitching': {'features': PITCHING_FEATURES, 'target': 'WAR', 'qualifier': 'IP'}
+}
+
+# X is a float matrix (rows x features), y the target and keys the row keys, all row-aligned
+FeatureSet = namedtuple('FeatureSet', ['X', 'y', 'keys', 'features', 'target', 'version'])
+
+def build_feature_set(data, data_type, min_value=None, version=None):
+    """
+    Build a feature set from a player-season frame
+
+    Args:
+        data (pandas.DataFrame): Player-season data
+        data_type (str): 'batting' or 'pitching'
+        min_value (float, optional): Minimum of the qualification column (PA or IP)
+        version (str, optional): Version identifying the inputs
+
+    Returns:
+        FeatureSet: Feature matrix, target and keys, or None if the target is missing
+    """
+    definition = FEATURE_SETS[data_type]
+    target = definition['target']
+    if data.empty or target not in data.columns:
+        return None
+
+    if min_value is not None and definition['qualifier'] in data.columns:
+        data = data[data[definition['qualifier']] >= min_value]
+
+    features = [col for col in definition['features'] if col in data.columns]
+    data = data.dropna(subset=features + [target])
+
+    keys = data[[col for col in FEATURE_KEY_COLUMNS if col in data.columns]].reset_index(drop=True)
+    X = np.ascontiguousarray(data[features].to_numpy(dtype=np.float64))
+    y = data[target].to_numpy(dtype=np.float64)
+    return FeatureSet(X, y, keys, features, target, version)
+
+def feature_frame(feature_set, include_target=False):
+    """
+    Return a feature set's matrix as a DataFrame aligned with its keys
+
+    Args:
+        feature_set (FeatureSet): Feature set
+        include_target (bool): Add the target as a column
+
+    Returns:
+        pandas.DataFrame: Features (and target)
+    """
+    frame = pd.DataFrame(feature_set.X, columns=feature_set.features, index=feature_set.keys.index)
+    if include_target:
+        frame[feature_set.target] = feature_set.y
+    return frame
+
+class FeatureStore:
+    """Materialized feature sets on disk, memory-mapped on load"""
+
+    def __init__(self, store_dir=FEATURE_STORE_DIR):
+        """
+        Initialize the store
+
+        Args:
+            store_dir (str): Directory holding the materialized feature sets
+        """
+        self.store_dir = store_dir
+        # Only the current version of each feature set stays mapped
+        self.loaded = {}
+        self.lock = threading.Lock()
+
+    def _key(self, data_type, min_value):
+        """Return the version of a feature set: a digest of its data and definition"""
+        definition = FEATURE_SETS[data_type]
+        key = repr((data_type, dataset_version(data_type), FEATURE_DEFINITION_VERSION,
+                    definition['features'], definition['target'], definition['qualifier'], min_value))
+        return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+    def get(self, data_type, min_value=None):
+        """
+        Return a feature set, materializing it if the data or definition changed
+
+        Args:
+            data_type (str): 'batting' or 'pitching'
+            min_value (float, optional): Minimum of the qualification column (PA or IP)
+
+        Returns:
+            FeatureSet: Feature set with memory-mapped arrays, or None if there is no data
+        """
+        version = self._key(data_type, min_value)
+        with self.lock:
+            loaded = self.loaded.get((data_type, min_value))
+            if loaded is not None and loaded.version == version:
+                return loaded
+
+        path = os.path.join(self.store_dir, f'{data_type}-{version}')
+        feature_set = None
+        if os.path.exists(os.path.join(path, 'meta.json')):
+            try:
+                feature_set = self._read(path)
+            except Exception as e:
+                logger.warning(f"Rebuilding unreadable feature set {path}: {e}")
+
+        if feature_set is None:
+            definition = FEATURE_SETS[data_type]
+            columns = FEATURE_KEY_COLUMNS + [definition['qualifier']] + definition['features'] + [definition['target']]
+            feature_set = build_feature_set(load_data(data_type, columns=columns), data_type, min_value, version)
+            if feature_set is None:
+                return None
+            try:
+                self._write(path, feature_set, data_type, min_value)
+                feature_set = self._read(path)
+            except OSError as e:
+                logger.warning(f"Could not store feature set {path}: {e}")
+            logger.info(f"Materialized {data_type} features: {len(feature_set.y)} rows, {len(feature_set.features)} features")
+
+        with self.lock:
+            self.loaded[(data_type, min_value)] = feature_set
+        return feature_set
+
+    def _write(self, path, feature_set, data_type, min_value):
+        """Write a feature set atomically and remove the versions it replaces"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(tmp_path, exist_ok=True)
+            np.save(os.path.join(tmp_path, 'X.npy'), feature_set.X)
+            np.save(os.path.join(tmp_path, 'y.npy'), feature_set.y)
+            feature_set.keys.to_pickle(os.path.join(tmp_path, 'keys.pkl'))
+            with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+                json.dump({
+                    'data_type': data_type,
+                    'version': feature_set.version,
+                    'min_value': min_value,
+                    'features': feature_set.features,
+                    'target': feature_set.target,
+                    'rows': int(len(feature_set.y)),
+                    'definition_version': FEATURE_DEFINITION_VERSION
+                }, f, indent=2)
+
+            if os.path.exists(path):
+                shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp_path, path)
+        except Exception:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+        # Older versions of the same feature set are stale once the new one is in place
+        for name in os.listdir(self.store_dir):
+            other = os.path.join(self.store_dir, name)
+            if other == path or not name.startswith(f'{data_type}-') or name.endswith('.tmp'):
+                continue
+            try:
+                with open(os.path.join(other, 'meta.json')) as f:
+                    stale = json.load(f).get('min_value') == min_value
+            except (OSError, ValueError):
+                stale = True
+            if stale:
+                shutil.rmtree(other, ignore_errors=True)
+
+    def _read(self, path):
+        """Load a stored feature set with its arrays memory-mapped read-only"""
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        return FeatureSet(
+            np.load(os.path.join(path, 'X.npy'), mmap_mode='r'),
+            np.load(os.path.join(path, 'y.npy'), mmap_mode='r'),
+            pd.read_pickle(os.path.join(path, 'keys.pkl')),
+            meta['features'],
+            meta['target'],
+            meta['version']
+        )
+
+_stores = {}
+
+def get_feature_store(store_dir=FEATURE_STORE_DIR):
+    """Return the shared feature store for a directory"""
+    if store_dir not in _stores:
+        _stores[store_dir] = FeatureStore(store_dir)
+    return _stores[store_dir]
+
+def get_feature_set(data_type, min_value=None):
+    """
+    Return a materialized feature set from the shared store
+
+    Args:
+        data_type (str): 'batting' or 'pitching'
+        min_value (float, optional): Minimum of the qualification column (PA or IP)
+
+    Returns:
+        FeatureSet: Feature set, or None if there is no data
+    """
+    return get_feature_store().get(data_type, min_value)
@@ -0,0 +1,173 @@
+"""
+Grouped aggregation kernel for Baseball Analytics System
+This module encodes group keys (pitch type, pitcher, count, batter stance, ...) once as
+dense integer codes and aggregates many metrics per group with bincount passes, which
+keeps pitch-level breakdowns fast on multi-season Statcast data.
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Statistics computed for every metric
+GROUP_STATS = ['count', 'sum', 'sumsq', 'mean']
+
+class GroupIndex:
+    """Dense integer group codes for one or more key columns of a DataFrame"""
+
+    def __init__(self, data, keys):
+        """
+        Encode the group keys of a DataFrame
+
+        Each key column is factorized once; the per-column codes are combined
+        arithmetically and compacted to 0..ngroups-1. Rows with a missing key belong
+        to no group (code -1), like groupby(dropna=True).
+
+        Args:
+            data (pandas.DataFrame): Data to group
+            keys (list): Key column names
+        """
+        if isinstance(keys, str):
+            keys = [keys]
+        self.keys = list(keys)
+        self.nrows = len(data)
+
+        key_codes = []
+        key_values = []
+        for key in self.keys:
+            codes, uniques = pd.factorize(data[key], sort=True)
+            key_codes.append(codes.astype(np.int64))
+            key_values.append(uniques)
+
+        cardinalities = [max(len(values), 1) for values in key_values]
+        if np.prod([float(c) for c in cardinalities]) >= 2 ** 62:
+            # Too many key combinations to combine arithmetically
+            self.codes = data.groupby(self.keys, sort=True, dropna=True).ngroup().to_numpy(dtype=np.int64)
+            valid = self.codes >= 0
+            _, first = np.unique(self.codes[valid], return_index=True)
+            self.groups = data.iloc[np.flatnonzero(valid)[first]][self.keys].reset_index(drop=True)
+            self.ngroups = len(self.groups)
+            return
+
+        combined = np.zeros(self.nrows, dtype=np.int64)
+        missing = np.zeros(self.nrows, dtype=bool)
+        for codes, cardinality in zip(key_codes, cardinalities):
+            combined = combined * cardinality + codes
+            missing |= codes < 0
+
+        combined[missing] = -1
+        dense, combos = pd.factorize(combined, sort=True)
+        if len(combos) and combos[0] == -1:
+            # factorize treats -1 as a value; shift it back out of the groups
+            dense = dense - 1
+            combos = combos[1:]
+
+        self.codes = dense.astype(np.int64)
+        self.ngroups = len(combos)
+
+        # Decode each combination back to its key values
+        remaining = np.asarray(combos, dtype=np.int64)
+        decoded = {}
+        for key, values, cardinality in reversed(list(zip(self.keys, key_values, cardinalities))):
+            remaining, position = np.divmod(remaining, cardinality)
+            decoded[key] = np.asarray(values)[position] if len(values) else position
+        self.groups = pd.DataFrame({key: decoded[key] for key in self.keys})
+
+    def index(self):
+        """Return the group keys as a pandas Index (a MultiIndex for several keys)"""
+        if len(self.keys) == 1:
+            return pd.Index(self.groups[self.keys[0]], name=self.keys[0])
+        return pd.MultiIndex.from_frame(self.groups)
+
+    def size(self):
+        """
+        Count the rows in each group
+
+        Returns:
+            pandas.Series: Rows per group
+        """
+        valid = self.codes >= 0
+        return pd.Series(np.bincount(self.codes[valid], minlength=self.ngroups), index=self.index(), name='count')
+
+    def aggregate(self, data, metrics):
+        """
+        Compute count, sum, sum of squares and mean of many metrics per group
+
+        All metrics are accumulated together: each statistic is one bincount over
+        (group, metric) cells. Missing metric values are skipped, like pandas.
+
+        Args:
+            data (pandas.DataFrame): Data the index was built from
+            metrics (list): Numeric metric columns
+
+        Returns:
+            pandas.DataFrame: One row per group, columns (metric, statistic)
+        """
+        if len(data) != self.nrows:
+            raise ValueError("Data does not match the rows the group index was built from")
+
+        metrics = list(metrics)
+        m = len(metrics)
+        X = data[metrics].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+
+        valid = self.codes >= 0
+        X = X[valid]
+        present = ~np.isnan(X)
+        values = np.where(present, X, 0.0)
+
+        cells = (self.codes[valid][:, None] * m + np.arange(m)).ravel()
+        length = self.ngroups * m
+        count = np.bincount(cells, weights=present.ravel(), minlength=length).reshape(-1, m)
+        total = np.bincount(cells, weights=values.ravel(), minlength=length).reshape(-1, m)
+        sumsq = np.bincount(cells, weights=(values ** 2).ravel(), minlength=length).reshape(-1, m)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, total / count, np.nan)
+
+        stats = {'count': count, 'sum': total, 'sumsq': sumsq, 'mean': mean}
+        columns = pd.MultiIndex.from_product([metrics, GROUP_STATS])
+        table = np.stack([stats[stat] for stat in GROUP_STATS], axis=2).reshape(self.ngroups, m * len(GROUP_STATS))
+        return pd.DataFrame(table, index=self.index(), columns=columns)
+
+def grouped_stats(data, keys, metrics):
+    """
+    Aggregate metrics over any combination of group keys
+
+    Args:
+        data (pandas.DataFrame): Data to aggregate
+        keys (list): Key column names, e.g. ['pitch_type', 'pitcher', 'balls', 'strikes', 'stand']
+        metrics (list): Numeric metric columns
+
+    Returns:
+        pandas.DataFrame: One row per group, columns (metric, statistic) plus ('rows', 'count')
+    """
+    index = GroupIndex(data, keys)
+    result = index.aggregate(data, metrics)
+    result[('rows', 'count')] = index.size().to_numpy()
+    return result
+
+def merge_aggregates(tables):
+    """
+    Combine aggregate tables computed over disjoint chunks of the same data
+
+    Args:
+        tables (list): Outputs of GroupIndex.aggregate or grouped_stats
+
+    Returns:
+        pandas.DataFrame: Aggregates over all chunks, groups in key order
+    """
+    tables = [table for table in tables if not table.empty]
+    if not tables:
+        return pd.DataFrame()
+
+    combined = pd.concat(tables)
+    levels = list(range(combined.index.nlevels))
+    merged = combined.groupby(level=levels, sort=True).sum()
+    for metric in merged.columns.get_level_values(0).unique():
+        if (metric, 'mean') in merged.columns:
+            count = merged[(metric, 'count')]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                merged[(metric, 'mean')] = np.where(count > 0, merged[(metric, 'sum')] / count, np.nan)
+    return merged
@@ -0,0 +1,138 @@
+"""
+Leaderboard engine for Baseball Analytics System
+This module computes many top-k/bottom-k leaderboards in one pass over a dataset,
+optionally per season, team or league, using partial selection instead of full sorts.
+"""
+
+import logging
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+
+from analytics_backend import apply_filters
+
+logger = logging.getLogger(__name__)
+
+# Columns shown with every leaderboard row when present
+DISPLAY_COLUMNS = ['Name', 'Team', 'Season']
+
+# A leaderboard over one metric; ascending=True ranks the lowest values first
+Leaderboard = namedtuple('Leaderboard', ['metric', 'ascending', 'columns'], defaults=[False, None])
+
+def top_k_positions(values, k, ascending=False):
+    """
+    Return the positions of the k best values, best first
+
+    Missing values are never ranked. Only the selected values are sorted, so the cost
+    is O(n + k log k) rather than the O(n log n) of a full sort.
+
+    Args:
+        values (numpy.ndarray): Metric values
+        k (int): Number of positions to return
+        ascending (bool): Rank the lowest values first
+
+    Returns:
+        numpy.ndarray: Positions into values
+    """
+    valid = np.flatnonzero(~np.isnan(values))
+    if k <= 0 or valid.size == 0:
+        return valid[:0]
+
+    keys = values[valid] if ascending else -values[valid]
+    if valid.size > k:
+        # Rows tied with the k-th value are taken in row order, like a stable sort
+        kth = np.partition(keys, k - 1)[k - 1]
+        better = np.flatnonzero(keys < kth)
+        selected = np.concatenate([better, np.flatnonzero(keys == kth)[:k - better.size]])
+    else:
+        selected = np.arange(valid.size)
+
+    # Order the selection by value, breaking ties by row order
+    order = np.lexsort((valid[selected], keys[selected]))
+    return valid[selected[order]]
+
+def grouped_top_k_positions(values, codes, k, ascending=False):
+    """
+    Return the positions of the k best values within every group
+
+    Rows are ordered by group code and then value with a single lexsort, and each row's
+    rank is its offset from the start of its group, so no per-group work is done in Python.
+
+    Args:
+        values (numpy.ndarray): Metric values
+        codes (numpy.ndarray): Non-negative group code of each row
+        k (int): Number of positions per group
+        ascending (bool): Rank the lowest values first
+
+    Returns:
+        tuple: (positions, ranks), group by group with the best rows first
+    """
+    valid = ~np.isnan(values) & (codes >= 0)
+    rows = np.flatnonzero(valid)
+    if k <= 0 or rows.size == 0:
+        return rows[:0], rows[:0]
+
+    group_codes = codes[rows]
+    keys = values[rows] if ascending else -values[rows]
+    # lexsort is stable, so ties keep row order
+    order = np.lexsort((keys, group_codes))
+    rows = rows[order]
+    group_codes = group_codes[order]
+
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(group_codes))])
+    ranks = np.arange(rows.size) - bounds[group_codes]
+    keep = ranks < k
+    return rows[keep], ranks[keep] + 1
+
+def compute_leaderboards(data, leaderboards, k=10, by=None, filters=None):
+    """
+    Compute several leaderboards over one dataset
+
+    Qualification filters are applied once and each metric is converted to a numeric
+    array once, however many groups are ranked.
+
+    Args:
+        data (pandas.DataFrame): Player or team data
+        leaderboards (dict): Mapping of leaderboard name to Leaderboard
+        k (int): Rows per leaderboard (per group when grouped)
+        by (list, optional): Columns to rank within, e.g. ['Season', 'Team']
+        filters (list, optional): List of (column, operator, value) qualification tuples
+
+    Returns:
+        dict: Mapping of leaderboard name to DataFrame. Grouped leaderboards hold the
+        group columns and a Rank column. Leaderboards whose metric is missing are omitted.
+    """
+    data = apply_filters(data, filters)
+    if data.empty:
+        return {}
+
+    if isinstance(by, str):
+        by = [by]
+    by = list(by or [])
+    missing = [col for col in by if col not in data.columns]
+    if missing:
+        logger.warning(f"Leaderboard group columns {missing} not found, ignoring them")
+        by = [col for col in by if col in data.columns]
+
+    codes = None
+    if by:
+        codes = data.groupby(by, sort=True, dropna=True).ngroup().to_numpy()
+
+    results = {}
+    for name, board in leaderboards.items():
+        if board.metric not in data.columns:
+            continue
+
+        values = pd.to_numeric(data[board.metric], errors='coerce').to_numpy(dtype=float)
+        columns = board.columns or DISPLAY_COLUMNS + [board.metric]
+        columns = list(dict.fromkeys(by + [col for col in columns if col in data.columns]))
+
+        if codes is None:
+            results[name] = data.iloc[top_k_positions(values, k, board.ascending)][columns]
+        else:
+            positions, ranks = grouped_top_k_positions(values, codes, k, board.ascending)
+            board_data = data.iloc[positions][columns]
+            board_data.insert(len(by), 'Rank', ranks)
+            results[name] = board_data.reset_index(drop=True)
+
+    return results
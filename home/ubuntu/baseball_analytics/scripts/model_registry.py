@@ -0,0 +1,375 @@
+"""
+Model registry for Baseball Analytics System
+This module stores every trained model version with its scaler, feature list, data
+fingerprint, metrics and timestamp, keeps a current pointer per target, and keeps the
+most recently used versions loaded in memory. Model arrays are stored uncompressed and
+memory-mapped on load, so processes serving the same version share one copy in the page
+cache; tree ensembles are stored as flat node arrays because scikit-learn trees copy
+their nodes when unpickled.
+"""
+
+import os
+import json
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from datetime import datetime
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_DIR = os.environ.get('BASEBALL_MODEL_REGISTRY', os.path.join('models', 'registry'))
+
+ARTIFACT_FILE = 'model.joblib'
+ESTIMATOR_FILE = 'estimator.joblib'
+TREES_DIR = 'trees'
+METADATA_FILE = 'metadata.json'
+CURRENT_FILE = 'CURRENT'
+
+# Loaded versions kept per target (the current one and the one it replaced)
+LOADED_VERSIONS = 2
+
+class TreeEnsemble:
+    """
+    Regression forest or gradient boosting ensemble predicting from flat node arrays
+
+    The nodes of every tree are concatenated into one set of arrays (child indices are
+    absolute), saved as .npy files and memory-mapped on load. Rows are routed through all
+    trees at once, one level per step over the (tree, row) pairs not yet at a leaf,
+    comparing float32 features like scikit-learn.
+    """
+
+    ARRAYS = ('children_left', 'children_right', 'feature', 'threshold', 'value', 'roots',
+              'feature_importances')
+
+    def __init__(self, kind, arrays, baseline=0.0, learning_rate=1.0):
+        """
+        Initialize the ensemble
+
+        Args:
+            kind (str): 'forest' (mean of the trees) or 'boosting' (baseline plus the
+                learning-rate-scaled sum of the trees)
+            arrays (dict): Node arrays named in ARRAYS
+            baseline (float): Initial prediction of a boosting ensemble
+            learning_rate (float): Learning rate of a boosting ensemble
+        """
+        self.kind = kind
+        self.arrays = arrays
+        self.baseline = baseline
+        self.learning_rate = learning_rate
+
+    @property
+    def feature_importances_(self):
+        """Impurity-based feature importances of the source estimator"""
+        return self.arrays['feature_importances']
+
+    @property
+    def n_estimators(self):
+        """Number of trees"""
+        return len(self.arrays['roots'])
+
+    @classmethod
+    def from_estimator(cls, model):
+        """
+        Flatten a fitted RandomForestRegressor or GradientBoostingRegressor
+
+        Args:
+            model (object): Fitted estimator
+
+        Returns:
+            TreeEnsemble: Flattened ensemble, or None for other estimators
+        """
+        if isinstance(model, RandomForestRegressor):
+            kind, trees, baseline, learning_rate = 'forest', [e.tree_ for e in model.estimators_], 0.0, 1.0
+        elif isinstance(model, GradientBoostingRegressor) and model.loss == 'squared_error':
+            trees = [e.tree_ for e in model.estimators_[:, 0]]
+            baseline = 0.0 if isinstance(model.init_, str) else float(np.ravel(model.init_.constant_)[0])
+            kind, learning_rate = 'boosting', float(model.learning_rate)
+        else:
+            return None
+
+        sizes = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+        def children(side):
+            return np.concatenate([
+                np.where(getattr(tree, side) >= 0, getattr(tree, side) + offset, -1)
+                for tree, offset in zip(trees, offsets)
+            ]).astype(np.int64)
+
+        arrays = {
+            'children_left': children('children_left'),
+            'children_right': children('children_right'),
+            # Leaves have feature -2; any valid column will do since they are never split
+            'feature': np.concatenate([np.maximum(tree.feature, 0) for tree in trees]).astype(np.int64),
+            'threshold': np.concatenate([tree.threshold for tree in trees]).astype(np.float64),
+            'value': np.concatenate([tree.value[:, 0, 0] for tree in trees]).astype(np.float64),
+            'roots': offsets.astype(np.int64),
+            'feature_importances': np.asarray(model.feature_importances_, dtype=np.float64)
+        }
+        return cls(kind, arrays, baseline, learning_rate)
+
+    def save(self, directory):
+        """Write the node arrays and settings to a directory"""
+        os.makedirs(directory, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(os.path.join(directory, f'{name}.npy'), self.arrays[name])
+        with open(os.path.join(directory, METADATA_FILE), 'w') as f:
+            json.dump({'kind': self.kind, 'baseline': self.baseline, 'learning_rate': self.learning_rate}, f)
+
+    @classmethod
+    def load(cls, directory):
+        """Load an ensemble with its node arrays memory-mapped read-only"""
+        with open(os.path.join(directory, METADATA_FILE)) as f:
+            settings = json.load(f)
+        arrays = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r') for name in cls.ARRAYS}
+        return cls(settings['kind'], arrays, settings['baseline'], settings['learning_rate'])
+
+    def tree_predictions(self, X):
+        """
+        Predict with every tree
+
+        Args:
+            X (numpy.ndarray): Scaled feature matrix
+
+        Returns:
+            numpy.ndarray: (n_trees x n_rows) leaf values
+        """
+        X = np.asarray(X, dtype=np.float32)
+        arrays = self.arrays
+        n_rows = X.shape[0]
+        # One (tree, row) pair per entry, tree by tree; only pairs not yet at a leaf move
+        nodes = np.repeat(np.asarray(arrays['roots']), n_rows)
+        rows = np.tile(np.arange(n_rows), self.n_estimators)
+        active = np.flatnonzero(arrays['children_left'][nodes] >= 0)
+        while active.size:
+            current = nodes[active]
+            go_left = X[rows[active], arrays['feature'][current]] <= arrays['threshold'][current]
+            nodes[active] = np.where(go_left, arrays['children_left'][current], arrays['children_right'][current])
+            active = active[arrays['children_left'][nodes[active]] >= 0]
+        return arrays['value'][nodes].reshape(self.n_estimators, n_rows)
+
+    def predict(self, X):
+        """
+        Predict like the source estimator
+
+        Args:
+            X (numpy.ndarray): Scaled feature matrix
+
+        Returns:
+            numpy.ndarray: Predictions
+        """
+        tree_predictions = self.tree_predictions(X)
+        if self.kind == 'forest':
+            return tree_predictions.mean(axis=0)
+        return self.baseline + self.learning_rate * tree_predictions.sum(axis=0)
+
+class ModelRegistry:
+    """Versioned store of trained models with a current version per target"""
+
+    def __init__(self, root=REGISTRY_DIR, loaded_versions=LOADED_VERSIONS):
+        """
+        Initialize the registry
+
+        Args:
+            root (str): Directory holding one subdirectory per target
+            loaded_versions (int): Loaded versions kept in memory per target
+        """
+        self.root = root
+        self.loaded_versions = loaded_versions
+        self.loaded = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _target_dir(self, target):
+        """Return the directory of a target's versions"""
+        return os.path.join(self.root, target)
+
+    def _version_dir(self, target, version):
+        """Return the directory of one model version"""
+        return os.path.join(self.root, target, version)
+
+    def register(self, target, model, scaler, features, model_name, metrics=None,
+                 data_version=None, params=None, make_current=True):
+        """
+        Store a trained model as a new version
+
+        Args:
+            target (str): Prediction target, e.g. 'batting_war'
+            model (object): Fitted estimator
+            scaler (object): Fitted scaler applied before the model
+            features (list): Feature names in model input order
+            model_name (str): Display name of the estimator
+            metrics (dict, optional): Evaluation metrics
+            data_version (str, optional): Fingerprint of the training data
+            params (dict, optional): Hyperparameters
+            make_current (bool): Point the target's current version at this one
+
+        Returns:
+            str: New version id
+        """
+        created_at = datetime.now()
+        digest = hashlib.sha1(f"{target}|{data_version}|{created_at.isoformat()}".encode()).hexdigest()[:8]
+        version = f"{created_at.strftime('%Y%m%dT%H%M%S')}-{digest}"
+
+        version_dir = self._version_dir(target, version)
+        os.makedirs(version_dir, exist_ok=True)
+        # Tree ensembles are served from their flat node arrays; the estimator itself is
+        # kept alongside for inspection but not loaded
+        ensemble = TreeEnsemble.from_estimator(model)
+        if ensemble is not None:
+            ensemble.save(os.path.join(version_dir, TREES_DIR))
+            joblib.dump(model, os.path.join(version_dir, ESTIMATOR_FILE))
+        joblib.dump({'model': model if ensemble is None else None, 'scaler': scaler},
+                    os.path.join(version_dir, ARTIFACT_FILE))
+
+        metadata = {
+            'target': target,
+            'version': version,
+            'model_name': model_name,
+            'model_class': type(model).__name__,
+            'features': list(features),
+            'data_version': data_version,
+            'metrics': metrics or {},
+            'params': {key: str(value) for key, value in (params or {}).items()},
+            'created_at': created_at.isoformat(timespec='seconds')
+        }
+        with open(os.path.join(version_dir, METADATA_FILE), 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+        if make_current:
+            self.set_current(target, version)
+
+        logger.info(f"Registered {target} model {version} ({model_name})")
+        return version
+
+    def versions(self, target):
+        """
+        List a target's versions, oldest first
+
+        Args:
+            target (str): Prediction target
+
+        Returns:
+            list: Version ids
+        """
+        target_dir = self._target_dir(target)
+        if not os.path.isdir(target_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(target_dir)
+            if os.path.exists(os.path.join(target_dir, name, METADATA_FILE))
+        )
+
+    def current_version(self, target):
+        """
+        Return the current version of a target
+
+        Args:
+            target (str): Prediction target
+
+        Returns:
+            str: Version id, or None if no model is registered
+        """
+        try:
+            with open(os.path.join(self._target_dir(target), CURRENT_FILE)) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def set_current(self, target, version):
+        """
+        Point a target's current version at a registered version (e.g. to roll back)
+
+        Args:
+            target (str): Prediction target
+            version (str): Version id
+        """
+        if not os.path.exists(os.path.join(self._version_dir(target, version), METADATA_FILE)):
+            raise ValueError(f"Unknown {target} model version: {version}")
+
+        path = os.path.join(self._target_dir(target), CURRENT_FILE)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+        os.replace(tmp_path, path)
+
+    def metadata(self, target, version=None):
+        """
+        Read a version's metadata without loading the model
+
+        Args:
+            target (str): Prediction target
+            version (str, optional): Version id. Defaults to the current version.
+
+        Returns:
+            dict: Metadata, or None if there is no such version
+        """
+        version = version or self.current_version(target)
+        if version is None:
+            return None
+        try:
+            with open(os.path.join(self._version_dir(target, version), METADATA_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load(self, target, version=None):
+        """
+        Load a model version
+
+        Model and scaler arrays are memory-mapped read-only, and tree ensembles are
+        loaded as a TreeEnsemble over memory-mapped node arrays. The most recently used
+        versions of each target stay loaded, so a re-registered or rolled-back model does
+        not leave every earlier version in memory.
+
+        Args:
+            target (str): Prediction target
+            version (str, optional): Version id. Defaults to the current version.
+
+        Returns:
+            dict: Bundle with model, scaler, features, model_name, version and metadata,
+            or None if no model is registered
+        """
+        metadata = self.metadata(target, version)
+        if metadata is None:
+            logger.warning(f"No registered {target} model found in {self.root}")
+            return None
+
+        key = (target, metadata['version'])
+        with self.lock:
+            if key in self.loaded:
+                self.loaded.move_to_end(key)
+                return self.loaded[key]
+
+        version_dir = self._version_dir(target, metadata['version'])
+        artifact = joblib.load(os.path.join(version_dir, ARTIFACT_FILE), mmap_mode='r')
+        model = artifact['model']
+        if os.path.isdir(os.path.join(version_dir, TREES_DIR)):
+            model = TreeEnsemble.load(os.path.join(version_dir, TREES_DIR))
+        bundle = {
+            'model': model,
+            'scaler': artifact['scaler'],
+            'features': metadata['features'],
+            'model_name': metadata['model_name'],
+            'version': metadata['version'],
+            'metadata': metadata
+        }
+
+        with self.lock:
+            self.loaded[key] = bundle
+            # Evict the target's least recently used versions beyond the limit
+            target_keys = [loaded_key for loaded_key in self.loaded if loaded_key[0] == target]
+            for stale_key in target_keys[:-self.loaded_versions]:
+                del self.loaded[stale_key]
+        return bundle
+
+_registries = {}
+
+def get_registry(root=REGISTRY_DIR):
+    """Return the shared registry for a directory"""
+    if root not in _registries:
+        _registries[root] = ModelRegistry(root)
+    return _registries[root]
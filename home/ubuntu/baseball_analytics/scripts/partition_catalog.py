@@ -0,0 +1,212 @@
+"""
+Partition catalog for Baseball Analytics System
+This module maps each processed dataset to its season/date-range partitions (files
+with row counts) so loads read exactly the files covering the requested range.
+"""
+
+import os
+import re
+import json
+import threading
+import logging
+from collections import namedtuple
+from datetime import date
+
+from analytics_backend import PROCESSED_DATA_DIR, DATASET_PREFIXES, dataset_files
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILE = 'catalog.json'
+
+# A processed file covering one season (batting/pitching/team) or one date range (Statcast)
+Partition = namedtuple('Partition', ['dataset', 'path', 'season', 'start_date', 'end_date', 'rows', 'size', 'mtime_ns'])
+
+STATCAST_RANGE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})_to_(\d{4}-\d{2}-\d{2})')
+SEASON_PATTERN = re.compile(r'_(\d{4})$')
+
+def parse_partition_range(data_type, path):
+    """
+    Derive the season and date range covered by a processed file from its name
+
+    Args:
+        data_type (str): Type of data
+        path (str): File path
+
+    Returns:
+        tuple: (season, start_date, end_date), with None for unknown parts
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+
+    if data_type == 'statcast':
+        match = STATCAST_RANGE_PATTERN.search(stem)
+        if match:
+            start = date.fromisoformat(match.group(1))
+            end = date.fromisoformat(match.group(2))
+            return start.year, start, end
+        return None, None, None
+
+    match = SEASON_PATTERN.search(stem)
+    if match:
+        season = int(match.group(1))
+        return season, date(season, 1, 1), date(season, 12, 31)
+    return None, None, None
+
+def count_rows(path):
+    """
+    Count the data rows in a processed file
+
+    Parquet row counts come from the file metadata; CSV rows are counted as lines
+    after the header.
+
+    Args:
+        path (str): File path
+
+    Returns:
+        int: Number of rows
+    """
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+
+    lines = 0
+    last = b'\n'
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(1 << 20)
+            if not chunk:
+                break
+            lines += chunk.count(b'\n')
+            last = chunk[-1:]
+    if last != b'\n':
+        lines += 1
+    return max(lines - 1, 0)
+
+class PartitionCatalog:
+    """Catalog of the processed files for each dataset, persisted next to the data"""
+
+    def __init__(self, data_dir=PROCESSED_DATA_DIR):
+        """
+        Initialize the catalog
+
+        Args:
+            data_dir (str): Directory holding the processed files
+        """
+        self.data_dir = data_dir
+        self.catalog_path = os.path.join(data_dir, CATALOG_FILE)
+        self.row_counts = {}
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Load recorded row counts from disk"""
+        try:
+            with open(self.catalog_path) as f:
+                self.row_counts = {
+                    path: tuple(entry) for path, entry in json.load(f).get('row_counts', {}).items()
+                }
+        except (OSError, ValueError):
+            self.row_counts = {}
+
+    def save(self):
+        """Persist the recorded row counts"""
+        with self.lock:
+            payload = {'row_counts': {path: list(entry) for path, entry in self.row_counts.items()}}
+        try:
+            tmp_path = self.catalog_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.catalog_path)
+        except OSError as e:
+            logger.warning(f"Could not save partition catalog: {e}")
+
+    def record(self, path, rows):
+        """
+        Record the exact row count of a file that was just written
+
+        Args:
+            path (str): File path
+            rows (int): Number of data rows
+        """
+        stat = os.stat(path)
+        with self.lock:
+            self.row_counts[path] = (stat.st_size, stat.st_mtime_ns, int(rows))
+        self.save()
+
+    def _rows(self, path, stat):
+        """Return the row count of a file, counting it if the recorded count is stale"""
+        with self.lock:
+            entry = self.row_counts.get(path)
+        if entry is not None and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2], False
+
+        rows = count_rows(path)
+        with self.lock:
+            self.row_counts[path] = (stat.st_size, stat.st_mtime_ns, rows)
+        return rows, True
+
+    def partitions(self, data_type, season=None, start_date=None, end_date=None):
+        """
+        List the partitions of a dataset overlapping a season or date range
+
+        Args:
+            data_type (str): Type of data ('batting', 'pitching', 'team', 'statcast')
+            season (int, optional): Season to select
+            start_date (date or str, optional): First date of the range
+            end_date (date or str, optional): Last date of the range
+
+        Returns:
+            list: Partition tuples ordered by date range
+        """
+        if isinstance(start_date, str):
+            start_date = date.fromisoformat(start_date)
+        if isinstance(end_date, str):
+            end_date = date.fromisoformat(end_date)
+
+        selected = []
+        counted = False
+        for path in dataset_files(data_type, data_dir=self.data_dir):
+            part_season, part_start, part_end = parse_partition_range(data_type, path)
+
+            if season is not None and part_season is not None and part_season != int(season):
+                continue
+            if start_date is not None and part_end is not None and part_end < start_date:
+                continue
+            if end_date is not None and part_start is not None and part_start > end_date:
+                continue
+            if season is not None and part_season is None and str(season) not in os.path.basename(path):
+                continue
+
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            rows, recounted = self._rows(path, stat)
+            counted = counted or recounted
+
+            selected.append(Partition(data_type, path, part_season, part_start, part_end,
+                                      rows, stat.st_size, stat.st_mtime_ns))
+
+        if counted:
+            self.save()
+
+        return sorted(selected, key=lambda p: (p.start_date or date.min, p.path))
+
+    def summary(self):
+        """
+        Summarize every dataset's partitions
+
+        Returns:
+            dict: Mapping of dataset to a list of partition dicts
+        """
+        return {
+            data_type: [p._asdict() for p in self.partitions(data_type)]
+            for data_type in DATASET_PREFIXES
+        }
+
+_catalogs = {}
+
+def get_catalog(data_dir=PROCESSED_DATA_DIR):
+    """Return the shared catalog for a data directory"""
+    if data_dir not in _catalogs:
+        _catalogs[data_dir] = PartitionCatalog(data_dir)
+    return _catalogs[data_dir]
@@ -0,0 +1,315 @@
+"""
+Stage profiling for Baseball Analytics System
+This module provides opt-in instrumentation of the pipeline's hot paths: every
+profiled stage records wall time, CPU time, peak memory growth and rows processed to a
+JSON-lines trace (and optionally a Chrome trace), and chosen stages can be captured
+with cProfile or a sampling profiler. When profiling is off a stage costs one flag check.
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import cProfile
+import functools
+import threading
+import logging
+from collections import Counter
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Peak memory is only available on Unix
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Set BASEBALL_PROFILE=1 to record stages
+PROFILE_ENABLED = os.environ.get('BASEBALL_PROFILE', '0').lower() in ('1', 'true', 'yes')
+
+# Where stage records are appended (JSON lines), and an optional Chrome trace file
+TRACE_PATH = os.environ.get('BASEBALL_PROFILE_TRACE', os.path.join('logs', 'profile_trace.jsonl'))
+CHROME_TRACE_PATH = os.environ.get('BASEBALL_PROFILE_CHROME')
+
+# Comma-separated stage names to capture, how ('cprofile' or 'sample') and where
+PROFILE_STAGES = {name for name in os.environ.get('BASEBALL_PROFILE_STAGES', '').split(',') if name}
+PROFILE_MODE = os.environ.get('BASEBALL_PROFILE_MODE', 'cprofile').lower()
+PROFILE_DIR = os.environ.get('BASEBALL_PROFILE_DIR', os.path.join('logs', 'profiles'))
+
+# Interval between stack samples of the sampling profiler
+SAMPLE_INTERVAL = float(os.environ.get('BASEBALL_PROFILE_SAMPLE_MS', '5')) / 1000
+
+_state = threading.local()
+_write_lock = threading.Lock()
+_chrome_events = []
+_run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+
+def enable(trace_path=None, chrome_trace_path=None, stages=None, mode=None):
+    """
+    Turn profiling on for this process
+
+    Args:
+        trace_path (str, optional): JSON-lines trace file
+        chrome_trace_path (str, optional): Chrome trace file written at exit
+        stages (iterable, optional): Stage names to capture with a profiler
+        mode (str, optional): 'cprofile' or 'sample'
+    """
+    global PROFILE_ENABLED, TRACE_PATH, CHROME_TRACE_PATH, PROFILE_STAGES, PROFILE_MODE
+    PROFILE_ENABLED = True
+    TRACE_PATH = trace_path or TRACE_PATH
+    CHROME_TRACE_PATH = chrome_trace_path or CHROME_TRACE_PATH
+    PROFILE_STAGES = set(stages) if stages is not None else PROFILE_STAGES
+    PROFILE_MODE = (mode or PROFILE_MODE).lower()
+
+def disable():
+    """Turn profiling off"""
+    global PROFILE_ENABLED
+    PROFILE_ENABLED = False
+
+def _peak_rss_mb():
+    """Return the process's peak resident memory in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def count_rows(result):
+    """
+    Count the rows in a stage's result
+
+    Args:
+        result (object): Return value of a stage
+
+    Returns:
+        int: Rows of a DataFrame/Series result (or of the first one in a tuple), else None
+    """
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return len(result)
+    return None
+
+class SamplingProfiler:
+    """Samples one thread's Python stack at a fixed interval into folded stacks"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        """
+        Initialize the profiler
+
+        Args:
+            thread_id (int): Thread to sample
+            interval (float): Seconds between samples
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        """Sample the thread's stack until stopped"""
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        """Start sampling"""
+        self.thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread"""
+        self.stopped.set()
+        self.thread.join()
+
+    def save(self, path):
+        """Write the samples in folded-stack format (one 'frame;frame;... count' per line)"""
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+def _start_capture(name):
+    """Start a profiler for a stage selected in PROFILE_STAGES"""
+    if name not in PROFILE_STAGES:
+        return None
+    if PROFILE_MODE == 'sample':
+        profiler = SamplingProfiler(threading.get_ident())
+        profiler.start()
+        return profiler
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # Another cProfile is already active (nested captured stage)
+        return None
+    return profiler
+
+def _stop_capture(name, profiler):
+    """Stop a stage's profiler and write its output; returns the file written"""
+    if profiler is None:
+        return None
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    base = os.path.join(PROFILE_DIR, f"{name.replace('/', '_')}-{_run_id}-{time.time_ns()}")
+    if isinstance(profiler, SamplingProfiler):
+        profiler.stop()
+        path = f"{base}.folded"
+        profiler.save(path)
+    else:
+        profiler.disable()
+        path = f"{base}.prof"
+        profiler.dump_stats(path)
+    logger.info(f"Saved {name} profile to {path}")
+    return path
+
+def _write(record):
+    """Append a stage record to the trace files"""
+    with _write_lock:
+        if TRACE_PATH:
+            os.makedirs(os.path.dirname(TRACE_PATH) or '.', exist_ok=True)
+            with open(TRACE_PATH, 'a') as f:
+                f.write(json.dumps(record, default=str) + '\n')
+        if CHROME_TRACE_PATH:
+            _chrome_events.append({
+                'name': record['stage'], 'ph': 'X', 'pid': record['pid'], 'tid': record['thread'],
+                'ts': record['start_us'], 'dur': record['wall_ms'] * 1000,
+                'args': {key: record[key] for key in ('cpu_ms', 'peak_mem_delta_mb', 'rows') if record.get(key) is not None}
+            })
+
+@atexit.register
+def write_chrome_trace():
+    """Write the collected stages as a Chrome trace (chrome://tracing, Perfetto)"""
+    with _write_lock:
+        if not CHROME_TRACE_PATH or not _chrome_events:
+            return
+        os.makedirs(os.path.dirname(CHROME_TRACE_PATH) or '.', exist_ok=True)
+        with open(CHROME_TRACE_PATH, 'w') as f:
+            json.dump({'traceEvents': _chrome_events, 'displayTimeUnit': 'ms'}, f)
+
+@contextmanager
+def stage(name, rows=None, **attributes):
+    """
+    Record a stage of work
+
+    The yielded dict can be updated inside the block, e.g. record['rows'] = len(data).
+
+    Args:
+        name (str): Stage name, e.g. 'load_data'
+        rows (int, optional): Rows processed, if known up front
+        **attributes: Extra fields stored with the record
+
+    Yields:
+        dict: The stage record (None when profiling is off)
+    """
+    if not PROFILE_ENABLED:
+        yield None
+        return
+
+    stack = getattr(_state, 'stack', None)
+    if stack is None:
+        stack = _state.stack = []
+    record = {'stage': name, 'rows': rows, **attributes}
+    stack.append(name)
+
+    profiler = _start_capture(name)
+    peak_before = _peak_rss_mb()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    start_us = time.time_ns() // 1000
+    error = None
+    try:
+        yield record
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        wall_ms = (time.perf_counter() - wall_start) * 1000
+        cpu_ms = (time.process_time() - cpu_start) * 1000
+        peak_after = _peak_rss_mb()
+        profile_path = _stop_capture(name, profiler)
+        stack.pop()
+
+        record.update({
+            'run': _run_id,
+            'pid': os.getpid(),
+            'thread': threading.get_ident(),
+            'parent': stack[-1] if stack else None,
+            'depth': len(stack),
+            'start_us': start_us,
+            'wall_ms': round(wall_ms, 3),
+            'cpu_ms': round(cpu_ms, 3),
+            'peak_mem_delta_mb': round(peak_after - peak_before, 3) if peak_before is not None else None,
+            'peak_mem_mb': round(peak_after, 3) if peak_after is not None else None,
+        })
+        if error:
+            record['error'] = error
+        if profile_path:
+            record['profile'] = profile_path
+        _write(record)
+
+def profiled(name=None, rows=count_rows):
+    """
+    Decorate a function as a profiled stage
+
+    Args:
+        name (str, optional): Stage name. Defaults to the function's qualified name.
+        rows (callable, optional): Computes rows processed from the return value
+
+    Returns:
+        function: Decorator
+    """
+    def decorator(func):
+        stage_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILE_ENABLED:
+                return func(*args, **kwargs)
+            with stage(stage_name) as record:
+                result = func(*args, **kwargs)
+                if rows is not None and record.get('rows') is None:
+                    record['rows'] = rows(result)
+                return result
+
+        return wrapper
+
+    return decorator
+
+def summarize_trace(path=None):
+    """
+    Aggregate a JSON-lines trace per stage
+
+    Args:
+        path (str, optional): Trace file. Defaults to TRACE_PATH.
+
+    Returns:
+        pandas.DataFrame: calls, total/mean/max wall ms, total CPU ms, max peak memory
+        delta and total rows per stage, slowest first
+    """
+    records = pd.read_json(path or TRACE_PATH, lines=True)
+    if records.empty:
+        return pd.DataFrame()
+    for column in ['rows', 'peak_mem_delta_mb']:
+        if column not in records.columns:
+            records[column] = np.nan
+    summary = records.groupby('stage').agg(
+        calls=('wall_ms', 'size'),
+        wall_ms=('wall_ms', 'sum'),
+        mean_wall_ms=('wall_ms', 'mean'),
+        max_wall_ms=('wall_ms', 'max'),
+        cpu_ms=('cpu_ms', 'sum'),
+        max_peak_mem_delta_mb=('peak_mem_delta_mb', 'max'),
+        rows=('rows', lambda rows: rows.sum(min_count=1))
+    )
+    return summary.sort_values('wall_ms', ascending=False)
+
+if __name__ == "__main__":
+    pd.set_option('display.width', 200)
+    print(summarize_trace(sys.argv[1] if len(sys.argv) > 1 else None).round(1).to_string())
@@ -0,0 +1,222 @@
+"""
+Player projections for Baseball Analytics System
+This module projects every player's next season Marcel-style: the last three seasons'
+rates weighted toward the most recent, regressed toward the league rate in proportion
+to playing time, and adjusted for age. The whole league is projected at once from
+player x season x stat arrays.
+"""
+
+import threading
+import logging
+import numpy as np
+import pandas as pd
+
+from data_access import load_data, dataset_version
+
+logger = logging.getLogger(__name__)
+
+# How each player type is projected:
+#   playing_time - denominator column every stat is a rate of
+#   weights      - season weights, most recent first
+#   regression   - league-average playing time added to every player's history
+#   baseline     - projected playing time = sum(playing_time_weights * history) + baseline
+#   counting     - stats projected as totals over the projected playing time
+#   rates        - stats projected as playing-time-weighted rates
+#   lower_better - stats where a smaller value is better (aging works the other way)
+PROJECTION_SYSTEMS = {
+    'batting': {
+        'playing_time': 'PA',
+        'weights': (5.0, 4.0, 3.0),
+        'regression': 1200.0,
+        'playing_time_weights': (0.5, 0.1),
+        'baseline': 200.0,
+        'counting': ['HR', 'RBI', 'SB', 'BB', 'SO', 'WAR'],
+        'rates': ['AVG', 'OBP', 'SLG', 'OPS', 'BB%', 'K%', 'wOBA'],
+        'lower_better': ['SO', 'K%']
+    },
+    'pitching': {
+        'playing_time': 'IP',
+        'weights': (3.0, 2.0, 1.0),
+        'regression': 134.0,
+        'playing_time_weights': (0.5, 0.1),
+        # Marcel uses 60 for starters; games started are not in the cleaned data
+        'baseline': 25.0,
+        'counting': ['SO', 'BB', 'WAR'],
+        'rates': ['ERA', 'FIP', 'xFIP', 'WHIP', 'K/9', 'BB/9', 'HR/9', 'BABIP'],
+        'lower_better': ['BB', 'ERA', 'FIP', 'xFIP', 'WHIP', 'BB/9', 'HR/9', 'BABIP']
+    }
+}
+
+# Players improve by AGE_GAIN per year below PEAK_AGE and decline by AGE_DECLINE per year above it
+PEAK_AGE = 29
+AGE_GAIN = 0.006
+AGE_DECLINE = 0.003
+
+KEY_COLUMNS = ['IDfg', 'Name', 'Team', 'Season', 'Age']
+
+def projection_columns(data_type):
+    """Return the columns a projection reads"""
+    system = PROJECTION_SYSTEMS[data_type]
+    return KEY_COLUMNS + [system['playing_time']] + system['counting'] + system['rates']
+
+def aging_factor(age):
+    """
+    Return the multiplicative aging adjustment for a projected age
+
+    Args:
+        age (numpy.ndarray): Age in the projected season (NaN for unknown)
+
+    Returns:
+        numpy.ndarray: 1 + improvement (positive below the peak, negative above it)
+    """
+    age = np.asarray(age, dtype=float)
+    factor = np.where(age < PEAK_AGE, 1 + (PEAK_AGE - age) * AGE_GAIN, 1 - (age - PEAK_AGE) * AGE_DECLINE)
+    return np.where(np.isnan(age), 1.0, factor)
+
+def project(data, data_type):
+    """
+    Project the following season of every player-season
+
+    Each player-season with playing time is the base of a projection for the next
+    season, from that season and the two before it. Players with several rows in a
+    season (e.g. after a trade) are combined by playing time.
+
+    Args:
+        data (pandas.DataFrame): Player-season data
+        data_type (str): 'batting' or 'pitching'
+
+    Returns:
+        pandas.DataFrame: One row per base player-season with the player keys, the
+        projected Season and Age, projected playing time, counting stats and rates,
+        and Reliability (the share of the projection taken from the player's own history)
+    """
+    system = PROJECTION_SYSTEMS[data_type]
+    time_column = system['playing_time']
+    if data.empty or time_column not in data.columns or 'Season' not in data.columns:
+        return pd.DataFrame()
+
+    counting = [col for col in system['counting'] if col in data.columns]
+    rates = [col for col in system['rates'] if col in data.columns]
+    stats = counting + rates
+
+    data = data[data[time_column].fillna(0) > 0]
+    if data.empty:
+        return pd.DataFrame()
+
+    # players x seasons cells
+    player_key = data['IDfg'] if 'IDfg' in data.columns else data['Name']
+    player_codes, players = pd.factorize(player_key)
+    seasons = data['Season'].to_numpy(dtype=int)
+    first_season = seasons.min()
+    n_seasons = seasons.max() - first_season + 1
+    cells = player_codes * n_seasons + (seasons - first_season)
+    n_cells = len(players) * n_seasons
+
+    # Totals per cell: playing time and playing time x rate for every stat (NaN counts as missing)
+    playing_time = data[time_column].to_numpy(dtype=float)
+    values = data[stats].to_numpy(dtype=float)
+    counts = np.where(np.isnan(values), 0.0, values)
+    if rates:
+        counts[:, len(counting):] *= playing_time[:, np.newaxis]
+    # Rates are averaged only over playing time where they were recorded
+    exposure = np.where(np.isnan(values), 0.0, playing_time[:, np.newaxis])
+
+    time_total = np.bincount(cells, weights=playing_time, minlength=n_cells).reshape(len(players), n_seasons)
+    count_total = np.stack([np.bincount(cells, weights=counts[:, i], minlength=n_cells) for i in range(len(stats))], axis=-1)
+    exposure_total = np.stack([np.bincount(cells, weights=exposure[:, i], minlength=n_cells) for i in range(len(stats))], axis=-1)
+    count_total = count_total.reshape(len(players), n_seasons, len(stats))
+    exposure_total = exposure_total.reshape(len(players), n_seasons, len(stats))
+
+    # League rate of each season
+    league_rate = count_total.sum(axis=0) / np.maximum(exposure_total.sum(axis=0), 1e-9)
+
+    # Weighted sums over each base season and the seasons before it
+    weights = system['weights']
+    weighted_counts = np.zeros_like(count_total)
+    weighted_exposure = np.zeros_like(exposure_total)
+    league_weighted = np.zeros_like(league_rate)
+    league_weight = np.zeros((n_seasons, 1))
+    for lag, weight in enumerate(weights):
+        if lag >= n_seasons:
+            break
+        weighted_counts[:, lag:] += weight * count_total[:, :n_seasons - lag]
+        weighted_exposure[:, lag:] += weight * exposure_total[:, :n_seasons - lag]
+        league_weighted[lag:] += weight * league_rate[:n_seasons - lag]
+        league_weight[lag:] += weight
+    league_mean = league_weighted / league_weight
+
+    # Regress toward the league: add `regression` of league-average playing time
+    regression = system['regression']
+    rate = (weighted_counts + regression * league_mean) / (weighted_exposure + regression)
+    reliability = weighted_exposure / (weighted_exposure + regression)
+
+    # Age in the projected season, from the latest age recorded for the base season
+    if 'Age' in data.columns:
+        age_total = np.full(n_cells, np.nan)
+        np.fmax.at(age_total, cells, data['Age'].to_numpy(dtype=float))
+        age = age_total.reshape(len(players), n_seasons) + 1
+    else:
+        age = np.full((len(players), n_seasons), np.nan)
+
+    # Aging moves every stat toward better (or worse) by the same share of its size
+    direction = np.array([-1.0 if stat in system['lower_better'] else 1.0 for stat in stats])
+    improvement = aging_factor(age)[..., np.newaxis] - 1
+    rate = rate + direction * np.abs(rate) * improvement
+
+    # Projected playing time
+    projected_time = np.full((len(players), n_seasons), system['baseline'])
+    for lag, weight in enumerate(system['playing_time_weights']):
+        if lag < n_seasons:
+            projected_time[:, lag:] += weight * time_total[:, :n_seasons - lag]
+
+    # One row per base player-season
+    player_rows, season_rows = np.nonzero(time_total > 0)
+    last_rows = (data.assign(_cell=cells).drop_duplicates('_cell', keep='last')
+                 .set_index('_cell').reindex(player_rows * n_seasons + season_rows))
+
+    result = pd.DataFrame({
+        col: last_rows[col].to_numpy() for col in ['IDfg', 'Name', 'Team'] if col in data.columns
+    })
+    result['Season'] = season_rows + first_season + 1
+    result['Age'] = age[player_rows, season_rows]
+    result[time_column] = projected_time[player_rows, season_rows]
+
+    projected = rate[player_rows, season_rows]
+    for i, stat in enumerate(stats):
+        if stat in counting:
+            result[stat] = projected[:, i] * result[time_column].to_numpy()
+        else:
+            result[stat] = projected[:, i]
+    result['Reliability'] = reliability[player_rows, season_rows].mean(axis=1) if stats else np.nan
+    return result
+
+_projections = {}
+_projections_lock = threading.Lock()
+
+def season_projections(data_type, season=None):
+    """
+    Return projections from the current processed data, recomputed when the data changes
+
+    Args:
+        data_type (str): 'batting' or 'pitching'
+        season (int, optional): Projected season to return. If None, returns the
+            projections for the season after the latest in the data.
+
+    Returns:
+        pandas.DataFrame: Projections (see project)
+    """
+    version = dataset_version(data_type)
+    with _projections_lock:
+        cached = _projections.get(data_type)
+    if cached is not None and cached[0] == version:
+        result = cached[1]
+    else:
+        result = project(load_data(data_type, columns=projection_columns(data_type)), data_type)
+        with _projections_lock:
+            _projections[data_type] = (version, result)
+        logger.info(f"Projected {len(result)} {data_type} player-seasons")
+
+    if result.empty:
+        return result
+    season = season if season is not None else result['Season'].max()
+    return result[result['Season'] == season].reset_index(drop=True)
@@ -0,0 +1,181 @@
+"""
+Analysis result cache for Baseball Analytics System
+This module memoizes analysis results under (method, parameters, data version) keys,
+in memory and optionally on disk, so repeated report and dashboard requests are instant.
+"""
+
+import os
+import copy
+import hashlib
+import inspect
+import functools
+import threading
+import logging
+from collections import OrderedDict
+import joblib
+
+logger = logging.getLogger(__name__)
+
+# Directory for persisted results (unset keeps results in memory only)
+RESULT_CACHE_DIR = os.environ.get('BASEBALL_RESULT_CACHE_DIR')
+
+# Maximum number of results kept in memory
+RESULT_CACHE_SIZE = int(os.environ.get('BASEBALL_RESULT_CACHE_SIZE', '256'))
+
+# Maximum number of result files kept in the cache directory (least recently used go first)
+RESULT_CACHE_FILES = int(os.environ.get('BASEBALL_RESULT_CACHE_FILES', '4096'))
+
+class ResultCache:
+    """LRU cache of analysis results with optional, size-capped disk persistence"""
+
+    def __init__(self, max_entries=RESULT_CACHE_SIZE, cache_dir=RESULT_CACHE_DIR, max_files=RESULT_CACHE_FILES):
+        """
+        Initialize the result cache
+
+        Args:
+            max_entries (int): Maximum number of results kept in memory
+            cache_dir (str, optional): Directory to persist results to
+            max_files (int): Maximum number of result files kept in cache_dir
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_files = max_files
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def digest(key):
+        """Return a stable hex digest of a cache key"""
+        return hashlib.sha1(repr(key).encode()).hexdigest()
+
+    def _path(self, key):
+        """Return the file a result is persisted to"""
+        return os.path.join(self.cache_dir, f"{key[0]}-{self.digest(key)}.joblib")
+
+    def get(self, key):
+        """
+        Look up a result
+
+        Args:
+            key (tuple): (method, parameters, data versions)
+
+        Returns:
+            object: Cached result, or None on a miss
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+
+        if self.cache_dir:
+            path = self._path(key)
+            if os.path.exists(path):
+                try:
+                    result = joblib.load(path)
+                except Exception as e:
+                    logger.warning(f"Discarding unreadable cached result {path}: {e}")
+                    return None
+                try:
+                    # Mark the file recently used so pruning keeps it
+                    os.utime(path)
+                except OSError:
+                    pass
+                self._remember(key, result)
+                return result
+
+        return None
+
+    def put(self, key, result):
+        """
+        Store a result
+
+        Args:
+            key (tuple): (method, parameters, data versions)
+            result (object): Result to cache
+        """
+        self._remember(key, result)
+
+        if self.cache_dir:
+            path = self._path(key)
+            try:
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                joblib.dump(result, tmp_path)
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.warning(f"Could not persist cached result {path}: {e}")
+            self._prune()
+
+    def _prune(self):
+        """Delete the least recently used result files beyond max_files"""
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                files = [(entry.stat().st_mtime_ns, entry.path) for entry in entries if entry.name.endswith('.joblib')]
+        except OSError:
+            return
+
+        if len(files) <= self.max_files:
+            return
+        files.sort()
+        for _, path in files[:len(files) - self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Already pruned by another worker
+
+    def _remember(self, key, result):
+        """Add a result to the in-memory LRU"""
+        with self.lock:
+            self.entries[key] = result
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all in-memory results"""
+        with self.lock:
+            self.entries.clear()
+
+analysis_result_cache = ResultCache()
+
+def memoize_result(*datasets):
+    """
+    Memoize an analysis method on its parameters and the versions of its datasets
+
+    The instance must provide `result_cache` and `data_version(name)`; a data version
+    of None (data assigned directly rather than loaded from files) bypasses the cache.
+
+    Args:
+        *datasets (str): Names of the datasets the method reads
+
+    Returns:
+        function: Decorator
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'result_cache', None)
+            versions = tuple(self.data_version(name) for name in datasets)
+            if cache is None or None in versions:
+                return method(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = tuple((name, value) for name, value in bound.arguments.items() if name != 'self')
+            key = (method.__name__, params, versions)
+
+            result = cache.get(key)
+            if result is None:
+                result = method(self, *args, **kwargs)
+                cache.put(key, result)
+
+            # Callers get their own copy so they cannot alter the cached result
+            return copy.deepcopy(result)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,305 @@
+"""
+Batch model scoring script for Baseball Analytics System
+This script scores every eligible player-season with the trained WAR models and
+replaces each model's rows in the model_predictions table atomically.
+"""
+
+import os
+import sys
+import io
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from sqlalchemy import create_engine
+import logging
+from sklearn.ensemble import RandomForestRegressor
+
+from analytics_backend import get_database_url, use_duckdb, DUCKDB_PATH
+from analysis_modeling import PlayerEvaluationModel
+from model_registry import TreeEnsemble, get_registry
+from profiling import profiled
+
+# Create directories if they don't exist
+os.makedirs('logs', exist_ok=True)
+
+logger = logging.getLogger(__name__)
+
+# Database connection settings
+DB_USER = "postgres"
+DB_PASSWORD = "baseball_analytics"
+DB_HOST = "localhost"
+DB_PORT = "5432"
+DB_NAME = "baseball_analytics"
+
+# Create the database URL
+DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+# Columns written to the model_predictions table, in COPY order
+PREDICTION_COLUMNS = [
+    'model_type', 'model_name', 'player_id', 'player_name', 'team_id', 'season',
+    'predicted_value', 'lower_bound', 'upper_bound', 'confidence', 'created_at'
+]
+
+# z-score for the 95% prediction interval
+INTERVAL_Z = 1.96
+
+# Table definition used when the embedded backend has no model_predictions table yet
+DUCKDB_PREDICTIONS_DDL = """
+CREATE TABLE IF NOT EXISTS model_predictions (
+    id BIGINT DEFAULT nextval('model_predictions_id_seq') PRIMARY KEY,
+    model_type VARCHAR NOT NULL,
+    model_name VARCHAR,
+    player_id INTEGER,
+    player_name VARCHAR,
+    team_id VARCHAR,
+    season INTEGER,
+    predicted_value DOUBLE,
+    lower_bound DOUBLE,
+    upper_bound DOUBLE,
+    confidence DOUBLE,
+    created_at TIMESTAMP
+)
+"""
+
+def connect_to_db():
+    """Connect to the configured database backend"""
+    try:
+        engine = create_engine(get_database_url(DATABASE_URL))
+        return engine
+    except Exception as e:
+        logger.error(f"Error connecting to database: {e}")
+        sys.exit(1)
+
+def load_trained_model(model_type):
+    """
+    Load the current registered WAR model with its scaler and feature order
+
+    Args:
+        model_type (str): 'batting' or 'pitching'
+
+    Returns:
+        dict: Model bundle, or None if the model has not been trained
+    """
+    registered = get_registry().load(f'{model_type}_war')
+    if registered is None:
+        return None
+
+    bundle = dict(registered)
+    # Predictions record the exact model version that produced them
+    bundle['model_name'] = f"{registered['metadata']['model_class']}@{registered['version']}"
+    # Cross-validated or hold-out error of the model, scaled per row by prediction_spread
+    rmse = registered['metadata']['metrics'].get('RMSE')
+    bundle['rmse'] = float(rmse) if rmse is not None else None
+    return bundle
+
+def prediction_spread(model, X_scaled, rmse, predicted):
+    """
+    Estimate the standard deviation of each prediction
+
+    Random forests use the spread of their per-tree predictions. Other models (linear
+    and gradient boosting) scale the hold-out RMSE by each row's leverage x(X'X)^-1x'
+    over the scored player-seasons, so unusual stat lines get wider intervals. A model
+    registered without an RMSE uses the spread of its own predictions instead.
+
+    Args:
+        model: Fitted estimator
+        X_scaled (numpy.ndarray): Scaled feature matrix
+        rmse (float): Hold-out RMSE of the model (may be None)
+        predicted (numpy.ndarray): The model's predictions for X_scaled
+
+    Returns:
+        numpy.ndarray: Per-row standard deviation
+    """
+    if isinstance(model, TreeEnsemble) and model.kind == 'forest':
+        # One prediction per tree in a single (n_trees x n_rows) array
+        return model.tree_predictions(X_scaled).std(axis=0)
+
+    if isinstance(model, RandomForestRegressor):
+        tree_predictions = np.stack([tree.predict(X_scaled) for tree in model.estimators_])
+        return tree_predictions.std(axis=0)
+
+    if rmse is None:
+        rmse = float(np.nanstd(predicted))
+    design = np.column_stack([np.ones(X_scaled.shape[0]), X_scaled])
+    inverse = np.linalg.pinv(design.T @ design)
+    leverage = np.einsum('ij,jk,ik->i', design, inverse, design)
+    return rmse * np.sqrt(1 + leverage)
+
+@profiled()
+def score_player_seasons(model_type, bundle, X, keys):
+    """
+    Score a whole feature matrix in one vectorized call
+
+    Args:
+        model_type (str): 'batting' or 'pitching'
+        bundle (dict): Model bundle from load_trained_model
+        X (pandas.DataFrame): Feature matrix
+        keys (pandas.DataFrame): Row keys (IDfg, Name, Team, Season) aligned with X
+
+    Returns:
+        pandas.DataFrame: Predictions in PREDICTION_COLUMNS order
+    """
+    X_scaled = bundle['scaler'].transform(X[bundle['features']])
+    predicted = bundle['model'].predict(X_scaled)
+    spread = prediction_spread(bundle['model'], X_scaled, bundle['rmse'], predicted)
+
+    # Confidence is the share of the league-wide spread the interval does not cover
+    scale = float(np.nanstd(predicted)) or 1.0
+    confidence = np.clip(1 - spread / scale, 0, 1)
+
+    predictions = pd.DataFrame({
+        'model_type': f'{model_type}_war',
+        'model_name': bundle['model_name'],
+        'player_id': pd.to_numeric(keys['IDfg'], errors='coerce').astype('Int64') if 'IDfg' in keys.columns else pd.NA,
+        'player_name': keys['Name'].to_numpy() if 'Name' in keys.columns else None,
+        'team_id': keys['Team'].to_numpy() if 'Team' in keys.columns else None,
+        'season': pd.to_numeric(keys['Season'], errors='coerce').astype('Int64') if 'Season' in keys.columns else pd.NA,
+        'predicted_value': predicted,
+        'lower_bound': predicted - INTERVAL_Z * spread,
+        'upper_bound': predicted + INTERVAL_Z * spread,
+        'confidence': np.nan_to_num(confidence, nan=0.0),
+        'created_at': datetime.now()
+    }, index=X.index)
+
+    return predictions[PREDICTION_COLUMNS]
+
+def replace_predictions_postgres(engine, model_type, predictions):
+    """
+    Replace a model's rows in model_predictions in a single transaction
+
+    The rows are streamed with COPY into a temporary staging table, then the old rows
+    are deleted and the staged rows inserted before commit, so readers see either the
+    previous snapshot or the new one, never a partial load.
+
+    Args:
+        engine (sqlalchemy.engine.Engine): Database engine
+        model_type (str): Value of the model_type column being replaced
+        predictions (pandas.DataFrame): Rows in PREDICTION_COLUMNS order
+    """
+    buffer = io.StringIO()
+    predictions.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    column_list = ', '.join(PREDICTION_COLUMNS)
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            "CREATE TEMP TABLE model_predictions_staging "
+            "(LIKE model_predictions INCLUDING DEFAULTS) ON COMMIT DROP"
+        )
+        cursor.copy_expert(f"COPY model_predictions_staging ({column_list}) FROM STDIN WITH CSV", buffer)
+        cursor.execute("DELETE FROM model_predictions WHERE model_type = %s", (model_type,))
+        cursor.execute(
+            f"INSERT INTO model_predictions ({column_list}) "
+            f"SELECT {column_list} FROM model_predictions_staging"
+        )
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+def replace_predictions_duckdb(model_type, predictions, database=DUCKDB_PATH):
+    """
+    Replace a model's rows in the embedded database's model_predictions table
+
+    Args:
+        model_type (str): Value of the model_type column being replaced
+        predictions (pandas.DataFrame): Rows in PREDICTION_COLUMNS order
+        database (str): DuckDB database path
+    """
+    import duckdb
+
+    column_list = ', '.join(PREDICTION_COLUMNS)
+    connection = duckdb.connect(database)
+    try:
+        connection.execute("CREATE SEQUENCE IF NOT EXISTS model_predictions_id_seq")
+        connection.execute(DUCKDB_PREDICTIONS_DDL)
+        connection.register('model_predictions_staging', predictions)
+        connection.execute("BEGIN TRANSACTION")
+        connection.execute("DELETE FROM model_predictions WHERE model_type = ?", [model_type])
+        connection.execute(
+            f"INSERT INTO model_predictions ({column_list}) "
+            f"SELECT {column_list} FROM model_predictions_staging"
+        )
+        connection.execute("COMMIT")
+    except Exception:
+        connection.execute("ROLLBACK")
+        raise
+    finally:
+        connection.close()
+
+@profiled()
+def run_scoring(engine=None):
+    """
+    Score all eligible player-seasons with each trained model
+
+    Args:
+        engine (sqlalchemy.engine.Engine, optional): Postgres engine (unused for DuckDB)
+
+    Returns:
+        dict: Number of predictions written per model type
+    """
+    model = PlayerEvaluationModel()
+
+    preparers = {
+        'batting': model.prepare_batting_features,
+        'pitching': model.prepare_pitching_features,
+    }
+
+    written = {}
+    for model_type, prepare in preparers.items():
+        bundle = load_trained_model(model_type)
+        if bundle is None:
+            continue
+
+        X, _, features = prepare()
+        if X is None or X.empty:
+            logger.warning(f"No eligible {model_type} player-seasons to score")
+            continue
+
+        missing = [f for f in bundle['features'] if f not in features]
+        if missing:
+            logger.error(f"Cannot score {model_type} model, missing features: {missing}")
+            continue
+
+        keys = model.feature_keys[model_type]
+        predictions = score_player_seasons(model_type, bundle, X, keys)
+
+        if use_duckdb():
+            replace_predictions_duckdb(f'{model_type}_war', predictions)
+        else:
+            replace_predictions_postgres(engine, f'{model_type}_war', predictions)
+
+        written[model_type] = len(predictions)
+        logger.info(f"Wrote {len(predictions)} {model_type} WAR predictions")
+
+    return written
+
+@profiled()
+def main():
+    """Main function to score player-seasons with the trained models"""
+    try:
+        engine = None if use_duckdb() else connect_to_db()
+
+        logger.info("Starting batch model scoring")
+        run_scoring(engine)
+        logger.info("Batch model scoring completed")
+
+    except Exception as e:
+        logger.error(f"Error in model scoring: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    # Set up logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("logs/model_scoring.log"),
+            logging.StreamHandler()
+        ]
+    )
+    main()
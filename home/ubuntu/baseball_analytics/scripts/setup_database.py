@@ -6,7 +6,7 @@ This script creates the necessary database, schemas, and tables for the baseball
 import os
 import sys
 import sqlalchemy as sa
-from sqlalchemy import create_engine, MetaData, Table, Column, Integer, String, Float, Date, ForeignKey, Text, Boolean
+from sqlalchemy import create_engine, MetaData, Table, Column, Integer, String, Float, Date, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 
@@ -171,6 +171,27 @@ def setup_schemas():
         report_text = Column(Text)
         future_value = Column(Float)
     
+    class ModelPrediction(Base):
+        __tablename__ = 'model_predictions'
+        __table_args__ = (
+            Index('idx_model_predictions_type_confidence', 'model_type', 'confidence'),
+            Index('idx_model_predictions_type_player', 'model_type', 'player_id'),
+            Index('idx_model_predictions_type_team', 'model_type', 'team_id'),
+        )
+        
+        id = Column(Integer, primary_key=True)
+        model_type = Column(String(50), nullable=False)
+        model_name = Column(String(100))
+        player_id = Column(Integer)
+        player_name = Column(String(200))
+        team_id = Column(String(10))
+        season = Column(Integer)
+        predicted_value = Column(Float)
+        lower_bound = Column(Float)
+        upper_bound = Column(Float)
+        confidence = Column(Float)
+        created_at = Column(DateTime)
+    
     # Create all tables
     print("Creating database tables...")
     Base.metadata.create_all(engine)
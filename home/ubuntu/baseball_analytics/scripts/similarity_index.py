@@ -0,0 +1,260 @@
+"""
+Player similarity index for Baseball Analytics System
+This module keeps a persistent nearest-neighbour index (a KD-tree over standardized
+feature vectors) of every batting and pitching player-season, so the most similar
+player-seasons to any player can be looked up in milliseconds.
+"""
+
+import os
+import threading
+import logging
+import numpy as np
+import pandas as pd
+import joblib
+from sklearn.neighbors import KDTree
+
+from analytics_backend import apply_filters
+from feature_store import FEATURE_KEY_COLUMNS, feature_frame, get_feature_set
+
+logger = logging.getLogger(__name__)
+
+INDEX_DIR = os.path.join('models', 'similarity')
+
+# Identifying columns kept with each player-season (position columns when the data has them)
+KEY_COLUMNS = FEATURE_KEY_COLUMNS
+
+# Filters matching fewer rows than this are searched exactly instead of through the tree
+EXACT_SEARCH_ROWS = 5000
+
+class SimilarityIndex:
+    """Nearest-neighbour index of player-seasons in standardized feature space"""
+
+    def __init__(self, data, features, version=None):
+        """
+        Build the index
+
+        Args:
+            data (pandas.DataFrame): Player-season data
+            features (list): Features to compare on
+            version (str, optional): Version of the data the index is built from
+        """
+        self.features = [col for col in features if col in data.columns]
+        self.version = version
+
+        data = data.dropna(subset=self.features)
+        self.keys = data[[col for col in KEY_COLUMNS if col in data.columns]].reset_index(drop=True)
+        self.values = data[self.features].to_numpy(dtype=float)
+
+        self.mean = self.values.mean(axis=0) if len(self.values) else np.zeros(len(self.features))
+        self.scale = self.values.std(axis=0) if len(self.values) else np.ones(len(self.features))
+        self.scale[self.scale == 0] = 1.0
+        self.vectors = (self.values - self.mean) / self.scale
+        self.tree = KDTree(self.vectors) if len(self.vectors) else None
+        self._name_rows = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_name_rows'] = None
+        return state
+
+    def __len__(self):
+        return len(self.keys)
+
+    def name_rows(self):
+        """Return a mapping of player name to the positions of their seasons"""
+        if self._name_rows is None:
+            self._name_rows = self.keys.groupby('Name').indices if 'Name' in self.keys.columns else {}
+        return self._name_rows
+
+    def reference_row(self, player_name, season=None):
+        """
+        Find the position of a player's season
+
+        Args:
+            player_name (str): Player name
+            season (int, optional): Season. If None, uses the latest.
+
+        Returns:
+            int: Row position, or None if the player-season is not indexed
+        """
+        rows = self.name_rows().get(player_name)
+        if rows is None:
+            return None
+        if 'Season' in self.keys.columns:
+            seasons = self.keys['Season'].to_numpy()[rows]
+            if season is not None:
+                rows = rows[seasons == season]
+                if len(rows) == 0:
+                    return None
+                return int(rows[0])
+            return int(rows[np.argmax(seasons)])
+        return int(rows[-1])
+
+    def _result(self, positions, distances):
+        """Assemble result rows with their keys, features and distance"""
+        result = self.keys.iloc[positions].reset_index(drop=True)
+        result = pd.concat([result, pd.DataFrame(self.values[positions], columns=self.features)], axis=1)
+        result['Distance'] = distances
+        return result.drop(columns=[col for col in ['IDfg'] if col in result.columns])
+
+    def query(self, player_name, season=None, k=10, filters=None):
+        """
+        Find the player-seasons most similar to a player-season
+
+        Other seasons of the same player are excluded.
+
+        Args:
+            player_name (str): Reference player
+            season (int, optional): Reference season. If None, uses the latest.
+            k (int): Number of similar player-seasons to return
+            filters (list, optional): (column, operator, value) tuples restricting the
+                results, e.g. [('Season', '==', 2023)] or [('Pos', 'in', ['SS', '2B'])]
+
+        Returns:
+            pandas.DataFrame: Similar player-seasons, closest first
+        """
+        reference = self.reference_row(player_name, season)
+        if reference is None:
+            logger.warning(f"Player {player_name} not found")
+            return pd.DataFrame()
+
+        allowed = np.ones(len(self.keys), dtype=bool)
+        if filters:
+            allowed[:] = False
+            allowed[apply_filters(self.keys, filters).index.to_numpy()] = True
+        allowed[self.name_rows()[player_name]] = False
+
+        candidates = np.flatnonzero(allowed)
+        if len(candidates) == 0:
+            return pd.DataFrame()
+
+        point = self.vectors[reference][np.newaxis, :]
+        if len(candidates) <= EXACT_SEARCH_ROWS or len(candidates) < len(self.keys) // 4:
+            # Small candidate sets are searched exactly
+            distances = np.sqrt(((self.vectors[candidates] - point) ** 2).sum(axis=1))
+            count = min(k, len(candidates))
+            best = np.argpartition(distances, count - 1)[:count]
+            best = best[np.argsort(distances[best], kind='stable')]
+            return self._result(candidates[best], distances[best])
+
+        # Widen the tree search until enough neighbours pass the filters
+        want = k + len(self.name_rows()[player_name])
+        while True:
+            want = min(want, len(self.keys))
+            distances, positions = self.tree.query(point, k=want)
+            keep = allowed[positions[0]]
+            if keep.sum() >= k or want == len(self.keys):
+                return self._result(positions[0][keep][:k], distances[0][keep][:k])
+            want *= 2
+
+    def all_pairs(self, k=10, block_size=512):
+        """
+        Find the k most similar player-seasons for every indexed player-season
+
+        Distances are computed exactly in blocks of rows with one matrix product per
+        block. Other seasons of the same player are excluded.
+
+        Args:
+            k (int): Neighbours per player-season
+            block_size (int): Rows per block
+
+        Returns:
+            pandas.DataFrame: Name/Team/Season of each player-season, Rank, the neighbour's
+            Name/Team/Season (prefixed Similar_) and Distance
+        """
+        n = len(self.keys)
+        if n < 2:
+            return pd.DataFrame()
+
+        k = min(k, n - 1)
+        norms = (self.vectors ** 2).sum(axis=1)
+        names = pd.factorize(self.keys['Name'])[0] if 'Name' in self.keys.columns else np.arange(n)
+
+        sources = []
+        neighbours = []
+        neighbour_distances = []
+        for start in range(0, n, block_size):
+            block = slice(start, min(start + block_size, n))
+            squared = norms[block, np.newaxis] + norms[np.newaxis, :] - 2 * self.vectors[block] @ self.vectors.T
+            squared[names[block, np.newaxis] == names[np.newaxis, :]] = np.inf
+
+            best = np.argpartition(squared, k - 1, axis=1)[:, :k]
+            best_squared = np.take_along_axis(squared, best, axis=1)
+            order = np.argsort(best_squared, axis=1, kind='stable')
+            best = np.take_along_axis(best, order, axis=1)
+            best_squared = np.take_along_axis(best_squared, order, axis=1)
+
+            sources.append(np.repeat(np.arange(block.start, block.stop), k))
+            neighbours.append(best.ravel())
+            neighbour_distances.append(np.sqrt(np.maximum(best_squared.ravel(), 0)))
+
+        sources = np.concatenate(sources)
+        neighbours = np.concatenate(neighbours)
+        distances = np.concatenate(neighbour_distances)
+        valid = np.isfinite(distances)
+
+        id_columns = [col for col in ['Name', 'Team', 'Season'] if col in self.keys.columns]
+        result = self.keys[id_columns].iloc[sources[valid]].reset_index(drop=True)
+        result['Rank'] = np.tile(np.arange(1, k + 1), n)[valid]
+        similar = self.keys[id_columns].iloc[neighbours[valid]].reset_index(drop=True)
+        result = pd.concat([result, similar.add_prefix('Similar_')], axis=1)
+        result['Distance'] = distances[valid]
+        return result
+
+    def save(self, path):
+        """Persist the index"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        joblib.dump(self, tmp_path)
+        os.replace(tmp_path, path)
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_similarity_index(data_type, index_dir=INDEX_DIR):
+    """
+    Return the similarity index for a player type, rebuilding it when the data changed
+
+    Player-seasons are compared on the WAR model features plus WAR, read from the
+    unqualified feature set in the feature store. The index is kept in memory and on
+    disk; a stored index is reused while it was built from the current feature set.
+
+    Args:
+        data_type (str): 'batting' or 'pitching'
+        index_dir (str): Directory holding the stored indexes
+
+    Returns:
+        SimilarityIndex: Index of the player type's player-seasons
+    """
+    feature_set = get_feature_set(data_type)
+    version = feature_set.version if feature_set is not None else None
+
+    with _indexes_lock:
+        index = _indexes.get(data_type)
+    if index is not None and index.version == version:
+        return index
+
+    path = os.path.join(index_dir, f'{data_type}_index.joblib')
+    index = None
+    if os.path.exists(path):
+        try:
+            index = joblib.load(path)
+        except Exception as e:
+            logger.warning(f"Rebuilding unreadable similarity index {path}: {e}")
+
+    if index is None or index.version != version:
+        if feature_set is not None:
+            data = pd.concat([feature_set.keys, feature_frame(feature_set, include_target=True)], axis=1)
+            features = feature_set.features + [feature_set.target]
+        else:
+            data, features = pd.DataFrame(columns=KEY_COLUMNS), []
+        index = SimilarityIndex(data, features, version)
+        try:
+            index.save(path)
+        except OSError as e:
+            logger.warning(f"Could not store similarity index {path}: {e}")
+        logger.info(f"Built {data_type} similarity index: {len(index)} player-seasons")
+
+    with _indexes_lock:
+        _indexes[data_type] = index
+    return index
@@ -0,0 +1,402 @@
+"""
+Mergeable streaming statistics for Baseball Analytics System
+This module keeps per-partition moment sketches (counts, means, second moments,
+co-moments, min/max) next to the processed data. Season and multi-season summaries
+and correlation matrices are merged from the sketches, so only new partitions are scanned.
+Exact quantiles of data streamed in chunks are located with bounded-memory histograms.
+"""
+
+import os
+import glob
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+
+from analytics_backend import PROCESSED_DATA_DIR, read_dataset_file, apply_filters
+from partition_catalog import get_catalog
+
+logger = logging.getLogger(__name__)
+
+SKETCH_DIR = os.path.join(PROCESSED_DATA_DIR, 'stats')
+
+class MomentSketch:
+    """
+    Pairwise-complete moment sketch over a fixed list of metrics
+
+    For every metric pair (i, j) the sketch tracks, over the rows where both are present,
+    the row count n[i, j], the mean of metric i mean[i, j], the sum of squared deviations
+    of metric i sq[i, j] and the co-moment of i and j comoment[i, j]. The diagonal holds
+    the per-metric count, mean and M2. Sketches merge exactly (Chan et al.), and the
+    merged correlations match pandas' pairwise DataFrame.corr().
+    """
+
+    def __init__(self, metrics):
+        """
+        Initialize an empty sketch
+
+        Args:
+            metrics (list): Metric names
+        """
+        k = len(metrics)
+        self.metrics = list(metrics)
+        self.n = np.zeros((k, k))
+        self.mean = np.zeros((k, k))
+        self.sq = np.zeros((k, k))
+        self.comoment = np.zeros((k, k))
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+
+    @classmethod
+    def from_frame(cls, frame, metrics):
+        """
+        Build a sketch from a DataFrame in a few vectorized matrix products
+
+        Args:
+            frame (pandas.DataFrame): Data
+            metrics (list): Metric names (missing columns count as all-NaN)
+
+        Returns:
+            MomentSketch: Sketch of the frame
+        """
+        sketch = cls(metrics)
+        if frame.empty:
+            return sketch
+
+        X = frame.reindex(columns=metrics).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        present = ~np.isnan(X)
+        if not present.any():
+            return sketch
+
+        # Center on the column means for numerical stability (the moments are shift-invariant)
+        counts = present.sum(axis=0)
+        shift = np.where(present, X, 0.0).sum(axis=0) / np.maximum(counts, 1)
+        centered = np.where(present, X - shift, 0.0)
+        V = present.astype(float)
+
+        n = V.T @ V
+        sums = centered.T @ V
+        sums_sq = (centered ** 2).T @ V
+        cross = centered.T @ centered
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(n > 0, sums / n, 0.0)
+            sketch.sq = np.where(n > 0, sums_sq - sums ** 2 / n, 0.0)
+            sketch.comoment = np.where(n > 0, cross - sums * sums.T / n, 0.0)
+
+        sketch.n = n
+        sketch.mean = mean + shift[:, None] * (n > 0)
+        sketch.min = np.where(present.any(axis=0), np.nanmin(np.where(present, X, np.inf), axis=0), np.inf)
+        sketch.max = np.where(present.any(axis=0), np.nanmax(np.where(present, X, -np.inf), axis=0), -np.inf)
+        return sketch
+
+    def merge(self, other):
+        """
+        Merge two sketches over the same metrics
+
+        Args:
+            other (MomentSketch): Sketch to merge in
+
+        Returns:
+            MomentSketch: Combined sketch
+        """
+        if other.metrics != self.metrics:
+            raise ValueError("Cannot merge sketches over different metrics")
+
+        merged = MomentSketch(self.metrics)
+        n = self.n + other.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = other.mean - self.mean
+            weight = np.where(n > 0, self.n * other.n / n, 0.0)
+            merged.mean = np.where(n > 0, self.mean + delta * np.where(n > 0, other.n / n, 0.0), 0.0)
+
+        merged.n = n
+        merged.sq = self.sq + other.sq + delta ** 2 * weight
+        merged.comoment = self.comoment + other.comoment + delta * delta.T * weight
+        merged.min = np.minimum(self.min, other.min)
+        merged.max = np.maximum(self.max, other.max)
+        return merged
+
+    @classmethod
+    def merge_all(cls, sketches, metrics):
+        """Merge any number of sketches (an empty list gives an empty sketch)"""
+        merged = cls(metrics)
+        for sketch in sketches:
+            merged = merged.merge(sketch)
+        return merged
+
+    def summary(self):
+        """
+        Summarize each metric like DataFrame.describe() (without percentiles)
+
+        Returns:
+            pandas.DataFrame: count, mean, std, min and max per metric
+        """
+        count = np.diag(self.n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.where(count > 1, np.sqrt(np.diag(self.sq) / (count - 1)), np.nan)
+
+        return pd.DataFrame(
+            [count,
+             np.where(count > 0, np.diag(self.mean), np.nan),
+             std,
+             np.where(count > 0, self.min, np.nan),
+             np.where(count > 0, self.max, np.nan)],
+            index=['count', 'mean', 'std', 'min', 'max'],
+            columns=self.metrics
+        )
+
+    def corr(self):
+        """
+        Pairwise Pearson correlation matrix
+
+        Returns:
+            pandas.DataFrame: Correlation matrix like DataFrame.corr()
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            denominator = np.sqrt(self.sq * self.sq.T)
+            corr = np.where((self.n > 1) & (denominator > 0), self.comoment / denominator, np.nan)
+        corr = np.clip(corr, -1, 1)
+        return pd.DataFrame(corr, index=self.metrics, columns=self.metrics)
+
+    def save(self, path, fingerprint):
+        """Persist the sketch with the fingerprint of the data it was built from"""
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, metrics=np.array(self.metrics), n=self.n, mean=self.mean, sq=self.sq,
+                 comoment=self.comoment, min=self.min, max=self.max,
+                 fingerprint=np.array(fingerprint))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Load a persisted sketch, returning (sketch, fingerprint)"""
+        with np.load(path) as stored:
+            sketch = cls(stored['metrics'].tolist())
+            for name in ['n', 'mean', 'sq', 'comoment', 'min', 'max']:
+                setattr(sketch, name, stored[name])
+            return sketch, stored['fingerprint'].tolist()
+
+def _sketch_path(partition, metrics, filters, sketch_dir):
+    """Return the file a partition's sketch is stored in"""
+    key = repr((tuple(metrics), tuple(tuple(f) for f in (filters or []))))
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(partition.path))[0]
+    return os.path.join(sketch_dir, f"{stem}-{digest}.npz")
+
+def _prune_stale_sketches(sketch_dir):
+    """Delete sketches built from a partition file that has since changed or been removed"""
+    for path in glob.glob(os.path.join(sketch_dir, '*.npz')):
+        if path.endswith('.tmp.npz'):
+            continue
+        try:
+            with np.load(path) as stored:
+                source, size, mtime_ns = stored['fingerprint'].tolist()
+        except Exception:
+            source = None
+        try:
+            stat = os.stat(source) if source is not None else None
+        except OSError:
+            stat = None
+        if stat is None or [str(stat.st_size), str(stat.st_mtime_ns)] != [size, mtime_ns]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def partition_sketch(partition, metrics, filters=None, sketch_dir=SKETCH_DIR):
+    """
+    Return the sketch of one partition, building and storing it if missing or stale
+
+    Args:
+        partition (Partition): Catalog partition
+        metrics (list): Metric names
+        filters (list, optional): List of (column, operator, value) tuples
+        sketch_dir (str): Directory holding the stored sketches
+
+    Returns:
+        MomentSketch: Sketch of the partition's (filtered) rows
+    """
+    path = _sketch_path(partition, metrics, filters, sketch_dir)
+    fingerprint = [partition.path, str(partition.size), str(partition.mtime_ns)]
+
+    if os.path.exists(path):
+        try:
+            sketch, stored_fingerprint = MomentSketch.load(path)
+            if stored_fingerprint == fingerprint:
+                return sketch
+        except Exception as e:
+            logger.warning(f"Rebuilding unreadable sketch {path}: {e}")
+
+    columns = list(dict.fromkeys(list(metrics) + [column for column, _, _ in (filters or [])]))
+    data = apply_filters(read_dataset_file(partition.path, columns), filters)
+    sketch = MomentSketch.from_frame(data, metrics)
+
+    try:
+        os.makedirs(sketch_dir, exist_ok=True)
+        sketch.save(path, fingerprint)
+        _prune_stale_sketches(sketch_dir)
+    except OSError as e:
+        logger.warning(f"Could not store sketch {path}: {e}")
+
+    logger.info(f"Built statistics sketch for {partition.path}: {len(data)} rows")
+    return sketch
+
+def season_sketches(data_type, metrics, filters=None, year=None):
+    """
+    Merge partition sketches per season
+
+    Args:
+        data_type (str): Type of data
+        metrics (list): Metric names
+        filters (list, optional): List of (column, operator, value) tuples
+        year (int, optional): Restrict to one season
+
+    Returns:
+        dict: Mapping of season to MomentSketch
+    """
+    by_season = {}
+    for partition in get_catalog().partitions(data_type, year):
+        sketch = partition_sketch(partition, metrics, filters)
+        season = partition.season
+        by_season[season] = by_season[season].merge(sketch) if season in by_season else sketch
+    return by_season
+
+def dataset_sketch(data_type, metrics, filters=None, year=None):
+    """
+    Merge the sketches of every partition of a dataset
+
+    Args:
+        data_type (str): Type of data
+        metrics (list): Metric names
+        filters (list, optional): List of (column, operator, value) tuples
+        year (int, optional): Restrict to one season
+
+    Returns:
+        MomentSketch: Sketch over all selected partitions
+    """
+    return MomentSketch.merge_all(season_sketches(data_type, metrics, filters, year).values(), metrics)
+
+# Histogram buckets used to locate quantiles in a stream
+QUANTILE_BINS = 4096
+
+# Most values collected to resolve one quantile rank; larger buckets are refined first
+QUANTILE_MAX_COLLECT = 65536
+
+def _bucket(values, edges):
+    """Assign values to histogram buckets (the top edge belongs to the last bucket)"""
+    return np.clip(np.searchsorted(edges, values, side='right') - 1, 0, len(edges) - 2)
+
+def streaming_quantiles(chunks, metrics, sketch, quantiles=(0.25, 0.5, 0.75), bins=QUANTILE_BINS,
+                        max_collect=QUANTILE_MAX_COLLECT):
+    """
+    Exact quantiles of metrics streamed in chunks, in bounded memory
+
+    Every rank a quantile interpolates between is tracked as the closed value range
+    known to hold it. Each pass histograms the open ranges and narrows each rank to the
+    range of values in its bucket, so a rank is resolved once its range holds a single
+    value, or collected and sorted once it holds at most max_collect values. Memory is
+    bounded by bins and max_collect per rank; heavily skewed data costs extra passes
+    rather than memory. Quantiles interpolate linearly like pandas.
+
+    Args:
+        chunks (callable): Returns a fresh iterable of DataFrame chunks on every call
+        metrics (list): Metric names
+        sketch (MomentSketch): Sketch of the same data (supplies counts, min and max)
+        quantiles (tuple): Quantiles to compute
+        bins (int): Histogram buckets per range and pass
+        max_collect (int): Most values collected for one range
+
+    Returns:
+        pandas.DataFrame: One row per quantile, one column per metric
+    """
+    index = sketch.metrics
+    result = pd.DataFrame(np.nan, index=[f"{q * 100:g}%" for q in quantiles], columns=list(metrics))
+
+    def values_of(chunk, metric):
+        if metric not in chunk.columns:
+            return np.empty(0)
+        values = pd.to_numeric(chunk[metric], errors='coerce').to_numpy(dtype=float)
+        return values[~np.isnan(values)]
+
+    # Ranks each quantile interpolates between, each with the range (low, high) holding
+    # it, the number of values below the range and the number inside it
+    ranks = {}
+    pending = {}
+    resolved = {}
+    for metric in metrics:
+        i = index.index(metric)
+        count = int(sketch.n[i, i])
+        if count == 0:
+            continue
+        ranks[metric] = []
+        for q in quantiles:
+            position = (count - 1) * q
+            lower = int(np.floor(position))
+            ranks[metric].append((position, lower, min(lower + 1, count - 1)))
+            for rank in (lower, min(lower + 1, count - 1)):
+                pending[(metric, rank)] = (sketch.min[i], sketch.max[i], 0, count)
+
+    while pending:
+        for key, (low, high, _, _) in list(pending.items()):
+            if low == high:
+                resolved[key] = low
+                del pending[key]
+        if not pending:
+            break
+
+        # Ranks sharing a range are histogrammed or collected together
+        ranges = {(metric, low, high): count for (metric, _), (low, high, _, count) in pending.items()}
+        collected = {key: [] for key, count in ranges.items() if count <= max_collect}
+        counts = {key: np.zeros(bins, dtype=np.int64) for key in ranges if key not in collected}
+        lows = {key: np.full(bins, np.inf) for key in counts}
+        highs = {key: np.full(bins, -np.inf) for key in counts}
+        edges = {key: np.linspace(key[1], key[2], bins + 1) for key in counts}
+
+        for chunk in chunks():
+            chunk_values = {metric: values_of(chunk, metric) for metric in {key[0] for key in ranges}}
+            for key in ranges:
+                metric, low, high = key
+                values = chunk_values[metric]
+                values = values[(values >= low) & (values <= high)]
+                if key in collected:
+                    collected[key].append(values)
+                    continue
+                buckets = _bucket(values, edges[key])
+                counts[key] += np.bincount(buckets, minlength=bins)
+                np.minimum.at(lows[key], buckets, values)
+                np.maximum.at(highs[key], buckets, values)
+
+        collected = {key: np.sort(np.concatenate(parts)) for key, parts in collected.items()}
+        for (metric, rank), (low, high, below, _) in list(pending.items()):
+            key = (metric, low, high)
+            if key in collected:
+                resolved[(metric, rank)] = collected[key][rank - below]
+                del pending[(metric, rank)]
+                continue
+            ends = below + np.cumsum(counts[key])
+            b = int(np.searchsorted(ends, rank, side='right'))
+            pending[(metric, rank)] = (lows[key][b], highs[key][b], int(ends[b] - counts[key][b]), int(counts[key][b]))
+
+    for metric, metric_ranks in ranks.items():
+        for label, (position, lower, upper) in zip(result.index, metric_ranks):
+            lower_value = resolved[(metric, lower)]
+            result.loc[label, metric] = lower_value + (position - lower) * (resolved[(metric, upper)] - lower_value)
+    return result
+
+def streaming_describe(chunks, metrics, sketch=None):
+    """
+    Summarize metrics streamed in chunks like DataFrame.describe()
+
+    Args:
+        chunks (callable): Returns a fresh iterable of DataFrame chunks on every call
+        metrics (list): Metric names
+        sketch (MomentSketch, optional): Sketch of the same data, if already built
+
+    Returns:
+        pandas.DataFrame: count, mean, std, min, 25%, 50%, 75% and max per metric
+    """
+    if sketch is None:
+        sketch = MomentSketch.merge_all((MomentSketch.from_frame(chunk, metrics) for chunk in chunks()), metrics)
+    summary = sketch.summary()
+    quantiles = streaming_quantiles(chunks, metrics, sketch)
+    return pd.concat([summary.loc[['count', 'mean', 'std', 'min']], quantiles, summary.loc[['max']]])
@@ -0,0 +1,365 @@
+"""
+Synthetic data generator for Baseball Analytics System
+This module writes seeded, realistic-looking raw Statcast, batting, pitching and team
+files with the column layouts collect_data.py saves, at any scale from one week of
+pitches to many seasons, so the pipeline can be exercised and benchmarked offline.
+"""
+
+import os
+import logging
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Real-data volumes: pitches per week of the regular season, weeks per season,
+# and player-seasons per season
+PITCHES_PER_WEEK = 28000
+WEEKS_PER_SEASON = 26
+BATTERS_PER_SEASON = 1300
+PITCHERS_PER_SEASON = 850
+TEAMS = ['ARI', 'ATL', 'BAL', 'BOS', 'CHC', 'CHW', 'CIN', 'CLE', 'COL', 'DET',
+         'HOU', 'KCR', 'LAA', 'LAD', 'MIA', 'MIL', 'MIN', 'NYM', 'NYY', 'OAK',
+         'PHI', 'PIT', 'SDP', 'SEA', 'SFG', 'STL', 'TBR', 'TEX', 'TOR', 'WSN']
+
+# Statcast columns as returned by pybaseball.statcast
+STATCAST_COLUMNS = [
+    'pitch_type', 'game_date', 'release_speed', 'release_pos_x', 'release_pos_z', 'player_name',
+    'batter', 'pitcher', 'events', 'description', 'spin_dir', 'spin_rate_deprecated',
+    'break_angle_deprecated', 'break_length_deprecated', 'zone', 'des', 'game_type', 'stand',
+    'p_throws', 'home_team', 'away_team', 'type', 'hit_location', 'bb_type', 'balls', 'strikes',
+    'game_year', 'pfx_x', 'pfx_z', 'plate_x', 'plate_z', 'on_3b', 'on_2b', 'on_1b', 'outs_when_up',
+    'inning', 'inning_topbot', 'hc_x', 'hc_y', 'tfs_deprecated', 'tfs_zulu_deprecated', 'fielder_2',
+    'umpire', 'sv_id', 'vx0', 'vy0', 'vz0', 'ax', 'ay', 'az', 'sz_top', 'sz_bot', 'hit_distance_sc',
+    'launch_speed', 'launch_angle', 'effective_speed', 'release_spin_rate', 'release_extension',
+    'game_pk', 'pitcher.1', 'fielder_2.1', 'fielder_3', 'fielder_4', 'fielder_5', 'fielder_6',
+    'fielder_7', 'fielder_8', 'fielder_9', 'release_pos_y', 'estimated_ba_using_speedangle',
+    'estimated_woba_using_speedangle', 'woba_value', 'woba_denom', 'babip_value', 'iso_value',
+    'launch_speed_angle', 'at_bat_number', 'pitch_number', 'pitch_name', 'home_score', 'away_score',
+    'bat_score', 'fld_score', 'post_away_score', 'post_home_score', 'post_bat_score',
+    'post_fld_score', 'if_fielding_alignment', 'of_fielding_alignment', 'spin_axis',
+    'delta_home_win_exp', 'delta_run_exp'
+]
+
+PITCH_TYPES = {
+    'FF': ('4-Seam Fastball', 0.34, 94.0), 'SL': ('Slider', 0.18, 85.5), 'SI': ('Sinker', 0.15, 93.0),
+    'CH': ('Changeup', 0.11, 85.5), 'CU': ('Curveball', 0.09, 79.5), 'FC': ('Cutter', 0.07, 89.5),
+    'ST': ('Sweeper', 0.04, 82.0), 'FS': ('Split-Finger', 0.02, 86.0)
+}
+
+# Batted-ball events with their share of balls in play
+BATTED_EVENTS = {'field_out': 0.64, 'single': 0.21, 'double': 0.065, 'triple': 0.006,
+                 'home_run': 0.045, 'grounded_into_double_play': 0.024, 'sac_fly': 0.01}
+WOBA_VALUES = {'single': 0.883, 'double': 1.244, 'triple': 1.569, 'home_run': 2.004}
+
+def scale_plan(scale):
+    """
+    Translate a scale factor into seasons and weeks of Statcast data
+
+    Args:
+        scale (float): Seasons of data; 1/26 is one week, 10 is ten seasons
+
+    Returns:
+        tuple: (number of seasons, Statcast weeks per season)
+    """
+    weeks = max(1, int(round(scale * WEEKS_PER_SEASON)))
+    seasons = max(1, int(np.ceil(weeks / WEEKS_PER_SEASON)))
+    return seasons, min(weeks, WEEKS_PER_SEASON) if seasons == 1 else WEEKS_PER_SEASON
+
+def _players(rng, count, first_id, prefix):
+    """Create a pool of players with stable ids, names, ages and talent"""
+    return pd.DataFrame({
+        'IDfg': np.arange(first_id, first_id + count),
+        'Name': [f'{prefix} {i:05d}' for i in range(count)],
+        'Team': rng.choice(TEAMS, count),
+        'Age': rng.integers(21, 36, count),
+        'talent': rng.normal(0, 1, count)
+    })
+
+def batting_stats(rng, players, season):
+    """
+    Generate one season of FanGraphs-style batting stats
+
+    Args:
+        rng (numpy.random.Generator): Random generator
+        players (pandas.DataFrame): Player pool
+        season (int): Season
+
+    Returns:
+        pandas.DataFrame: Batting stats
+    """
+    n = len(players)
+    talent = players['talent'].to_numpy()
+    pa = np.clip(rng.gamma(1.6, 170, n), 1, 720).astype(int)
+    bb = rng.binomial(pa, np.clip(0.085 + 0.015 * talent, 0.02, 0.2))
+    hbp = rng.binomial(pa, 0.01)
+    sf = rng.binomial(pa, 0.008)
+    sh = rng.binomial(pa, 0.002)
+    ab = pa - bb - hbp - sf - sh
+    so = rng.binomial(ab, np.clip(0.23 - 0.02 * talent, 0.08, 0.4))
+    h = rng.binomial(ab - so, np.clip(0.32 + 0.02 * talent, 0.2, 0.45))
+    hr = rng.binomial(h, np.clip(0.13 + 0.03 * talent, 0.01, 0.35))
+    triples = rng.binomial(h - hr, 0.02)
+    doubles = rng.binomial(h - hr - triples, 0.25)
+    singles = h - hr - triples - doubles
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg = np.where(ab > 0, h / ab, 0.0)
+        obp = np.where(pa > 0, (h + bb + hbp) / (ab + bb + hbp + sf), 0.0)
+        slg = np.where(ab > 0, (singles + 2 * doubles + 3 * triples + 4 * hr) / ab, 0.0)
+        woba = np.where(pa > 0, (0.69 * bb + 0.72 * hbp + 0.883 * singles + 1.244 * doubles
+                                 + 1.569 * triples + 2.004 * hr) / (ab + bb + sf + hbp), 0.0)
+    war = (woba - 0.315) / 1.2 * pa / 10 + 0.025 * pa / 6 + rng.normal(0, 0.4, n)
+
+    return pd.DataFrame({
+        'IDfg': players['IDfg'], 'Season': season, 'Name': players['Name'], 'Team': players['Team'],
+        'Age': players['Age'], 'G': np.minimum(162, pa // 4 + 1), 'AB': ab, 'PA': pa, 'H': h,
+        '1B': singles, '2B': doubles, '3B': triples, 'HR': hr, 'R': rng.binomial(h + bb, 0.45),
+        'RBI': rng.binomial(h + sf, 0.4) + hr, 'BB': bb, 'IBB': rng.binomial(bb, 0.05), 'SO': so,
+        'HBP': hbp, 'SF': sf, 'SH': sh, 'GDP': rng.binomial(ab - so, 0.02),
+        'SB': rng.poisson(pa / 120), 'CS': rng.poisson(pa / 500),
+        'AVG': avg.round(3), 'OBP': obp.round(3), 'SLG': slg.round(3), 'OPS': (obp + slg).round(3),
+        'ISO': (slg - avg).round(3), 'BABIP': np.where(ab - so - hr + sf > 0, (h - hr) / np.maximum(ab - so - hr + sf, 1), 0).round(3),
+        'wOBA': woba.round(3), 'wRC+': np.round(100 + (woba - 0.315) / 0.0012).astype(int), 'WAR': war.round(1)
+    })
+
+def pitching_stats(rng, players, season):
+    """
+    Generate one season of FanGraphs-style pitching stats
+
+    Args:
+        rng (numpy.random.Generator): Random generator
+        players (pandas.DataFrame): Player pool
+        season (int): Season
+
+    Returns:
+        pandas.DataFrame: Pitching stats
+    """
+    n = len(players)
+    talent = players['talent'].to_numpy()
+    starter = rng.random(n) < 0.35
+    outs = np.where(starter, rng.integers(60, 600, n), rng.integers(3, 240, n))
+    ip = outs // 3 + (outs % 3) / 10
+    innings = outs / 3
+    tbf = np.round(innings * 4.25).astype(int) + 1
+    so = rng.binomial(tbf, np.clip(0.22 + 0.03 * talent, 0.08, 0.4))
+    bb = rng.binomial(tbf, np.clip(0.085 - 0.01 * talent, 0.03, 0.16))
+    hbp = rng.binomial(tbf, 0.01)
+    hr = rng.binomial(tbf, np.clip(0.03 - 0.004 * talent, 0.005, 0.06))
+    h = rng.binomial(tbf - so - bb - hbp, 0.3) + hr
+    er = rng.binomial(h + bb, 0.33)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        era = np.where(innings > 0, er * 9 / innings, 0.0)
+        fip = np.where(innings > 0, (13 * hr + 3 * (bb + hbp) - 2 * so) / innings + 3.1, 0.0)
+        xfip = fip + rng.normal(0, 0.3, n)
+        whip = np.where(innings > 0, (bb + h) / innings, 0.0)
+        babip = np.where(tbf - so - bb - hr > 0, (h - hr) / np.maximum(tbf - so - bb - hr, 1), 0.0)
+    war = (4.3 - fip) * innings / 90 + rng.normal(0, 0.3, n)
+    games = np.where(starter, np.maximum(1, outs // 17), np.maximum(1, outs // 3))
+
+    return pd.DataFrame({
+        'IDfg': players['IDfg'], 'Season': season, 'Name': players['Name'], 'Team': players['Team'],
+        'Age': players['Age'], 'W': rng.binomial(games, 0.25), 'L': rng.binomial(games, 0.22),
+        'ERA': era.round(2), 'G': games, 'GS': np.where(starter, games, 0), 'CG': 0, 'ShO': 0,
+        'SV': np.where(starter, 0, rng.poisson(2, n)), 'BS': np.where(starter, 0, rng.poisson(1, n)),
+        'IP': ip.round(1), 'TBF': tbf, 'H': h, 'R': er + rng.poisson(1, n), 'ER': er, 'HR': hr, 'BB': bb,
+        'IBB': rng.binomial(bb, 0.05), 'HBP': hbp, 'WP': rng.poisson(2, n), 'BK': 0, 'SO': so,
+        'K/9': np.where(innings > 0, so * 9 / np.maximum(innings, 1e-9), 0).round(2),
+        'BB/9': np.where(innings > 0, bb * 9 / np.maximum(innings, 1e-9), 0).round(2),
+        'K/BB': np.where(bb > 0, so / np.maximum(bb, 1), so).round(2),
+        'HR/9': np.where(innings > 0, hr * 9 / np.maximum(innings, 1e-9), 0).round(2),
+        'WHIP': whip.round(2), 'BABIP': babip.round(3), 'FIP': fip.round(2), 'xFIP': xfip.round(2),
+        'WAR': war.round(1)
+    })
+
+def team_data(batting):
+    """
+    Aggregate one season of batting stats into FanGraphs-style team batting
+
+    Args:
+        batting (pandas.DataFrame): Batting stats of the season
+
+    Returns:
+        pandas.DataFrame: Team stats
+    """
+    totals = batting.groupby('Team').agg(
+        Season=('Season', 'first'), PA=('PA', 'sum'), AB=('AB', 'sum'), H=('H', 'sum'), HR=('HR', 'sum'),
+        R=('R', 'sum'), RBI=('RBI', 'sum'), SB=('SB', 'sum'), BB=('BB', 'sum'), SO=('SO', 'sum'),
+        WAR=('WAR', 'sum'), wOBA=('wOBA', 'mean'), SLG=('SLG', 'mean'), OBP=('OBP', 'mean')
+    ).reset_index()
+    totals['G'] = 162
+    totals['AVG'] = (totals['H'] / totals['AB']).round(3)
+    totals['BB%'] = (totals['BB'] / totals['PA']).round(3)
+    totals['K%'] = (totals['SO'] / totals['PA']).round(3)
+    totals['ISO'] = (totals['SLG'] - totals['AVG']).round(3)
+    totals['BABIP'] = totals['AVG']
+    totals['wRC+'] = np.round(100 + (totals['wOBA'] - 0.315) / 0.0012).astype(int)
+    totals['BsR'] = (totals['SB'] / 20).round(1)
+    totals['Off'] = (totals['wRC+'] - 100).round(1)
+    totals['Def'] = 0.0
+    return totals[['Team', 'Season', 'G', 'PA', 'HR', 'R', 'RBI', 'SB', 'BB%', 'K%', 'ISO', 'BABIP',
+                   'AVG', 'OBP', 'SLG', 'wOBA', 'wRC+', 'BsR', 'Off', 'Def', 'WAR']]
+
+def statcast_week(rng, start, batters, pitchers, pitches=PITCHES_PER_WEEK):
+    """
+    Generate one week of pitch-level Statcast data
+
+    Args:
+        rng (numpy.random.Generator): Random generator
+        start (datetime.date): First day of the week
+        batters (pandas.DataFrame): Batter pool
+        pitchers (pandas.DataFrame): Pitcher pool
+        pitches (int): Pitches to generate
+
+    Returns:
+        pandas.DataFrame: Statcast data in pybaseball column order
+    """
+    n = pitches
+    codes = list(PITCH_TYPES)
+    shares = np.array([PITCH_TYPES[code][1] for code in codes])
+    pitch_type = rng.choice(len(codes), n, p=shares / shares.sum())
+    speeds = np.array([PITCH_TYPES[code][2] for code in codes])
+
+    batter_rows = rng.integers(0, len(batters), n)
+    pitcher_rows = rng.integers(0, len(pitchers), n)
+    talent = batters['talent'].to_numpy()[batter_rows]
+
+    # About 17% of pitches end a plate appearance with a ball in play
+    in_play = rng.random(n) < 0.17
+    launch_speed = np.where(in_play, np.clip(rng.normal(89 + 2 * talent, 14), 20, 122), np.nan)
+    launch_angle = np.where(in_play, np.clip(rng.normal(12, 27, n), -85, 85).round(), np.nan)
+
+    event_names = list(BATTED_EVENTS)
+    event_shares = np.array(list(BATTED_EVENTS.values()))
+    events = np.where(in_play, np.array(event_names, dtype=object)[rng.choice(len(event_names), n, p=event_shares / event_shares.sum())], None)
+    # Hard, well-angled contact produces the extra-base hits
+    barrel = in_play & (launch_speed >= 98) & (launch_angle >= 20) & (launch_angle <= 35)
+    events = np.where(barrel & (rng.random(n) < 0.5), 'home_run', events)
+    ends_pa = ~in_play & (rng.random(n) < 0.1)
+    events = np.where(ends_pa, np.where(rng.random(n) < 0.7, 'strikeout', 'walk'), events)
+
+    woba_value = pd.Series(events).map(WOBA_VALUES).fillna(0.0).to_numpy()
+    woba_value = np.where(pd.Series(events).eq('walk'), 0.69, woba_value)
+    days = rng.integers(0, 7, n)
+    release_speed = speeds[pitch_type] + rng.normal(0, 2.2, n)
+
+    data = {
+        'pitch_type': np.array(codes)[pitch_type],
+        'game_date': [(start + timedelta(days=int(day))).isoformat() for day in days],
+        'release_speed': release_speed.round(1),
+        'release_pos_x': rng.normal(-1.5, 1.0, n).round(2),
+        'release_pos_z': rng.normal(5.8, 0.4, n).round(2),
+        'player_name': batters['Name'].to_numpy()[batter_rows],
+        'batter': batters['IDfg'].to_numpy()[batter_rows],
+        'pitcher': pitchers['IDfg'].to_numpy()[pitcher_rows],
+        'events': events,
+        'description': np.where(in_play, 'hit_into_play', np.where(rng.random(n) < 0.5, 'ball', 'called_strike')),
+        'zone': rng.integers(1, 15, n),
+        'game_type': 'R',
+        'stand': rng.choice(['L', 'R'], n, p=[0.42, 0.58]),
+        'p_throws': rng.choice(['L', 'R'], n, p=[0.28, 0.72]),
+        'home_team': rng.choice(TEAMS, n),
+        'away_team': rng.choice(TEAMS, n),
+        'type': np.where(in_play, 'X', np.where(rng.random(n) < 0.5, 'B', 'S')),
+        'hit_location': np.where(in_play, rng.integers(1, 10, n), np.nan),
+        'bb_type': np.where(in_play, rng.choice(['ground_ball', 'line_drive', 'fly_ball', 'popup'], n), None),
+        'balls': rng.integers(0, 4, n),
+        'strikes': rng.integers(0, 3, n),
+        'game_year': start.year,
+        'pfx_x': rng.normal(0, 0.8, n).round(2),
+        'pfx_z': rng.normal(0.8, 0.6, n).round(2),
+        'plate_x': rng.normal(0, 0.85, n).round(2),
+        'plate_z': rng.normal(2.4, 0.9, n).round(2),
+        'outs_when_up': rng.integers(0, 3, n),
+        'inning': rng.integers(1, 10, n),
+        'inning_topbot': rng.choice(['Top', 'Bot'], n),
+        'hc_x': np.where(in_play, rng.uniform(20, 230, n), np.nan).round(2),
+        'hc_y': np.where(in_play, rng.uniform(20, 220, n), np.nan).round(2),
+        'fielder_2': rng.integers(400000, 700000, n),
+        'vx0': rng.normal(5, 5, n).round(3), 'vy0': (-release_speed * 1.45).round(3), 'vz0': rng.normal(-5, 3, n).round(3),
+        'ax': rng.normal(-5, 9, n).round(3), 'ay': rng.normal(28, 4, n).round(3), 'az': rng.normal(-22, 8, n).round(3),
+        'sz_top': rng.normal(3.4, 0.15, n).round(2), 'sz_bot': rng.normal(1.6, 0.1, n).round(2),
+        'hit_distance_sc': np.where(in_play, np.clip(launch_speed * 2.2 + launch_angle * 3, 0, 480), np.nan).round(),
+        'launch_speed': launch_speed.round(1),
+        'launch_angle': launch_angle,
+        'effective_speed': (release_speed + rng.normal(0, 0.8, n)).round(1),
+        'release_spin_rate': np.round(rng.normal(2300, 280, n)),
+        'release_extension': rng.normal(6.3, 0.4, n).round(1),
+        'game_pk': 700000 + (start - date(start.year, 1, 1)).days * 20 + days * 15 + rng.integers(0, 15, n),
+        'release_pos_y': rng.normal(54.2, 0.4, n).round(2),
+        'woba_value': np.where(in_play | ends_pa, woba_value, np.nan),
+        'woba_denom': np.where(in_play | ends_pa, 1.0, np.nan),
+        'babip_value': np.where(in_play, np.isin(events, ['single', 'double', 'triple']).astype(float), np.nan),
+        'iso_value': np.where(in_play, pd.Series(events).map({'double': 1, 'triple': 2, 'home_run': 3}).fillna(0).to_numpy(), np.nan),
+        'launch_speed_angle': np.where(in_play, rng.integers(1, 7, n), np.nan),
+        'at_bat_number': rng.integers(1, 80, n),
+        'pitch_number': rng.integers(1, 8, n),
+        'pitch_name': np.array([PITCH_TYPES[code][0] for code in codes])[pitch_type],
+        'home_score': rng.integers(0, 10, n), 'away_score': rng.integers(0, 10, n),
+        'bat_score': rng.integers(0, 10, n), 'fld_score': rng.integers(0, 10, n),
+        'if_fielding_alignment': rng.choice(['Standard', 'Infield shift', 'Strategic'], n, p=[0.7, 0.2, 0.1]),
+        'of_fielding_alignment': rng.choice(['Standard', 'Strategic'], n, p=[0.9, 0.1]),
+        'spin_axis': rng.integers(0, 360, n),
+        'delta_home_win_exp': rng.normal(0, 0.02, n).round(3),
+        'delta_run_exp': rng.normal(0, 0.1, n).round(3)
+    }
+    frame = pd.DataFrame(data).reindex(columns=STATCAST_COLUMNS)
+    for column in ['pitcher.1', 'fielder_2.1']:
+        frame[column] = frame['pitcher'] if column == 'pitcher.1' else frame['fielder_2']
+    for column in ['fielder_3', 'fielder_4', 'fielder_5', 'fielder_6', 'fielder_7', 'fielder_8', 'fielder_9']:
+        frame[column] = rng.integers(400000, 700000, n)
+    for column in ['post_away_score', 'post_home_score', 'post_bat_score', 'post_fld_score']:
+        frame[column] = frame[column.replace('post_', '')]
+    frame['estimated_ba_using_speedangle'] = np.where(in_play, rng.uniform(0, 1, n), np.nan).round(3)
+    frame['estimated_woba_using_speedangle'] = np.where(in_play, rng.uniform(0, 2, n), np.nan).round(3)
+    return frame
+
+def generate_raw_data(output_dir=os.path.join('data', 'raw'), scale=1 / WEEKS_PER_SEASON, seed=42,
+                      last_season=2023, pitches_per_week=PITCHES_PER_WEEK):
+    """
+    Write synthetic raw data files named like collect_data.py's output
+
+    Args:
+        output_dir (str): Directory for the raw files
+        scale (float): Seasons of data (1/26 is one week of Statcast, 10 is ten seasons)
+        seed (int): Random seed; the same seed and scale give the same files
+        last_season (int): Most recent season generated
+        pitches_per_week (int): Statcast rows per weekly file
+
+    Returns:
+        dict: Files written per dataset
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    seasons, weeks = scale_plan(scale)
+
+    # Player pools persist across seasons so multi-season features have histories
+    batters = _players(rng, int(BATTERS_PER_SEASON * 1.3), 10000, 'Batter')
+    pitchers = _players(rng, int(PITCHERS_PER_SEASON * 1.3), 50000, 'Pitcher')
+
+    written = {'statcast': [], 'batting': [], 'pitching': [], 'team': []}
+    for season in range(last_season - seasons + 1, last_season + 1):
+        age_offset = season - (last_season - seasons + 1)
+        season_batters = batters.sample(BATTERS_PER_SEASON, random_state=rng.integers(2 ** 31)).assign(Age=lambda d: d['Age'] + age_offset)
+        season_pitchers = pitchers.sample(PITCHERS_PER_SEASON, random_state=rng.integers(2 ** 31)).assign(Age=lambda d: d['Age'] + age_offset)
+
+        batting = batting_stats(rng, season_batters.reset_index(drop=True), season)
+        pitching = pitching_stats(rng, season_pitchers.reset_index(drop=True), season)
+        for name, frame in [('batting', batting), ('pitching', pitching), ('team', team_data(batting))]:
+            path = os.path.join(output_dir, f"{'team_data' if name == 'team' else name + '_stats'}_{season}.csv")
+            frame.to_csv(path, index=False)
+            written[name].append(path)
+
+        opening_day = date(season, 4, 1)
+        for week in range(weeks):
+            start = opening_day + timedelta(weeks=week)
+            end = start + timedelta(days=6)
+            frame = statcast_week(rng, start, season_batters, season_pitchers, pitches_per_week)
+            path = os.path.join(output_dir, f'statcast_{start.isoformat()}_to_{end.isoformat()}.csv')
+            frame.to_csv(path, index=False)
+            written['statcast'].append(path)
+
+    logger.info(f"Generated {seasons} season(s) with {weeks} Statcast week(s) each in {output_dir}")
+    return written
@@ -0,0 +1,210 @@
+"""
+WAR prediction API for Baseball Analytics System
+This module wraps a trained WAR model, its scaler and its feature order in a predictor
+with a low-latency single-row path (no DataFrame construction) and a vectorized batch
+path, and reports the latency of every call.
+"""
+
+import time
+import threading
+import logging
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+from sklearn.linear_model import LinearRegression, Ridge, Lasso
+from sklearn.ensemble import RandomForestRegressor
+
+from model_registry import get_registry
+
+logger = logging.getLogger(__name__)
+
+class WARPredictor:
+    """Preloaded WAR model with validated, pre-ordered inputs"""
+
+    def __init__(self, model, scaler, features, model_name=None, version=None):
+        """
+        Initialize the predictor
+
+        A standard scaler is applied with precomputed arrays, and for linear models it
+        is folded into the coefficients so a single prediction is one dot product.
+
+        Args:
+            model (object): Fitted estimator
+            scaler (object): Fitted scaler applied before the model
+            features (list): Feature names in model input order
+            model_name (str, optional): Display name of the model
+            version (str, optional): Registry version of the model
+        """
+        self.model = model
+        self.scaler = scaler
+        self.features = list(features)
+        self.model_name = model_name or type(model).__name__
+        self.version = version
+        self.latency = {'one': [0, 0.0, 0.0], 'batch': [0, 0.0, 0.0]}
+        self.lock = threading.Lock()
+
+        self.mean = None
+        self.scale = None
+        if isinstance(scaler, StandardScaler):
+            n = len(self.features)
+            self.mean = np.asarray(scaler.mean_, dtype=float) if scaler.mean_ is not None else np.zeros(n)
+            self.scale = np.asarray(scaler.scale_, dtype=float) if scaler.scale_ is not None else np.ones(n)
+
+        # model(scale(x)) = x . weights + intercept for linear models
+        self.weights = None
+        self.intercept = None
+        if isinstance(model, (LinearRegression, Ridge, Lasso)) and self.mean is not None:
+            coef = np.ravel(model.coef_)
+            self.weights = coef / self.scale
+            self.intercept = float(np.ravel(model.intercept_)[0]) - float(np.dot(coef, self.mean / self.scale))
+
+        # Forest predictions for one row walk the trees directly, skipping the parallel dispatch
+        self.trees = None
+        if isinstance(model, RandomForestRegressor):
+            self.trees = [estimator.tree_ for estimator in model.estimators_]
+
+    @classmethod
+    def from_bundle(cls, bundle):
+        """Create a predictor from a registry bundle"""
+        return cls(bundle['model'], bundle['scaler'], bundle['features'],
+                   bundle.get('model_name'), bundle.get('version'))
+
+    def _record(self, kind, started):
+        """Record the latency of a call in microseconds and return it"""
+        elapsed = (time.perf_counter() - started) * 1e6
+        with self.lock:
+            stats = self.latency[kind]
+            stats[0] += 1
+            stats[1] += elapsed
+            stats[2] = elapsed
+        logger.debug(f"WAR predict_{kind}: {elapsed:.1f} us")
+        return elapsed
+
+    def latency_stats(self):
+        """
+        Summarize call latencies
+
+        Returns:
+            dict: Per path ('one', 'batch'): calls, mean_us and last_us
+        """
+        with self.lock:
+            return {
+                kind: {'calls': calls, 'mean_us': total / calls if calls else 0.0, 'last_us': last}
+                for kind, (calls, total, last) in self.latency.items()
+            }
+
+    def _row(self, values):
+        """Validate one player's inputs and return them in model order"""
+        if isinstance(values, dict):
+            missing = [feature for feature in self.features if values.get(feature) is None]
+            if missing:
+                raise ValueError(f"Missing values for features: {missing}")
+            row = np.array([values[feature] for feature in self.features], dtype=float)
+        else:
+            row = np.asarray(values, dtype=float)
+            if row.shape != (len(self.features),):
+                raise ValueError(f"Expected {len(self.features)} values in order {self.features}")
+
+        if not np.isfinite(row).all():
+            raise ValueError("Feature values must be finite numbers")
+        return row
+
+    def transform(self, X):
+        """
+        Scale an ordered feature matrix
+
+        Args:
+            X (numpy.ndarray): Rows of features in model order
+
+        Returns:
+            numpy.ndarray: Scaled matrix
+        """
+        if self.mean is not None:
+            return (X - self.mean) / self.scale
+        return self.scaler.transform(X)
+
+    def predict_one(self, values):
+        """
+        Predict WAR for one player
+
+        Args:
+            values (dict or sequence): Feature values by name, or in model feature order
+
+        Returns:
+            tuple: (predicted WAR, latency in microseconds)
+        """
+        started = time.perf_counter()
+        row = self._row(values)
+
+        if self.weights is not None:
+            prediction = float(row @ self.weights) + self.intercept
+        elif self.trees is not None:
+            scaled = self.transform(row[np.newaxis, :]).astype(np.float32)
+            prediction = float(sum(tree.predict(scaled).flat[0] for tree in self.trees) / len(self.trees))
+        else:
+            prediction = float(self.model.predict(self.transform(row[np.newaxis, :]))[0])
+
+        return prediction, self._record('one', started)
+
+    def predict_batch(self, X):
+        """
+        Predict WAR for many players in one vectorized call
+
+        Args:
+            X (pandas.DataFrame or numpy.ndarray): Player features; DataFrame columns are
+                selected and ordered by name, arrays must already be in model order
+
+        Returns:
+            tuple: (numpy.ndarray of predictions, latency in microseconds)
+        """
+        started = time.perf_counter()
+        if isinstance(X, pd.DataFrame):
+            missing = [feature for feature in self.features if feature not in X.columns]
+            if missing:
+                raise ValueError(f"Missing feature columns: {missing}")
+            X = X[self.features]
+        matrix = np.asarray(X, dtype=float)
+        if matrix.ndim != 2 or matrix.shape[1] != len(self.features):
+            raise ValueError(f"Expected a matrix with columns {self.features}")
+
+        if self.weights is not None:
+            predictions = matrix @ self.weights + self.intercept
+        else:
+            predictions = np.asarray(self.model.predict(self.transform(matrix)), dtype=float)
+
+        return predictions, self._record('batch', started)
+
+_predictors = {}
+_predictors_lock = threading.Lock()
+
+def load_predictor(model_type):
+    """
+    Return a predictor for the current registered WAR model
+
+    Predictors are kept per registry version, so a newly registered current version is
+    picked up on the next call.
+
+    Args:
+        model_type (str): 'batting' or 'pitching'
+
+    Returns:
+        WARPredictor: Predictor, or None if no model is registered
+    """
+    target = f'{model_type}_war'
+    version = get_registry().current_version(target)
+    if version is None:
+        return None
+
+    with _predictors_lock:
+        predictor = _predictors.get(target)
+        if predictor is not None and predictor.version == version:
+            return predictor
+
+    bundle = get_registry().load(target, version)
+    if bundle is None:
+        return None
+
+    predictor = WARPredictor.from_bundle(bundle)
+    with _predictors_lock:
+        _predictors[target] = predictor
+    return predictor